@@ -1,66 +1,122 @@
+const MONITOR_URL = 'http://localhost:10111';
+// Every message row is rendered with the same height so that only the rows
+// inside the viewport have to be mounted (long messages are clamped).
+const ROW_HEIGHT = 112;
+const OVERSCAN_ROWS = 5;
+
+const VirtualMessageList = ({ messages, version, agentColors }) => {
+    const containerRef = React.useRef(null);
+    const stickToBottom = React.useRef(true);
+    const [scrollTop, setScrollTop] = React.useState(0);
+    const [viewportHeight, setViewportHeight] = React.useState(0);
+
+    React.useEffect(() => {
+        const updateHeight = () => containerRef.current && setViewportHeight(containerRef.current.clientHeight);
+        updateHeight();
+        window.addEventListener('resize', updateHeight);
+        return () => window.removeEventListener('resize', updateHeight);
+    }, []);
+
+    React.useEffect(() => {
+        // Follow new messages only while the user is looking at the bottom of the list.
+        if (stickToBottom.current && containerRef.current) {
+            containerRef.current.scrollTop = containerRef.current.scrollHeight;
+        }
+    }, [version]);
+
+    const onScroll = (e) => {
+        const el = e.currentTarget;
+        stickToBottom.current = el.scrollTop + el.clientHeight >= el.scrollHeight - ROW_HEIGHT;
+        setScrollTop(el.scrollTop);
+    };
+
+    const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+    const last = Math.min(messages.length, Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN_ROWS);
+    const rows = [];
+    for (let index = first; index < last; index++) {
+        const msg = messages[index];
+        rows.push(
+            <div
+                key={msg.seq}
+                className="message"
+                title={msg.message}
+                style={{ top: index * ROW_HEIGHT, height: ROW_HEIGHT - 12, borderLeftColor: agentColors[msg.sender] }}
+            >
+                <div className="agent-name">
+                    <span style={{ color: agentColors[msg.sender] }}>{msg.sender}</span>
+                    {' -> '}
+                    <span style={{ color: agentColors[msg.receiver] }}>{msg.receiver}</span>
+                </div>
+                <div className="message-text">{msg.message}</div>
+            </div>
+        );
+    }
+
+    return (
+        <div id="message-container" ref={containerRef} onScroll={onScroll}>
+            <div className="message-spacer" style={{ height: messages.length * ROW_HEIGHT }}>
+                {rows}
+            </div>
+        </div>
+    );
+};
+
 const App = () => {
-    const [messages, setMessages] = React.useState([]);
+    // Messages are kept in a mutable array that only ever grows at the end;
+    // `version` is bumped to re-render, so an update costs O(new messages).
+    const messagesRef = React.useRef([]);
+    const [version, setVersion] = React.useState(0);
     const [agentColors, setAgentColors] = React.useState({});
     const colorPalette = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FED766', '#247BA0', '#F25F5C', '#70C1B3', '#FFE066', '#F45B69'];
     const nextColorIndex = React.useRef(0);
-    const messagesEndRef = React.useRef(null);
-
-    const scrollToBottom = () => {
-        messagesEndRef.current && messagesEndRef.current.scrollIntoView({ behavior: "smooth" });
-    };
 
     React.useEffect(() => {
-        const interval = setInterval(() => {
-            fetch('http://localhost:10111/messages')
-                .then(response => response.json())
-                .then(data => {
-                    setMessages(data);
+        const pending = [];
+        let flushScheduled = false;
+
+        const flush = () => {
+            flushScheduled = false;
+            const batch = pending.splice(0, pending.length);
+            messagesRef.current.push(...batch);
 
-                    setAgentColors(currentColors => {
-                        const newColors = { ...currentColors };
-                        let updated = false;
-                        data.forEach(msg => {
-                            if (msg.sender && !newColors[msg.sender]) {
-                                newColors[msg.sender] = colorPalette[nextColorIndex.current % colorPalette.length];
-                                nextColorIndex.current++;
-                                updated = true;
-                            }
-                            if (msg.receiver && !newColors[msg.receiver]) {
-                                newColors[msg.receiver] = colorPalette[nextColorIndex.current % colorPalette.length];
-                                nextColorIndex.current++;
-                                updated = true;
-                            }
-                        });
-                        return updated ? newColors : currentColors;
+            setAgentColors(currentColors => {
+                const newColors = { ...currentColors };
+                let updated = false;
+                batch.forEach(msg => {
+                    [msg.sender, msg.receiver].forEach(agent => {
+                        if (agent && !newColors[agent]) {
+                            newColors[agent] = colorPalette[nextColorIndex.current % colorPalette.length];
+                            nextColorIndex.current++;
+                            updated = true;
+                        }
                     });
-                })
-                .catch(error => console.error('Error fetching messages:', error));
-        }, 1000);
-        return () => clearInterval(interval);
-    }, []);
+                });
+                return updated ? newColors : currentColors;
+            });
+            setVersion(v => v + 1);
+        };
 
-    React.useEffect(() => {
-        scrollToBottom();
-    }, [messages]);
+        // The stream replays everything after `since` and then pushes new entries;
+        // on reconnect the browser resumes from the last received id.
+        const source = new EventSource(`${MONITOR_URL}/stream?since=0`);
+        source.onmessage = (event) => {
+            pending.push(JSON.parse(event.data));
+            if (!flushScheduled) {
+                flushScheduled = true;
+                requestAnimationFrame(flush);
+            }
+        };
+        source.onerror = (error) => console.error('Error streaming messages:', error);
+        return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, []);
 
     return (
         <div className="container">
             <header className="header">
                 <h1>* Agent 2 Agent Communication Monitor *</h1>
             </header>
-            <div id="message-container">
-                {messages.map((msg, index) => (
-                    <div key={index} className="message" style={{ borderLeftColor: agentColors[msg.sender] }}>
-                        <div className="agent-name">
-                            <span style={{ color: agentColors[msg.sender] }}>{msg.sender}</span>
-                            {' -> '}
-                            <span style={{ color: agentColors[msg.receiver] }}>{msg.receiver}</span>
-                        </div>
-                        <div>{msg.message}</div>
-                    </div>
-                ))}
-                <div ref={messagesEndRef} />
-            </div>
+            <VirtualMessageList messages={messagesRef.current} version={version} agentColors={agentColors} />
         </div>
     );
 };
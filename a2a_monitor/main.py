@@ -1,40 +1,168 @@
-
-from flask import Flask, jsonify, request, send_from_directory
-from flask_cors import CORS
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+import asyncio
+import json
 import logging
+import os
+import uvicorn
+from contextlib import asynccontextmanager
+from message_store import MessageStore
 
-app = Flask(__name__, static_folder='frontend', static_url_path='')
-CORS(app)
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory storage for messages
-messages = []
+# Bounded message log: the newest messages stay in memory, everything is also
+# written to a rotated on-disk log so history survives restarts. Every message gets
+# a sequence number `seq`, which clients use as a cursor.
+store = MessageStore(
+    os.environ.get("A2A_MONITOR_LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "log")),
+    capacity=int(os.environ.get("A2A_MONITOR_CAPACITY", 10_000)),
+    max_segment_bytes=int(os.environ.get("A2A_MONITOR_SEGMENT_BYTES", 16 * 2**20)),
+    max_segments=int(os.environ.get("A2A_MONITOR_MAX_SEGMENTS", 8)),
+)
+# Notified whenever messages are appended, to wake up the /stream subscribers.
+new_message = asyncio.Condition()
+
+STREAM_KEEPALIVE_SECONDS = 15
+MAX_BATCH_SIZE = 1000
+REQUIRED_FIELDS = ('sender', 'receiver', 'message')
+INVALID_FORMAT_REASON = "Invalid message format. Required fields: sender, receiver, message"
+
+
+async def messages_since(since: int, limit: int | None = MAX_BATCH_SIZE) -> list:
+    """Returns up to `limit` messages whose sequence number is greater than `since`.
+
+    Older messages are read from disk, and the store's lock is held while a batch
+    is written, so the store is only used from a worker thread.
+    """
+    return await asyncio.to_thread(store.since, since, limit)
+
+
+def is_valid_message(message) -> bool:
+    """A message is a JSON object with string sender, receiver and message fields."""
+    return isinstance(message, dict) and all(isinstance(message.get(field), str) for field in REQUIRED_FIELDS)
+
+
+async def store_messages(messages: list) -> tuple[int, int]:
+    """Appends the messages to the store, wakes up the streams and returns the first and last seq."""
+    # Writing, flushing and rotating the log would stall every other request on the loop.
+    last_seq = await asyncio.to_thread(store.append_many, messages)
+    async with new_message:
+        new_message.notify_all()
+    return last_seq - len(messages) + 1, last_seq
+
+
+async def serve_index(request: Request):
+    return FileResponse(os.path.join(FRONTEND_DIR, 'index.html'))
+
+async def log_message(request: Request):
+    try:
+        message = await request.json()
+    except ValueError:
+        message = None
+    if not is_valid_message(message):
+        logger.error(INVALID_FORMAT_REASON)
+        return JSONResponse({"status": "error", "reason": INVALID_FORMAT_REASON}, status_code=400)
+
+    logger.debug(f"Received message from {message['sender']} to {message['receiver']}: {message['message']}")
+    seq, _ = await store_messages([message])
+    return JSONResponse({"status": "success", "seq": seq})
 
-@app.route('/')
-def serve_index():
-    return send_from_directory(app.static_folder, 'index.html')
+async def log_batch(request: Request):
+    """Ingests many messages at once, as a JSON array or as newline-delimited JSON.
 
-@app.route('/log', methods=['POST'])
-def log_message():
+    The batch is all-or-nothing: if any entry is invalid nothing is stored and the
+    indexes of the invalid entries are returned.
+    """
+    body = await request.body()
     try:
-        message = request.json
-        if not message or 'message' not in message or 'sender' not in message or 'receiver' not in message:
-            logger.error("Invalid message format. Required fields: sender, receiver, message")
-            return jsonify({"status": "error", "reason": "Invalid message format. Required fields: sender, receiver, message"}), 400
-
-        logger.info(f"Received message from {message.get('sender')} to {message.get('receiver')}: {message.get('message')}")
-        messages.append(message)
-        return jsonify({"status": "success"}), 200
-    except Exception as e:
-        logger.exception("Error in log_message")
-        return jsonify({"status": "error", "reason": str(e)}), 500
-
-@app.route('/messages', methods=['GET'])
-def get_messages():
-    return jsonify(messages)
+        if request.headers.get('content-type', '').startswith(('application/x-ndjson', 'application/jsonl')):
+            messages = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            messages = json.loads(body)
+    except ValueError as e:
+        return JSONResponse({"status": "error", "reason": f"Malformed batch: {e}"}, status_code=400)
+
+    if not isinstance(messages, list):
+        return JSONResponse({"status": "error", "reason": "Expected a JSON array of messages."}, status_code=400)
+    invalid = [index for index, message in enumerate(messages) if not is_valid_message(message)]
+    if invalid:
+        return JSONResponse({"status": "error", "reason": INVALID_FORMAT_REASON, "invalid": invalid}, status_code=400)
+    if not messages:
+        return JSONResponse({"status": "success", "count": 0})
+
+    first_seq, last_seq = await store_messages(messages)
+    logger.debug(f"Received batch of {len(messages)} messages ({first_seq}..{last_seq}).")
+    return JSONResponse({"status": "success", "count": len(messages), "first_seq": first_seq, "last_seq": last_seq})
+
+async def get_messages(request: Request):
+    """Returns the logged messages after the `since` cursor, at most `limit` of them."""
+    try:
+        since = int(request.query_params.get('since', 0))
+        limit = min(int(request.query_params.get('limit', MAX_BATCH_SIZE)), MAX_BATCH_SIZE)
+    except ValueError:
+        return JSONResponse({"status": "error", "reason": "since and limit must be integers."}, status_code=400)
+    return JSONResponse(await messages_since(since, limit))
+
+async def stream_messages(request: Request):
+    """Server-sent events stream that pushes every new message as it is logged.
+
+    Starts after the `since` cursor (or the `Last-Event-ID` header sent by a
+    reconnecting EventSource); without either, only new messages are pushed.
+    """
+    cursor = request.headers.get('last-event-id') or request.query_params.get('since')
+    since = int(cursor) if cursor and cursor.isdigit() else store.last_seq
+
+    async def events():
+        cursor = since
+        while not await request.is_disconnected():
+            batch = await messages_since(cursor)
+            if batch:
+                yield "".join(f"id: {message['seq']}\ndata: {json.dumps(message)}\n\n" for message in batch)
+                cursor = batch[-1]['seq']
+                continue
+            async with new_message:
+                try:
+                    await asyncio.wait_for(
+                        new_message.wait_for(lambda: store.last_seq > cursor), STREAM_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        events(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Closes the on-disk log when the server shuts down."""
+    try:
+        yield
+    finally:
+        store.close()
+
+
+app = Starlette(
+    routes=[
+        Route('/', serve_index),
+        Route('/log', log_message, methods=['POST']),
+        Route('/log/batch', log_batch, methods=['POST']),
+        Route('/messages', get_messages, methods=['GET']),
+        Route('/stream', stream_messages, methods=['GET']),
+        Mount('/', StaticFiles(directory=FRONTEND_DIR)),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan,
+)
 
 if __name__ == '__main__':
-    app.run(port=10111)
+    uvicorn.run(app, host='127.0.0.1', port=10111)
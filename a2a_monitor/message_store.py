@@ -0,0 +1,173 @@
+import bisect
+import json
+import logging
+import os
+import threading
+from array import array
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class _Segment:
+    """One append-only log file plus the byte offset of every record in it."""
+
+    def __init__(self, path: str, first_seq: int):
+        self.path = path
+        self.first_seq = first_seq
+        self.offsets = array("Q")
+        self.size = 0
+
+    @property
+    def last_seq(self) -> int:
+        return self.first_seq + len(self.offsets) - 1
+
+
+class MessageStore:
+    """Bounded, persistent store for the monitor's message log.
+
+    The newest `capacity` messages are kept in an in-memory ring buffer. Every
+    message is also appended to a segmented JSON-lines log in `log_dir`; a segment
+    is rotated once it grows past `max_segment_bytes`, and only the newest
+    `max_segments` segments are kept on disk. Each segment keeps the byte offset of
+    its records, so reading `k` messages after a sequence number costs O(k), from
+    memory or from disk. History is reloaded from the log on restart.
+    """
+
+    def __init__(
+        self,
+        log_dir: str,
+        capacity: int = 10_000,
+        max_segment_bytes: int = 16 * 2**20,
+        max_segments: int = 8,
+    ):
+        self.log_dir = log_dir
+        self.capacity = capacity
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        # Ring buffer slot of message `seq` is `seq % capacity`.
+        self._ring: list = [None] * capacity
+        self._ring_count = 0
+        self._segments: list[_Segment] = []
+        self._lock = threading.RLock()
+        self._writer = None
+        self.last_seq = 0
+        os.makedirs(log_dir, exist_ok=True)
+        self._load()
+
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.log_dir, f"{SEGMENT_PREFIX}{first_seq:020d}{SEGMENT_SUFFIX}")
+
+    def _load(self):
+        """Rebuilds the segment index and the ring buffer from the log on disk."""
+        names = sorted(
+            name for name in os.listdir(self.log_dir)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        for name in names:
+            first_seq = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            segment = _Segment(os.path.join(self.log_dir, name), first_seq)
+            with open(segment.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write at the end of the last segment
+                    segment.offsets.append(offset)
+                    offset += len(line)
+                segment.size = offset
+            if segment.offsets:
+                self._segments.append(segment)
+
+        if self._segments:
+            self.last_seq = self._segments[-1].last_seq
+            tail_start = max(self._segments[0].first_seq, self.last_seq - self.capacity + 1)
+            for message in self._read_from_disk(tail_start, self.last_seq):
+                self._remember(message)
+            logger.info(f"Loaded {self.last_seq - self._segments[0].first_seq + 1} messages from {self.log_dir}.")
+
+        if self._segments and self._segments[-1].size < self.max_segment_bytes:
+            segment = self._segments[-1]
+            # Drop a torn trailing record, if any, before appending after it.
+            with open(segment.path, "r+b") as f:
+                f.truncate(segment.size)
+            self._writer = open(segment.path, "ab")
+
+    def _rotate(self):
+        if self._writer:
+            self._writer.close()
+        segment = _Segment(self._segment_path(self.last_seq + 1), self.last_seq + 1)
+        self._segments.append(segment)
+        self._writer = open(segment.path, "ab")
+        while len(self._segments) > self.max_segments:
+            expired = self._segments.pop(0)
+            os.remove(expired.path)
+            logger.info(f"Removed expired log segment {expired.path}.")
+
+    def append(self, message: dict) -> int:
+        """Assigns the next sequence number to `message`, stores it and returns the number."""
+        return self.append_many([message])
+
+    def append_many(self, messages: list) -> int:
+        """Stores the messages in order with one flush and returns the last sequence number."""
+        with self._lock:
+            for message in messages:
+                if self._writer is None or self._segments[-1].size >= self.max_segment_bytes:
+                    self._rotate()
+                message["seq"] = self.last_seq + 1
+                line = (json.dumps(message) + "\n").encode()
+                segment = self._segments[-1]
+                self._writer.write(line)
+                segment.offsets.append(segment.size)
+                segment.size += len(line)
+                self.last_seq = message["seq"]
+                self._remember(message)
+            if self._writer is not None:
+                self._writer.flush()
+            return self.last_seq
+
+    def _remember(self, message: dict):
+        self._ring[message["seq"] % self.capacity] = message
+        self._ring_count = min(self._ring_count + 1, self.capacity)
+
+    def _read_from_disk(self, start: int, end: int) -> list:
+        """Reads messages `start`..`end` (inclusive) from the segments that still hold them."""
+        result = []
+        first_seqs = [segment.first_seq for segment in self._segments]
+        index = max(bisect.bisect_right(first_seqs, start) - 1, 0)
+        seq = max(start, self._segments[0].first_seq) if self._segments else start
+        for segment in self._segments[index:]:
+            if seq > end:
+                break
+            if seq > segment.last_seq:
+                continue
+            with open(segment.path, "rb") as f:
+                f.seek(segment.offsets[seq - segment.first_seq])
+                while seq <= min(end, segment.last_seq):
+                    result.append(json.loads(f.readline()))
+                    seq += 1
+        return result
+
+    def since(self, seq: int, limit: int | None = None) -> list:
+        """Returns up to `limit` messages with a sequence number greater than `seq`."""
+        with self._lock:
+            ring_first = self.last_seq - self._ring_count + 1
+            # Messages that were rotated out of the log are skipped.
+            oldest = min(self._segments[0].first_seq, ring_first) if self._segments else ring_first
+            start = max(seq + 1, oldest)
+            end = self.last_seq if limit is None else min(self.last_seq, start + limit - 1)
+            if start > end:
+                return []
+            if start >= ring_first:
+                return [self._ring[i % self.capacity] for i in range(start, end + 1)]
+            older = self._read_from_disk(start, min(end, ring_first - 1))
+            if end >= ring_first:
+                older.extend(self._ring[i % self.capacity] for i in range(ring_first, end + 1))
+            return older
+
+    def close(self):
+        with self._lock:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
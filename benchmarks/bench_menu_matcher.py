@@ -0,0 +1,113 @@
+"""Lookup cost of the restaurant menu matcher on large synthetic menus.
+
+Compares the old linear scan of `_find_item_match` (lowercase + substring test of
+every item, twice per lookup) with the precompiled `MenuMatcher`, for exact,
+partial and misspelled queries. Also reports how many misspelled queries each one
+resolves; the linear scan resolves none of them.
+
+Usage:
+    python benchmarks/bench_menu_matcher.py [--sizes 100 1000 5000] [--queries 2000]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from shared.restaurant.matcher import MenuMatcher  # noqa: E402
+
+
+ADJECTIVES = [
+    "Spicy", "Crispy", "Smoky", "Golden", "Garlic", "Honey", "Lemon", "Sesame", "Szechuan", "Teriyaki",
+    "Roasted", "Grilled", "Braised", "Steamed", "Sweet", "Sour", "Peppered", "Herbed", "Creamy", "Tangy",
+    "Hickory", "Chipotle", "Ginger", "Basil", "Truffle",
+]
+PROTEINS = [
+    "Chicken", "Beef", "Pork", "Shrimp", "Tofu", "Salmon", "Lamb", "Duck", "Mushroom", "Eggplant",
+    "Turkey", "Scallop", "Squid", "Halibut", "Paneer", "Tempeh", "Brisket", "Chorizo", "Crab", "Cod",
+]
+DISHES = [
+    "Noodles", "Fried Rice", "Curry", "Stir Fry", "Dumplings", "Tacos", "Burrito", "Salad", "Soup", "Sandwich",
+    "Skewers", "Bowl", "Wrap", "Flatbread", "Risotto",
+]
+
+
+def synthetic_menu(size: int) -> dict:
+    names = [" ".join(parts) for parts in itertools.product(ADJECTIVES, PROTEINS, DISHES)]
+    random.Random(size).shuffle(names)
+    if size > len(names):
+        raise ValueError(f"At most {len(names)} synthetic items are available.")
+    return {name: 9.99 for name in names[:size]}
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    if len(word) < 5:
+        return word
+    i = rng.randrange(1, len(word) - 2)
+    if rng.random() < 0.5:
+        return word[:i] + word[i + 1:]  # dropped letter
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]  # swapped letters
+
+
+def queries_for(menu: dict, count: int) -> dict[str, list[str]]:
+    rng = random.Random(count)
+    names = list(menu)
+    picks = [rng.choice(names) for _ in range(count)]
+    return {
+        "exact": [name.lower() for name in picks],
+        "partial": [" ".join(name.split()[:2]) for name in picks],
+        "misspelled": [" ".join(misspell(word, rng) for word in name.split()) for name in picks],
+    }
+
+
+def legacy_find_item_match(user_input, menu_category):
+    """The linear scan `_find_item_match` used before the matcher."""
+    user_input_lower = user_input.lower()
+    for item_name in menu_category.keys():
+        if user_input_lower == item_name.lower():
+            return item_name
+    matches = [item_name for item_name in menu_category.keys() if user_input_lower in item_name.lower()]
+    if len(matches) == 1:
+        return matches[0]
+    if len(matches) > 1:
+        matches.sort(key=lambda x: len(x.split()))
+        if user_input_lower in matches[0].lower().split():
+            return matches[0]
+        return matches
+    return None
+
+
+def timed(lookup, queries: list[str]) -> tuple[float, int]:
+    started = time.perf_counter()
+    resolved = sum(1 for query in queries if lookup(query) is not None)
+    return (time.perf_counter() - started) / len(queries), resolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--queries", type=int, default=2_000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        menu = synthetic_menu(size)
+        started = time.perf_counter()
+        matcher = MenuMatcher(menu)
+        build_ms = (time.perf_counter() - started) * 1000
+        print(f"{size} items (matcher built in {build_ms:.1f} ms)")
+        for kind, queries in queries_for(menu, args.queries).items():
+            legacy_time, legacy_resolved = timed(lambda q: legacy_find_item_match(q, menu), queries)
+            matcher_time, matcher_resolved = timed(matcher.match, queries)
+            print(
+                f"  {kind:<10} linear scan {legacy_time * 1e6:9.1f} us ({legacy_resolved / len(queries):4.0%} resolved)   "
+                f"matcher {matcher_time * 1e6:7.1f} us ({matcher_resolved / len(queries):4.0%} resolved)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Per-update cost of the a2a_monitor read API as the message log grows.
+
+Compares what a client pays to pick up one new message through the cursor API
+(`GET /messages?since=<seq>`) with reading the oldest page of history
+(`GET /messages`, capped at 1000 entries), at increasing log sizes. Both costs
+should stay flat as the log grows; the old endpoint returned the whole list.
+
+Usage:
+    python benchmarks/bench_monitor_updates.py [--sizes 1000 10000 100000] [--reads 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "a2a_monitor"))
+
+# Keep the benchmark's messages out of the real monitor log.
+os.environ.setdefault("A2A_MONITOR_LOG_DIR", tempfile.mkdtemp(prefix="a2a_monitor_bench_"))
+os.environ.setdefault("A2A_MONITOR_CAPACITY", "200000")
+
+import main as monitor  # noqa: E402
+from starlette.testclient import TestClient  # noqa: E402
+
+
+def fill(count: int):
+    """Grows the monitor log to `count` messages through the public /log/batch endpoint."""
+    client = TestClient(monitor.app)
+    message = {"sender": "Alex Helper Bot", "receiver": "Luigi's Pizza Bot", "message": "Send me your full menu."}
+    while monitor.store.last_seq < count:
+        batch_size = min(monitor.MAX_BATCH_SIZE, count - monitor.store.last_seq)
+        client.post("/log/batch", json=[message] * batch_size)
+
+
+def timed_reads(path: str, reads: int) -> tuple[float, int]:
+    client = TestClient(monitor.app)
+    latencies, size = [], 0
+    for _ in range(reads):
+        started = time.perf_counter()
+        response = client.get(path)
+        size = len(response.content)
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--reads", type=int, default=50)
+    args = parser.parse_args()
+
+    for size in sorted(args.sizes):
+        fill(size)
+        cursor = monitor.store.last_seq - 1
+        full_latency, full_bytes = timed_reads("/messages", args.reads)
+        cursor_latency, cursor_bytes = timed_reads(f"/messages?since={cursor}", args.reads)
+        print(
+            f"{size:>8} messages  history page={full_latency * 1000:9.2f} ms ({full_bytes:>10} B)  "
+            f"cursor={cursor_latency * 1000:7.3f} ms ({cursor_bytes:>5} B)"
+        )
+
+
+if __name__ == "__main__":
+    main()
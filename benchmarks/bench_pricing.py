@@ -0,0 +1,128 @@
+"""Checkout cost and accuracy of the integer-cents pricing engine.
+
+Builds pizza orders with thousands of line items through the regular
+`add_item_to_order` tool, then compares the old `calculate_total` (sums floats
+over every line) with the incremental engine, whose checkout only reads the
+running totals. Also reports the float drift of the old sum and the throughput of
+bulk repricing (`reprice_all`) over many restaurants' open orders.
+
+Usage:
+    python benchmarks/bench_pricing.py [--lines 1000 10000] [--restaurants 200] [--orders 50]
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from shared.restaurant import tools  # noqa: E402
+from shared.restaurant.catalog import Catalog  # noqa: E402
+from shared.restaurant.pricing import PriceTable, reprice_all  # noqa: E402
+
+CATALOG = Catalog(os.path.join(ROOT_DIR, "pizza_house_worker", "menu.json"))
+ORDER_TOOLS = tools.OrderTools(CATALOG)
+MENU = CATALOG.current().menu
+PRICES = CATALOG.current().prices
+TAX_RATE = PRICES.tax_basis_points / 10_000
+
+
+def legacy_calculate_total(order: dict) -> dict:
+    """The float-based `calculate_total` used before the pricing engine."""
+    subtotal = 0.0
+    for pizza in order.get("pizzas", []):
+        item_price = MENU["pizzas"].get(pizza["size"], 0)
+        item_price += MENU["crusts"].get(pizza["crust"], 0)
+        for topping in pizza["toppings"]:
+            item_price += MENU["toppings"].get(topping, 0)
+        pizza["price"] = item_price
+        subtotal += item_price
+    for side in order.get("sides", []):
+        subtotal += MENU["sides"].get(side, 0)
+    for drink in order.get("drinks", []):
+        subtotal += MENU["drinks"].get(drink, 0)
+    for combo in order.get("combos", []):
+        subtotal += MENU["combos"].get(combo, 0)
+    order["float_subtotal"] = subtotal
+    order["subtotal"] = round(subtotal, 2)
+    order["tax"] = round(subtotal * TAX_RATE, 2)
+    order["total"] = round(subtotal * (1 + TAX_RATE), 2)
+    return {"billing_summary": order}
+
+
+def build_order(lines: int, rng: random.Random) -> SimpleNamespace:
+    """Adds `lines` random items through the tools; the order ends up in the returned context's state."""
+    tool_context = SimpleNamespace(state={})
+    for _ in range(lines):
+        kind = rng.random()
+        if kind < 0.5:
+            ORDER_TOOLS.add_item_to_order(
+                "pizzas",
+                rng.choice(list(MENU["pizzas"])),
+                tool_context,
+                [rng.choice(list(MENU["crusts"])), *rng.sample(list(MENU["toppings"]), rng.randint(0, 3))],
+            )
+        elif kind < 0.75:
+            ORDER_TOOLS.add_item_to_order("sides", rng.choice(list(MENU["sides"])), tool_context)
+        else:
+            ORDER_TOOLS.add_item_to_order("drinks", rng.choice(list(MENU["drinks"])), tool_context)
+    return tool_context
+
+
+def timed(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--restaurants", type=int, default=200)
+    parser.add_argument("--orders", type=int, default=50, help="open orders per restaurant")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    for lines in args.lines:
+        started = time.perf_counter()
+        tool_context = build_order(lines, rng)
+        order = tool_context.state[tools.ORDER_STATE_KEY]
+        add_us = (time.perf_counter() - started) / lines * 1e6
+        legacy_order = copy.deepcopy(order)
+        legacy = timed(lambda: legacy_calculate_total(legacy_order), 5)
+        incremental = timed(lambda: ORDER_TOOLS.calculate_total(tool_context), 1000)
+        reprice = timed(lambda: PRICES.reprice(order), 5)
+        print(
+            f"{lines:>6} lines: add {add_us:6.1f} us/line  checkout legacy {legacy * 1000:8.2f} ms  "
+            f"incremental {incremental * 1e6:6.2f} us  full reprice {reprice * 1000:7.2f} ms"
+        )
+        exact = order["subtotal_cents"]
+        drift = legacy_order["float_subtotal"] * 100 - exact
+        print(f"        subtotal exact ${exact / 100:,.2f}, float sum off by {drift:+.6f} cents before rounding")
+
+    # Bulk repricing: every restaurant's open orders after a menu-wide price change.
+    tables = {
+        f"restaurant-{i}": PriceTable(
+            {category: {name: price * (1 + i / 1000) for name, price in items.items()} for category, items in MENU.items()},
+            TAX_RATE,
+            components=PRICES.components,
+        )
+        for i in range(args.restaurants)
+    }
+    template = build_order(20, rng).state[tools.ORDER_STATE_KEY]
+    orders = [(restaurant, copy.deepcopy(template)) for restaurant in tables for _ in range(args.orders)]
+    started = time.perf_counter()
+    count = reprice_all(tables, orders)
+    elapsed = time.perf_counter() - started
+    print(f"bulk reprice: {count} orders of 20 lines over {len(tables)} restaurants in {elapsed * 1000:.1f} ms "
+          f"({count / elapsed:,.0f} orders/s)")
+
+
+if __name__ == "__main__":
+    main()
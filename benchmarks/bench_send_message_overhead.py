@@ -0,0 +1,102 @@
+"""Measures the per-hop overhead that personal_helper's `send_message` adds on top of the restaurant.
+
+The restaurant is replaced by a stub connection that answers instantly, so the
+reported latency is pure helper-side overhead. The "legacy" profile reproduces the
+old behaviour (2 s sleep before and after every hop, monitor posts awaited inline);
+the "default" profile uses the zero-delay pacing policy and the background publisher.
+
+Usage:
+    python benchmarks/bench_send_message_overhead.py [--hops 8]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+from a2a.types import (
+    Artifact,
+    Part,
+    SendMessageResponse,
+    SendMessageSuccessResponse,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "personal_helper"))
+sys.path.insert(1, ROOT_DIR)
+
+from auxiliary import tools  # noqa: E402
+from auxiliary.circuit_breaker import CircuitBreaker  # noqa: E402
+
+
+class StubConnection:
+    """Answers every message immediately with a completed task."""
+
+    is_connected = True
+
+    def __init__(self):
+        self.breaker = CircuitBreaker("Bench Bot")
+
+    async def send_message(self, message_request):
+        task = Task(
+            id=uuid.uuid4().hex,
+            contextId=uuid.uuid4().hex,
+            status=TaskStatus(state=TaskState.completed),
+            artifacts=[Artifact(artifactId="answer", parts=[Part(root=TextPart(text="Got it."))])],
+        )
+        return SendMessageResponse(root=SendMessageSuccessResponse(id=message_request.id, result=task))
+
+
+async def run_hops(pacing: tools.PacingPolicy, inline_monitor: bool, hops: int) -> list[float]:
+    publisher = tools.MonitorPublisher(monitor_url="http://127.0.0.1:9/log")
+    host_agent = SimpleNamespace(
+        agent_name="AlexHelperBot",
+        remote_agent_connections={"Bench Bot": StubConnection()},
+        pacing_policy=pacing,
+        monitor_publisher=publisher,
+    )
+    # Like the ADK tool context: the session state and the invocation the turn is billed to.
+    tool_context = SimpleNamespace(state={}, invocation_id=uuid.uuid4().hex)
+
+    latencies = []
+    for i in range(hops):
+        started = time.perf_counter()
+        await tools.send_message(host_agent, "Bench Bot", f"hop {i}", tool_context)
+        if inline_monitor:
+            await publisher.flush()
+        latencies.append(time.perf_counter() - started)
+    await publisher.close()
+    return latencies
+
+
+async def main_async(hops: int):
+    profiles = {
+        "legacy": (tools.PacingPolicy(before_send=2, after_receive=2), True),
+        "default": (tools.PacingPolicy(), False),
+    }
+    for name, (pacing, inline_monitor) in profiles.items():
+        latencies = await run_hops(pacing, inline_monitor, hops)
+        print(
+            f"{name:<8} per-hop p50={statistics.median(latencies) * 1000:9.2f} ms  "
+            f"max={max(latencies) * 1000:9.2f} ms  "
+            f"order of {hops} hops={sum(latencies):7.2f} s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hops", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.hops))
+
+
+if __name__ == "__main__":
+    main()
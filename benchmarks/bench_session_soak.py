@@ -0,0 +1,95 @@
+"""Soak test for the session services: RSS and upsert latency over many sessions.
+
+Every simulated session is upserted the way the executors do it and then receives
+one event carrying an order-sized state delta. RSS is sampled as sessions pile up,
+for the in-memory service and for the SQLite-backed one.
+
+Usage:
+    python benchmarks/bench_session_soak.py [--sessions 100000] [--backend sqlite|memory|both]
+"""
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from shared.session_service import SqliteSessionService  # noqa: E402
+
+
+APP_NAME = "LuigisPizzaBot"
+USER_ID = "self"
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (falls back to peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def upsert(service, session_id: str):
+    session = await service.get_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=session_id, config=GetSessionConfig(num_recent_events=1)
+    )
+    if session is None:
+        session = await service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=session_id)
+    return session
+
+
+async def soak(name: str, service, sessions: int, samples: int):
+    order = {"pizzas": [{"size": "Large Pizza", "crust": "Thin", "toppings": ["Pepperoni"]}], "order_status": "building"}
+    upsert_latencies = []
+    every = max(1, sessions // samples)
+    print(f"--- {name} ---")
+    for i in range(sessions):
+        started = time.perf_counter()
+        session = await upsert(service, f"session-{i}")
+        upsert_latencies.append(time.perf_counter() - started)
+        await service.append_event(
+            session,
+            Event(
+                author="LuigisPizzaBot",
+                content=types.ModelContent(parts=[types.Part(text="Added one Large Pizza.")]),
+                actions=EventActions(state_delta={"order": order}),
+            ),
+        )
+        if (i + 1) % every == 0:
+            recent = upsert_latencies[-every:]
+            print(
+                f"{i + 1:>8} sessions  rss={rss_mb():8.1f} MiB  "
+                f"upsert p50={statistics.median(recent) * 1e6:8.1f} us  max={max(recent) * 1e6:9.1f} us"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--backend", choices=["sqlite", "memory", "both"], default="both")
+    args = parser.parse_args()
+
+    if args.backend in ("sqlite", "both"):
+        with tempfile.TemporaryDirectory() as tmp:
+            service = SqliteSessionService(os.path.join(tmp, "soak.db"))
+            asyncio.run(soak("sqlite", service, args.sessions, args.samples))
+            service.close()
+    if args.backend in ("memory", "both"):
+        asyncio.run(soak("memory", InMemorySessionService(), args.sessions, args.samples))
+
+
+if __name__ == "__main__":
+    main()
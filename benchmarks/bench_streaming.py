@@ -0,0 +1,123 @@
+"""Measures time-to-first-token and total latency of the restaurant executors.
+
+The model is replaced by a stub runner that produces a fixed answer in chunks with
+a configurable per-chunk delay, so the numbers only reflect how the executor
+forwards the answer to the A2A event queue (streaming vs. whole-turn).
+
+Usage:
+    python benchmarks/bench_streaming.py [--agent pizza_house_worker] [--chunks 40] [--chunk-delay 0.02]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import TaskArtifactUpdateEvent
+from google.adk.agents.run_config import StreamingMode
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENTS = ["pizza_house_worker", "chinese", "personal_helper"]
+
+
+class StubRunner:
+    """A runner that answers every message with a chunked canned response."""
+
+    def __init__(self, chunks: int, chunk_delay: float):
+        self.app_name = "bench"
+        self.session_service = InMemorySessionService()
+        self._chunks = [f"token{i} " for i in range(chunks)]
+        self._chunk_delay = chunk_delay
+
+    async def run_async(self, user_id, session_id, new_message, run_config=None):
+        streaming = run_config is not None and run_config.streaming_mode == StreamingMode.SSE
+        for chunk in self._chunks:
+            await asyncio.sleep(self._chunk_delay)
+            if streaming:
+                yield Event(
+                    author="bench",
+                    partial=True,
+                    content=types.ModelContent(parts=[types.Part(text=chunk)]),
+                )
+        yield Event(
+            author="bench",
+            content=types.ModelContent(parts=[types.Part(text="".join(self._chunks))]),
+        )
+
+
+class RecordingQueue:
+    """Records the arrival time of every event the executor enqueues."""
+
+    def __init__(self):
+        self.artifact_times: list[float] = []
+
+    async def enqueue_event(self, event):
+        if isinstance(event, TaskArtifactUpdateEvent):
+            self.artifact_times.append(time.perf_counter())
+
+
+async def run_once(executor, session_id: str) -> tuple[float, float]:
+    queue = RecordingQueue()
+    updater = TaskUpdater(queue, task_id=session_id, context_id=session_id)
+    started = time.perf_counter()
+    await executor._process_request(
+        types.UserContent(parts=[types.Part(text="Send me your full menu.")]),
+        session_id,
+        updater,
+    )
+    finished = time.perf_counter()
+    return queue.artifact_times[0] - started, finished - started
+
+
+def build_executor(agent: str, runner: StubRunner, streaming: bool):
+    """The helper's executor, or the shared restaurant executor with the restaurant's catalog."""
+    sys.path.insert(0, ROOT_DIR)
+    if agent == "personal_helper":
+        sys.path.insert(0, os.path.join(ROOT_DIR, agent))
+        from agent_executor import HelperBotAgentExecutor
+
+        return HelperBotAgentExecutor(runner, card=None, streaming=streaming)
+    from shared.restaurant.agent_executor import RestaurantAgentExecutor
+    from shared.restaurant.catalog import Catalog
+
+    catalog = Catalog(os.path.join(ROOT_DIR, agent, "menu.json"))
+    return RestaurantAgentExecutor(runner, card=None, catalog=catalog, streaming=streaming)
+
+
+async def bench(agent: str, streaming: bool, chunks: int, chunk_delay: float, runs: int):
+    executor = build_executor(agent, StubRunner(chunks, chunk_delay), streaming)
+
+    ttft, total = [], []
+    for i in range(runs):
+        first, whole = await run_once(executor, f"session-{streaming}-{i}")
+        ttft.append(first)
+        total.append(whole)
+
+    mode = "streaming" if streaming else "blocking"
+    print(
+        f"{agent:<20} {mode:<10} "
+        f"ttft p50={statistics.median(ttft) * 1000:8.2f} ms  "
+        f"total p50={statistics.median(total) * 1000:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", choices=AGENTS, default="pizza_house_worker")
+    parser.add_argument("--chunks", type=int, default=40)
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for streaming in (False, True):
+        asyncio.run(bench(args.agent, streaming, args.chunks, args.chunk_delay, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Load test for the a2a_monitor ingestion endpoints.
+
+Starts concurrent local HTTP clients that post events to a running monitor for a
+fixed duration and reports the sustained ingestion rate. Compare single-event
+posts (`/log`) against batched posts (`/log/batch`, JSON array or NDJSON).
+
+Start the monitor first (`python a2a_monitor/main.py`), then for example:
+    python benchmarks/load_monitor_ingest.py --mode batch --batch-size 500 --clients 8
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def make_event(client_id: int, i: int) -> dict:
+    return {"sender": f"LoadClient{client_id}", "receiver": "Monitor", "message": f"event {i}"}
+
+
+async def run_client(client: httpx.AsyncClient, args, client_id: int, deadline: float, stats: dict):
+    i = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if args.mode == "single":
+            response = await client.post(f"{args.url}/log", json=make_event(client_id, i))
+            sent = 1
+        else:
+            batch = [make_event(client_id, i + j) for j in range(args.batch_size)]
+            if args.mode == "ndjson":
+                body = "\n".join(json.dumps(event) for event in batch)
+                response = await client.post(
+                    f"{args.url}/log/batch", content=body, headers={"content-type": "application/x-ndjson"}
+                )
+            else:
+                response = await client.post(f"{args.url}/log/batch", json=batch)
+            sent = len(batch)
+        stats["latencies"].append(time.perf_counter() - started)
+        if response.status_code == 200:
+            stats["events"] += sent
+        else:
+            stats["errors"] += 1
+        i += sent
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    stats = {"events": 0, "errors": 0, "latencies": []}
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(run_client(client, args, c, deadline, stats) for c in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(stats["latencies"])
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    print(
+        f"mode={args.mode} clients={args.clients} batch={args.batch_size if args.mode != 'single' else 1}: "
+        f"{stats['events'] / elapsed:,.0f} events/s, {stats['errors']} failed requests, "
+        f"request p50={statistics.median(latencies) * 1000 if latencies else 0:.2f} ms p99={p99 * 1000:.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:10111")
+    parser.add_argument("--mode", choices=["single", "batch", "ndjson"], default="batch")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""End-to-end load generator: simulated customers placing orders over A2A.
+
+Starts `personal_helper`, `chinese` and `pizza_house_worker` locally (unless
+`--no-spawn`), with the model replaced by the record/replay backend (`--model
+replay`, needs tapes recorded with `A2A_MODEL_MODE=record`) or a stub that answers
+every turn with the same text (`--model stub`). Then drives `--customers`
+simulated customers, `--concurrency` at a time, through scripted order flows:
+through the personal helper, which talks to the restaurants, or straight to a
+restaurant. Every message is one hop; the hops of a flow make up one order.
+
+Reports throughput, p50/p95/p99 latency per hop, per agent and per order, and
+error rates, and writes them to `--output` as JSON (plus every single hop to
+`--samples` as CSV), so runs can be diffed across versions. Every order is sent
+as one trace, so with `A2A_TRACE_EXPORT=file` its hops can be followed in the
+services' span files (see `trace_report.py`).
+
+Usage:
+    python benchmarks/load_order_flows.py [--model stub|replay] [--customers 1000] [--concurrency 50]
+        [--think-time 0.5] [--flows pizza_direct chinese_direct helper_pizza helper_chinese]
+        [--output load_results.json] [--samples load_samples.csv] [--no-spawn]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+# Agent -> (service directory, URL). The helper expects the restaurants on these ports.
+AGENTS = {
+    "helper": ("personal_helper", "http://localhost:10000"),
+    "pizza": ("pizza_house_worker", "http://localhost:10003"),
+    "chinese": ("chinese", "http://localhost:10004"),
+}
+
+# Flow -> (agent the customer talks to, [(step, message), ...]).
+FLOWS = {
+    "pizza_direct": ("pizza", [
+        ("greeting", "Hi! This is for pickup."),
+        ("menu", "What's on the menu?"),
+        ("add_pizza", "One large pizza with thin crust and pepperoni, please."),
+        ("add_side", "And a garlic bread."),
+        ("finish", "That's all."),
+        ("payment", "I'll pay by credit card."),
+        ("eta", "When will it be ready?"),
+    ]),
+    "chinese_direct": ("chinese", [
+        ("greeting", "Hello, I'd like to order for pickup."),
+        ("menu", "What's on the menu?"),
+        ("add_main", "Kung Pao Chicken with fried rice, please."),
+        ("add_appetizer", "And spring rolls."),
+        ("finish", "That's everything."),
+        ("payment", "Credit card, please."),
+        ("eta", "How long will it take?"),
+    ]),
+    "helper_pizza": ("helper", [
+        ("request", "I'm hungry, can you get me a pizza?"),
+        ("choose", "A large pepperoni pizza sounds great."),
+        ("confirm", "Yes, go ahead and order it."),
+    ]),
+    "helper_chinese": ("helper", [
+        ("request", "Can you order me some Chinese food?"),
+        ("choose", "Kung Pao Chicken, please."),
+        ("confirm", "Yes, that's all."),
+    ]),
+}
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(seconds: list[float]) -> dict:
+    values = sorted(seconds)
+    return {
+        "p50": round(percentile(values, 50) * 1000, 2),
+        "p95": round(percentile(values, 95) * 1000, 2),
+        "p99": round(percentile(values, 99) * 1000, 2),
+        "mean": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "max": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+def start_services(args, workdir: str) -> list[subprocess.Popen]:
+    env = dict(os.environ, A2A_MODEL_MODE=args.model, A2A_MODEL_TAPE_DIR=os.path.abspath(args.tape_dir))
+    if args.model_latency is not None:
+        env["A2A_REPLAY_LATENCY"] = str(args.model_latency)
+    processes = []
+    for service, _url in AGENTS.values():
+        # Run from the scratch directory, so session databases do not end up in the tree.
+        with open(os.path.join(workdir, f"{service}.log"), "w") as log:
+            processes.append(subprocess.Popen(
+                [sys.executable, os.path.join(ROOT_DIR, service, "a2a_server.py")],
+                cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+            ))
+    return processes
+
+
+async def wait_until_ready(client: httpx.AsyncClient, processes: list[subprocess.Popen], timeout: float):
+    deadline = time.monotonic() + timeout
+    pending = {url for _service, url in AGENTS.values()}
+    while pending:
+        if any(process.poll() is not None for process in processes):
+            raise RuntimeError("A service exited during startup, see its log in the work directory.")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Services not ready after {timeout:.0f}s: {sorted(pending)}")
+        for url in list(pending):
+            try:
+                if (await client.get(url + AGENT_CARD_PATH)).status_code == 200:
+                    pending.discard(url)
+            except httpx.HTTPError:
+                pass
+        await asyncio.sleep(0.5)
+
+
+async def send(client: httpx.AsyncClient, url: str, text: str, context_id: str, trace_id: str) -> str | None:
+    """Sends one message and returns an error description, or None if the task completed."""
+    message_id = uuid.uuid4().hex
+    request = {
+        "jsonrpc": "2.0",
+        "id": message_id,
+        "method": "message/send",
+        "params": {"message": {
+            "role": "user",
+            "parts": [{"kind": "text", "text": text}],
+            "messageId": message_id,
+            "contextId": context_id,
+            "metadata": {"traceparent": f"00-{trace_id}-{secrets.token_hex(8)}-01"},
+        }},
+    }
+    try:
+        response = await client.post(url, json=request)
+    except httpx.HTTPError as e:
+        return f"{type(e).__name__}"
+    if response.status_code != 200:
+        return f"HTTP {response.status_code}"
+    body = response.json()
+    if "error" in body:
+        return f"JSON-RPC {body['error'].get('code')}: {body['error'].get('message')}"
+    state = body.get("result", {}).get("status", {}).get("state")
+    if state not in (None, "completed", "input-required"):
+        return f"task {state}"
+    return None
+
+
+async def run_customer(client, args, customer: int, flow: str, samples: list, orders: list):
+    agent, steps = FLOWS[flow]
+    url = AGENTS[agent][1]
+    context_id = uuid.uuid4().hex
+    trace_id = secrets.token_hex(16)
+    rng = random.Random(customer)
+    order_started = time.perf_counter()
+    service_time = 0.0
+    failed = False
+    for step, text in steps:
+        started = time.perf_counter()
+        error = await send(client, url, text, context_id, trace_id)
+        latency = time.perf_counter() - started
+        service_time += latency
+        samples.append({
+            "customer": customer, "flow": flow, "step": step, "agent": agent, "trace_id": trace_id,
+            "started": round(started, 6), "latency_ms": round(latency * 1000, 3), "error": error or "",
+        })
+        if error:
+            failed = True
+            break
+        if args.think_time:
+            await asyncio.sleep(rng.expovariate(1 / args.think_time))
+    orders.append({"flow": flow, "latency": service_time, "wall": time.perf_counter() - order_started, "failed": failed})
+
+
+def summarize(args, samples: list, orders: list, elapsed: float) -> dict:
+    hops = defaultdict(list)
+    by_agent = defaultdict(list)
+    for sample in samples:
+        hops[(sample["flow"], sample["step"], sample["agent"])].append(sample)
+        by_agent[sample["agent"]].append(sample)
+
+    def hop_stats(group: list) -> dict:
+        errors = sum(1 for sample in group if sample["error"])
+        return {
+            "count": len(group),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4),
+            "latency_ms": latency_summary([sample["latency_ms"] / 1000 for sample in group if not sample["error"]]),
+        }
+
+    completed = [order for order in orders if not order["failed"]]
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "model": args.model, "customers": args.customers, "concurrency": args.concurrency,
+            "think_time": args.think_time, "flows": args.flows,
+        },
+        "duration_s": round(elapsed, 3),
+        "orders": {
+            "count": len(orders),
+            "completed": len(completed),
+            "error_rate": round(1 - len(completed) / len(orders), 4) if orders else 0.0,
+            "throughput_per_s": round(len(completed) / elapsed, 3),
+            "latency_ms": latency_summary([order["latency"] for order in completed]),
+            "wall_ms": latency_summary([order["wall"] for order in completed]),
+        },
+        "hops": {"/".join(key[:2]): {"agent": key[2], **hop_stats(group)} for key, group in sorted(hops.items())},
+        "agents": {agent: hop_stats(group) for agent, group in sorted(by_agent.items())},
+        "hops_per_s": round(len(samples) / elapsed, 3),
+        "errors": dict(Counter(sample["error"] for sample in samples if sample["error"]).most_common(20)),
+    }
+
+
+def print_summary(results: dict):
+    orders = results["orders"]
+    print(
+        f"{orders['completed']}/{orders['count']} orders in {results['duration_s']:.1f}s "
+        f"({orders['throughput_per_s']:.2f} orders/s, {results['hops_per_s']:.1f} hops/s, "
+        f"error rate {orders['error_rate']:.2%})"
+    )
+    print(f"  {'order':<32} p50 {orders['latency_ms']['p50']:8.1f} ms  p95 {orders['latency_ms']['p95']:8.1f} ms  "
+          f"p99 {orders['latency_ms']['p99']:8.1f} ms")
+    for name, hop in results["hops"].items():
+        latency = hop["latency_ms"]
+        print(f"  {name:<32} p50 {latency['p50']:8.1f} ms  p95 {latency['p95']:8.1f} ms  p99 {latency['p99']:8.1f} ms  "
+              f"errors {hop['error_rate']:.2%}")
+    for error, count in results["errors"].items():
+        print(f"  error x{count}: {error}")
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    workdir = tempfile.mkdtemp(prefix="load_order_flows_")
+    processes = [] if args.no_spawn else start_services(args, workdir)
+    try:
+        async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+            await wait_until_ready(client, processes, args.startup_timeout)
+            samples, orders = [], []
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def customer(i: int):
+                async with semaphore:
+                    await run_customer(client, args, i, args.flows[i % len(args.flows)], samples, orders)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(customer(i) for i in range(args.customers)))
+            elapsed = time.perf_counter() - started
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+        if processes:
+            print(f"service logs: {workdir}")
+
+    results = summarize(args, samples, orders, elapsed)
+    print_summary(results)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    if args.samples:
+        with open(args.samples, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(samples[0]) if samples else ["customer"])
+            writer.writeheader()
+            writer.writerows(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", choices=["stub", "replay"], default="stub")
+    parser.add_argument("--tape-dir", default="model_tapes", help="tapes to replay (--model replay)")
+    parser.add_argument("--model-latency", type=float, default=None,
+                        help="seconds per model call; default: recorded (replay) or none (stub)")
+    parser.add_argument("--customers", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean seconds between a customer's messages")
+    parser.add_argument("--flows", nargs="+", choices=sorted(FLOWS), default=sorted(FLOWS))
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per request")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", default="load_results.json")
+    parser.add_argument("--samples", default=None, help="CSV file for every single hop")
+    parser.add_argument("--no-spawn", action="store_true", help="use services that are already running")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Critical-path report over the spans exported with `A2A_TRACE_EXPORT=file`.
+
+Reads the span files of all services (default `traces/*.jsonl`), groups them into
+traces, one per order when driven by `load_order_flows.py`, and walks each trace's
+critical path: the chain of spans that the end of the trace actually waited for.
+A span's critical time is the part of it not covered by a critical child, so the
+report shows where orders spend their time (model calls, tool calls, session
+loads, hops between agents) rather than which spans merely overlap.
+
+Prints the slowest traces with their critical path, and the critical time per
+span name summed over all traces; `--output` writes the same as JSON.
+
+Usage:
+    python benchmarks/trace_report.py [traces/*.jsonl ...] [--top 5] [--output trace_report.json]
+"""
+import argparse
+import glob
+import json
+from collections import defaultdict
+
+
+def load_spans(paths: list[str]) -> dict[str, list[dict]]:
+    """Spans by trace id."""
+    traces = defaultdict(list)
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    span = json.loads(line)
+                    traces[span["trace_id"]].append(span)
+    return traces
+
+
+def span_label(span: dict) -> str:
+    return f"{span['service']}: {span['name']}"
+
+
+def critical_path(spans: list[dict]) -> list[tuple[dict, int]]:
+    """The (span, critical nanoseconds) on the critical path of one trace, in order.
+
+    Spans whose parent is not in the trace (sent by a client that does not export,
+    or still open) are roots; the path starts at the root that ended last.
+    """
+    by_id = {span["span_id"]: span for span in spans}
+    children = defaultdict(list)
+    roots = []
+    for span in spans:
+        if span["parent_id"] in by_id:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+    path = []
+
+    def walk(span: dict, end: int):
+        # Children that ended last are waited for; earlier ones only count up to where the next one started.
+        cursor = min(span["end_ns"], end)
+        critical = 0
+        index = len(path)
+        path.append((span, 0))
+        for child in sorted(children[span["span_id"]], key=lambda child: child["end_ns"], reverse=True):
+            if child["end_ns"] <= span["start_ns"] or child["start_ns"] >= cursor:
+                continue
+            child_end = min(child["end_ns"], cursor)
+            critical += cursor - child_end
+            walk(child, child_end)
+            cursor = max(child["start_ns"], span["start_ns"])
+        critical += cursor - span["start_ns"]
+        path[index] = (span, max(critical, 0))
+
+    root = max(roots, key=lambda span: span["end_ns"])
+    walk(root, root["end_ns"])
+    return sorted(path, key=lambda step: step[0]["start_ns"])
+
+
+def trace_summary(trace_id: str, spans: list[dict]) -> dict:
+    start = min(span["start_ns"] for span in spans)
+    end = max(span["end_ns"] for span in spans)
+    return {
+        "trace_id": trace_id,
+        "duration_ms": round((end - start) / 1e6, 3),
+        "spans": len(spans),
+        "errors": sum(1 for span in spans if span["error"]),
+        "critical_path": [
+            {"span": span_label(span), "start_ms": round((span["start_ns"] - start) / 1e6, 3),
+             "critical_ms": round(critical / 1e6, 3)}
+            for span, critical in critical_path(spans)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="span files (default: traces/*.jsonl)")
+    parser.add_argument("--top", type=int, default=5, help="how many of the slowest traces to print")
+    parser.add_argument("--output", default=None, help="JSON file for the whole report")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob("traces/*.jsonl"))
+    if not paths:
+        parser.error("no span files; run the services with A2A_TRACE_EXPORT=file first")
+    traces = load_spans(paths)
+    summaries = sorted(
+        (trace_summary(trace_id, spans) for trace_id, spans in traces.items()),
+        key=lambda summary: summary["duration_ms"], reverse=True,
+    )
+
+    by_name = defaultdict(lambda: {"count": 0, "critical_ms": 0.0})
+    for summary in summaries:
+        for step in summary["critical_path"]:
+            by_name[step["span"]]["count"] += 1
+            by_name[step["span"]]["critical_ms"] += step["critical_ms"]
+    total = sum(entry["critical_ms"] for entry in by_name.values()) or 1.0
+
+    print(f"{len(summaries)} traces, {sum(summary['spans'] for summary in summaries)} spans from {len(paths)} files")
+    print("\ncritical time by span:")
+    for name, entry in sorted(by_name.items(), key=lambda item: item[1]["critical_ms"], reverse=True):
+        print(f"  {name:<48} {entry['critical_ms']:10.1f} ms  {entry['critical_ms'] / total:6.1%}  x{entry['count']}")
+    for summary in summaries[:args.top]:
+        print(f"\ntrace {summary['trace_id']}: {summary['duration_ms']:.1f} ms, {summary['spans']} spans, "
+              f"{summary['errors']} errors")
+        for step in summary["critical_path"]:
+            print(f"  +{step['start_ms']:9.1f} ms  {step['span']:<48} {step['critical_ms']:9.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"by_span": by_name, "traces": summaries}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +0,0 @@
-MENU = {
-    "appetizers": {
-        "Spring Rolls (2)": 4.50,
-        "Crab Rangoon (6)": 7.99,
-        "Dumplings (Steamed or Fried, 6)": 8.50,
-        "Edamame": 4.00,
-    },
-    "main_courses": {
-        "General Tso's Chicken": 14.99,
-        "Sesame Chicken": 14.99,
-        "Beef and Broccoli": 15.99,
-        "Sweet and Sour Pork": 13.99,
-        "Kung Pao Shrimp": 16.99,
-        "Ma Po Tofu": 12.99,
-    },
-    "rice_and_noodles": {
-        "Steamed Rice": 2.00,
-        "Fried Rice": 4.00,
-        "Lo Mein": 9.99,
-        "Chow Fun": 10.99,
-    },
-    "soups": {
-        "Wonton Soup": 3.99,
-        "Hot and Sour Soup": 3.99,
-        "Egg Drop Soup": 3.50,
-    },
-    "drinks": {
-        "Soda (Coke, Sprite)": 2.00,
-        "Iced Tea": 2.50,
-        "Thai Iced Tea": 3.50,
-        "Bottled Water": 1.50,
-    },
-}
@@ -32,6 +32,10 @@ log.info(f"Remote Agent Addresses: {REMOTE_AGENT_ADDRESSES}")
 # Instantiate the HostAgent logic class
 # You might want to add a task_callback here if needed, similar to run_orchestrator.py
 host_agent_logic = HostAgent(remote_agent_addresses=REMOTE_AGENT_ADDRESSES, task_callback=on_task_update)
+# Start discovering the remote agents now if we are imported inside a running event loop,
+# so the first user turn does not pay for it. Its background refresh and pooled
+# connections are closed when the serving event loop shuts down (see HostAgent.close).
+host_agent_logic.warm_up()
 
 # Create the actual ADK Agent instance
 root_agent: BaseAgent = host_agent_logic.create_agent()
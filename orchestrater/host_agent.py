@@ -14,7 +14,6 @@ from remote.remote_agent_connection import (
     RemoteAgentConnections,
     TaskUpdateCallback
 )
-from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
     MessageSendParams,
@@ -23,15 +22,21 @@ from a2a.types import (
     SendMessageSuccessResponse,
     Task
 )
-import httpx
 from .remote_agent_connection import (
     RemoteAgentConnections,
     TaskUpdateCallback,
 )
+from shared import tracing
+from shared.card_cache import AgentCardCache
+from shared.model_backend import model_backend
+from shared.prompt_cache import PromptCache
+from shared.transport import HttpTransport, shared_transport
 
 
-def create_send_message_payload(text: str, task_id: str | None = None, context_id: str | None = None) -> dict[str, Any]:
-    """Create a payload for sending a message to the remote agent."""
+def create_send_message_payload(
+    text: str, task_id: str | None = None, context_id: str | None = None, metadata: dict | None = None
+) -> dict[str, Any]:
+    """Create a payload for sending a message to the remote agent, carrying the current trace context."""
     payload: dict[str, Any] = {
         'message': {
             'role': 'user',
@@ -43,6 +48,9 @@ def create_send_message_payload(text: str, task_id: str | None = None, context_i
         payload['message']['taskId'] = task_id
     if context_id:
         payload['message']['contextId'] = context_id
+    metadata = tracing.inject(metadata)
+    if metadata:
+        payload['message']['metadata'] = metadata
     return payload
 
 class HostAgent:
@@ -54,57 +62,160 @@ class HostAgent:
     def __init__(
         self,
         remote_agent_addresses: List[str],
-        task_callback: TaskUpdateCallback | None = None
+        task_callback: TaskUpdateCallback | None = None,
+        transport: HttpTransport = shared_transport,
+        discovery_timeout: float = 5.0,
+        refresh_interval: float = 60.0,
     ):
         print("HostAgent instance created in memory (uninitialized).")
         self.task_callback = task_callback
+        self.transport = transport
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
         self.is_initialized = False
+        self.discovery_timeout = discovery_timeout
+        self.refresh_interval = refresh_interval
+        self._cards_by_address: dict[str, AgentCard] = {}
+        self._initialization: asyncio.Task | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self.card_cache = AgentCardCache()
+        # The agent list and active agent are sent as a `list_remote_agents` result, so the
+        # static instruction and tools can still be cached.
+        self.prompt_cache = PromptCache(
+            "orchestrate_agent", dynamic_suffix=self.dynamic_instruction, dynamic_tool="list_remote_agents"
+        )
+        tracing.configure("orchestrate_agent")
 
         self.remote_agent_addresses = remote_agent_addresses
 
-    async def _initialize(self):
+    async def _fetch_card(self, address: str) -> tuple[str, AgentCard | None]:
+        """Fetches the agent card of one remote agent, giving up after `discovery_timeout`.
+
+        The request is conditional on the cached copy, so an unchanged card costs a 304.
+        """
+        try:
+            card = await asyncio.wait_for(
+                self.card_cache.fetch(address, self.transport.client_for(address), timeout=self.discovery_timeout),
+                self.discovery_timeout,
+            )
+            print(f"--- Successfully fetched public agent card from: `{address}` ---")
+            return address, card
+        except Exception as e:
+            print(f"--- FAILURE fetching agent card from: `{address}` ---")
+            print(f"--- Exception type is: {type(e).__name__}: {e} ---")
+            return address, None
+
+    async def _discover(self):
+        """Fetches every agent card concurrently and swaps in the new agent set at once.
+
+        Agents that did not answer keep their last known card, so a transient failure
+        does not drop them from the list.
         """
-        DIAGNOSTIC VERSION: This method will test each connection one-by-one
-        with aggressive logging to force the hidden error to appear.
+        results = await asyncio.gather(*(self._fetch_card(address) for address in self.remote_agent_addresses))
+        self._swap_in(results)
+
+    def _swap_in(self, results: list[tuple[str, AgentCard | None]]):
+        """Replaces the agent set with the given `(address, card)` pairs."""
+        connections: dict[str, RemoteAgentConnections] = {}
+        cards: dict[str, AgentCard] = {}
+        for address, card in results:
+            if card is None:
+                previous = self._cards_by_address.get(address)
+                if previous is None or previous.name not in self.remote_agent_connections:
+                    continue
+                card = previous
+            self._cards_by_address[address] = card
+            existing = self.remote_agent_connections.get(card.name)
+            if existing is not None and existing.card == card:
+                connections[card.name] = existing
+            else:
+                connections[card.name] = RemoteAgentConnections(agent_card=card, agent_url=address, transport=self.transport)
+            cards[card.name] = card
+
+        agent_info = [json.dumps({'name': c.name, 'description': c.description}) for c in cards.values()]
+        # No await between these assignments, so tools and instructions never see a mix
+        # of old and new agents.
+        self.remote_agent_connections = connections
+        self.cards = cards
+        self.agents = '\n'.join(agent_info)
+
+        if not connections:
+            print("FINAL VERDICT: Discovery finished, but the remote agent list is still empty.")
+        else:
+            print(f"--- Discovery complete. {len(connections)} agents loaded. ---")
+
+    async def _refresh_loop(self, delay: float):
+        """Periodically re-discovers the remote agents in the background, first after `delay` seconds.
+
+        It runs for as long as the event loop. ADK serves the agent inside
+        `asyncio.run`, which cancels the tasks still pending when the server shuts
+        down, so the pooled connections are released here on the way out.
         """
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                delay = self.refresh_interval
+                try:
+                    await self._discover()
+                except Exception as e:
+                    print(f"--- Background agent refresh failed: {type(e).__name__}: {e} ---")
+        finally:
+            await self.transport.aclose()
+
+    async def _initialize(self):
+        """Discovers the remote agents and starts the background refresh loop."""
         if not self.remote_agent_addresses or not self.remote_agent_addresses[0]:
             print("CRITICAL FAILURE: REMOTE_AGENT_ADDRESSES variable is empty. Cannot proceed.")
             self.is_initialized = True
             return
 
-        timeout = httpx.Timeout(60.0, read=60.0, write=60.0, connect=10.0)
-        httpx_client = httpx.AsyncClient(timeout=timeout)
-
-        for i, address in enumerate(self.remote_agent_addresses):
-            print(f"--- STEP 1.{i}: Attempting connection to: `{address}` ---")
-            try:
-                card_resolver = A2ACardResolver(httpx_client=httpx_client, base_url=address)
-                card = await card_resolver.get_agent_card()
-                print("Successfully fetched public agent card")
-
-                remote_connection = RemoteAgentConnections(agent_card=card, agent_url=address)
-                self.remote_agent_connections[card.name] = remote_connection
-                self.cards[card.name] = card
-                print(f"--- STEP 2.{i}: Successfully stored connection for {card.name} ---")
-
-            except Exception as e:
-                print(f"--- CRITICAL FAILURE at STEP 3.{i} for address: `{address}` ---")
-                print(f"--- The hidden exception type is: {type(e).__name__} ---")
-                print(f"--- Full exception details and traceback: ---")
-
-        print("STEP 4: Finished attempting all connections.")
-        if not self.remote_agent_connections:
-            print("FINAL VERDICT: The loop finished, but the remote agent list is still empty.")
+        cached = [(address, self.card_cache.cached(address)) for address in self.remote_agent_addresses]
+        if any(card is not None for _, card in cached):
+            # Start right away with the cards cached by a previous run; they are
+            # revalidated in the background immediately.
+            print("--- Using cached agent cards, revalidating in the background. ---")
+            self._swap_in(cached)
+            delay = 0
         else:
-            agent_info = [json.dumps({'name': c.name, 'description': c.description}) for c in self.cards.values()]
-            self.agents = '\n'.join(agent_info)
-            print(f"--- FINAL SUCCESS: Initialization complete. {len(self.remote_agent_connections)} agents loaded. ---")
-
+            try:
+                await self._discover()
+            except asyncio.CancelledError:
+                # Shut down before the refresh loop that would release the connections was started.
+                await self.transport.aclose()
+                raise
+            delay = self.refresh_interval
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(delay))
         self.is_initialized = True
 
+    def warm_up(self):
+        """Starts agent discovery eagerly if an event loop is already running.
+
+        Otherwise discovery happens on the first turn, in `before_agent_callback`.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._ensure_initializing()
+
+    def _ensure_initializing(self) -> asyncio.Task:
+        if self._initialization is None:
+            self._initialization = asyncio.create_task(self._initialize())
+        return self._initialization
+
+    async def close(self):
+        """Stops the background refresh and releases the pooled HTTP connections.
+
+        Happens by itself when the event loop shuts down; call it to shut down earlier.
+        """
+        refresh, self._refresh_task = self._refresh_task, None
+        if refresh is not None:
+            refresh.cancel()
+            await asyncio.gather(refresh, return_exceptions=True)
+        await self.transport.aclose()
+
     async def before_agent_callback(self, callback_context: CallbackContext):
         """Initialize a new session if one is not already active.
 
@@ -118,7 +229,7 @@ class HostAgent:
         """
         print("-- before_agent_callback --")
         if not self.is_initialized:
-            await self._initialize()
+            await self._ensure_initializing()
 
         state = callback_context.state
         if 'session_active' not in state or not state['session_active']:
@@ -127,9 +238,12 @@ class HostAgent:
             state['session_active'] = True
 
     def root_instruction(self, context: ReadonlyContext) -> str:
-        """Generate the root instruction for the orchestrator agent."""
-        current_agent = self.check_active_agent(context)
-        return f"""
+        """Generate the root instruction for the orchestrator agent.
+
+        It is the same for every turn, so the model can reuse it as a cached prefix;
+        the agent list and the active agent are added by `dynamic_instruction`.
+        """
+        return """
             You are an expert AI Orchestrator. Your primary responsibility is to intelligently interpret user requests, plan the necessary sequence of actions if multiple steps are involved, and delegate them to the most appropriate specialized remote agents. You do not perform the tasks yourself but manage their assignment, sequence, and can monitor their status.
 
             Core Workflow & Decision Making:
@@ -172,7 +286,16 @@ class HostAgent:
             *   Always prioritize selecting the correct agent(s) based on their documented purpose.
             *   Ensure all information required by the chosen remote agent is included in the `create_task` or `update_task` call, including outputs from previous agents if it's a sequential task.
             *   Focus on the most recent parts of the conversation for immediate context, but maintain awareness of the overall goal, especially for multi-step requests.
+            """
+
+    def dynamic_instruction(self, context: ReadonlyContext) -> str:
+        """The part of the instruction that changes between turns, sent after the static one.
 
+        With a cached prompt it follows the conversation as a `list_remote_agents`
+        result, see `PromptCache`.
+        """
+        current_agent = self.check_active_agent(context)
+        return f"""
             Agents:
             {self.agents}
 
@@ -194,12 +317,13 @@ class HostAgent:
         context_id = state.get('context_id', str(uuid.uuid4()))
         message_id = state.get('input_message_metadata', {}).get('message_id', str(uuid.uuid4()))
 
-        payload = create_send_message_payload(task, task_id, context_id)
-        payload['message']['messageId'] = message_id
+        with tracing.span("a2a send_message", receiver=agent_name):
+            payload = create_send_message_payload(task, task_id, context_id)
+            payload['message']['messageId'] = message_id
 
-        message_request = SendMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload))
+            message_request = SendMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload))
 
-        send_response: SendMessageResponse = await client.send_message(message_request=message_request)
+            send_response: SendMessageResponse = await client.send_message(message_request=message_request)
 
         if not isinstance(send_response.root, SendMessageSuccessResponse) or not isinstance(send_response.root.result, Task):
             return None
@@ -227,10 +351,14 @@ class HostAgent:
     def create_agent(self) -> Agent:
         """Create the orchestrator agent."""
         return Agent(
-            model="gemini-2.5-flash",
+            model=model_backend("gemini-2.5-flash", "orchestrate_agent"),
             name="orchestrate_agent",
             instruction=self.root_instruction,
             before_agent_callback=self.before_agent_callback,
+            before_model_callback=[tracing.before_model_callback, self.prompt_cache.before_model_callback],
+            after_model_callback=[self.prompt_cache.after_model_callback, tracing.after_model_callback],
+            before_tool_callback=tracing.before_tool_callback,
+            after_tool_callback=tracing.after_tool_callback,
             description=("This agent orchestrates the decomposition of the user request into"
                          " tasks that can be performed by the child agents."),
             tools=[
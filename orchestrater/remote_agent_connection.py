@@ -1,7 +1,5 @@
 from collections.abc import Callable
 
-import httpx
-
 from a2a.client import A2AClient
 from a2a.types import (
     AgentCard,
@@ -13,6 +11,8 @@ from a2a.types import (
 )
 from dotenv import load_dotenv
 
+from shared.transport import HttpTransport, shared_transport
+
 
 load_dotenv()
 
@@ -23,10 +23,10 @@ TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
+    def __init__(self, agent_card: AgentCard, agent_url: str, transport: HttpTransport = shared_transport):
         print(f'agent_card: {agent_card}')
         print(f'agent_url: {agent_url}')
-        self._httpx_client = httpx.AsyncClient(timeout=30)
+        self._httpx_client = transport.client_for(agent_url)
         self.agent_client = A2AClient(
             self._httpx_client, agent_card, url=agent_url
         )
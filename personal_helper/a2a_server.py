@@ -1,20 +1,29 @@
+import os
+import sys
+
+# Started as a script from this directory; the `shared` package is at the repository root.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.server.request_handlers import DefaultRequestHandler
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-import os
 import logging
 from dotenv import load_dotenv
+from shared.session_service import build_session_service
 from agent_executor import HelperBotAgentExecutor
+from shared.response_cache import ResponseCache
+from shared.metrics import ACTIVE_SESSIONS, TASK_STORE_SIZE, MetricsMiddleware, task_store_size
+from shared.usage import UsageApiMiddleware
 import uvicorn
 from starlette.middleware.cors import CORSMiddleware
 from agent import helper_bot as agent
 from agent_card import get_agent_card
 from agent import agent_logic
+from auxiliary.tools import READ_ONLY_TOOLS
 
 load_dotenv()
 
@@ -24,6 +33,7 @@ logger = logging.getLogger(__name__)
 host=os.environ.get("A2A_HOST", "localhost")
 port=int(os.environ.get("A2A_PORT", 10000))
 public_url=os.environ.get("PUBLIC_URL", "http://localhost:10000")
+streaming=os.environ.get("A2A_STREAMING", "true").lower() == "true"
 
 
 class HelperBotAgent:
@@ -35,10 +45,10 @@ class HelperBotAgent:
             app_name=self._agent.name,
             agent=self._agent,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=build_session_service(self._agent.name),
             memory_service=InMemoryMemoryService(),
         )
-        self.agent_card = get_agent_card(public_url)
+        self.agent_card = get_agent_card(public_url, streaming)
 
     def get_processing_message(self) -> str:
         """Returns the processing message for the personal helper agent."""
@@ -61,6 +71,7 @@ class AppWrapper:
                     await agent_logic._initialize()
                     await send({'type': 'lifespan.startup.complete'})
                 elif message['type'] == 'lifespan.shutdown':
+                    await agent_logic.close()
                     await send({'type': 'lifespan.shutdown.complete'})
                     return
         else:
@@ -72,18 +83,26 @@ def main():
     try:
         helper_agent = HelperBotAgent()
 
-        request_handler = DefaultRequestHandler(
-            agent_executor=HelperBotAgentExecutor(helper_agent.runner, helper_agent.agent_card),
-            task_store=InMemoryTaskStore(),
+        agent_executor = HelperBotAgentExecutor(
+            helper_agent.runner,
+            helper_agent.agent_card,
+            streaming,
+            response_cache=ResponseCache.from_env(READ_ONLY_TOOLS),
         )
+        task_store = InMemoryTaskStore()
+        ACTIVE_SESSIONS.set_function(lambda: len(agent_executor._active_sessions))
+        TASK_STORE_SIZE.set_function(lambda: task_store_size(task_store))
+
+        request_handler = DefaultRequestHandler(agent_executor=agent_executor, task_store=task_store)
 
         server = A2AStarletteApplication(
             agent_card=helper_agent.agent_card,
             http_handler=request_handler,
         )
 
+        # `/metrics` and `/usage` sit inside CORS, so the monitor frontend can fetch them too.
         app = CORSMiddleware(
-            server.build(),
+            UsageApiMiddleware(MetricsMiddleware(server.build())),
             allow_origins=["*"],
             allow_credentials=True,
             allow_methods=["*"],
@@ -1,13 +1,17 @@
 from google.adk.agents import Agent
 from auxiliary import tools
+from shared import metrics, tracing, usage
 import uuid
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.readonly_context import ReadonlyContext
-import httpx
-from a2a.client import A2ACardResolver
+from shared.card_cache import AgentCardCache
+from shared.model_backend import model_backend
+from shared.prompt_cache import PromptCache
 from google.adk.tools.tool_context import ToolContext
 import asyncio
+import heapq
 import logging
+import random
 
 logger = logging.getLogger(__name__)
 
@@ -26,70 +30,145 @@ class AgentLogic:
         self.remote_agent_connections: dict[str, tools.RemoteAgentConnection] = {}
         self.cards: dict[str, dict] = {}
         self.remote_agent_addresses = remote_agent_addresses
-        self.health_check_interval = 60  # 1 minute
+        self.health_check_interval = 60  # 1 minute, while an agent is healthy
+        self.max_health_check_interval = 300  # stable agents are probed less often
+        self.health_check_retry = 5  # first retry after a failed probe, doubled per failure
+        self.health_check_jitter = 0.2
+        self.health_check_timeout = 5
+        self.max_concurrent_probes = 16
         self.is_initialized = False
         self.health_check_task = None
+        self.pacing_policy = tools.PacingPolicy.from_env()
+        self.transport = tools.shared_transport
+        self.monitor_publisher = tools.MonitorPublisher(transport=self.transport)
+        self.card_cache = AgentCardCache()
+        self.menu_cache = tools.MenuCache()
+        self._probe_semaphore = asyncio.Semaphore(self.max_concurrent_probes)
+        # Min-heap of (due time, address) and per-address success/failure streaks.
+        self._probe_schedule: list[tuple[float, str]] = []
+        self._probe_streaks: dict[str, int] = {}
+        self._probe_tasks: set[asyncio.Task] = set()
+        self._schedule_changed = asyncio.Event()
 
-    async def _health_check(self, address: str, httpx_client: httpx.AsyncClient):
-        """Performs a health check on a single agent and updates its connection status."""
-        agent_name = None
+    def _add_connection(self, address: str, card):
+        """Stores the connection for `card`, replacing it if the card changed."""
+        existing = self.remote_agent_connections.get(card.name)
+        if existing is not None and existing.card == card:
+            existing.breaker.record_success()
+            return
+        self.remote_agent_connections[card.name] = tools.RemoteAgentConnection(
+            agent_card=card, agent_url=address, is_connected=True, transport=self.transport
+        )
+        self.cards[card.name] = card.model_dump()
+
+    async def _health_check(self, address: str):
+        """Performs a health check on a single agent and updates its circuit breaker.
+
+        The card request is conditional on the cached copy, so a healthy agent with an
+        unchanged card answers with a 304. At most `max_concurrent_probes` run at once.
+        """
         try:
-            card_resolver = A2ACardResolver(httpx_client=httpx_client, base_url=address)
-            card = await card_resolver.get_agent_card()
-            agent_name = card.name
-            if agent_name in self.remote_agent_connections:
-                self.remote_agent_connections[agent_name].is_connected = True
-                logger.info(f"--- Health check SUCCESS for agent: `{agent_name}` at `{address}` ---")
+            async with self._probe_semaphore:
+                card = await asyncio.wait_for(
+                    self.card_cache.fetch(address, self.transport.client_for(address), timeout=self.health_check_timeout),
+                    self.health_check_timeout,
+                )
+            if card.name in self.remote_agent_connections:
+                self._add_connection(address, card)
+                logger.info(f"--- Health check SUCCESS for agent: `{card.name}` at `{address}` ---")
             return address, card
         except Exception as e:
-            if agent_name and agent_name in self.remote_agent_connections:
-                self.remote_agent_connections[agent_name].is_connected = False
+            cached_card = self.card_cache.cached(address)
+            connection = self.remote_agent_connections.get(cached_card.name) if cached_card else None
+            if connection and connection.is_connected:
+                connection.breaker.trip()
             logger.error(f"--- Health check FAILED for address: `{address}` ---")
             logger.error(f"--- Exception type is: {type(e).__name__} ---")
             logger.error(f"--- Exception details: {e} ---")
             return address, None
 
-    async def _start_health_check_loop(self):
-        """Periodically performs health checks on all known remote agents."""
-        timeout = httpx.Timeout(60.0, read=60.0, write=60.0, connect=10.0)
-        httpx_client = httpx.AsyncClient(timeout=timeout)
+    def _schedule_probe(self, address: str, delay: float):
+        heapq.heappush(self._probe_schedule, (asyncio.get_running_loop().time() + delay, address))
+        self._schedule_changed.set()
 
-        while True:
-            logger.info("--- Starting periodic health check for remote agents ---")
-            tasks = [self._health_check(address, httpx_client) for address in self.remote_agent_addresses]
-            results = await asyncio.gather(*tasks)
+    def _next_probe_delay(self, address: str, healthy: bool) -> float:
+        """Adaptive, jittered delay until the next probe of `address`.
 
-            for address, card in results:
-                if card and card.name not in self.remote_agent_connections:
-                    logger.info(f"--- New agent discovered during health check: `{card.name}` at `{address}` ---")
-                    remote_connection = tools.RemoteAgentConnection(agent_card=card, agent_url=address, is_connected=True)
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card.model_dump()
+        Healthy agents are probed every `health_check_interval`, doubling every five
+        successful probes up to `max_health_check_interval`. Failing agents are retried
+        with exponential backoff starting at `health_check_retry`. The jitter keeps
+        probes of many agents from synchronizing.
+        """
+        streak = self._probe_streaks.get(address, 0)
+        if healthy:
+            streak = max(streak, 0) + 1
+            delay = self.health_check_interval * 2 ** ((streak - 1) // 5)
+        else:
+            streak = min(streak, 0) - 1
+            delay = self.health_check_retry * 2 ** (-streak - 1)
+        self._probe_streaks[address] = streak
+        delay = min(delay, self.max_health_check_interval)
+        return delay * random.uniform(1 - self.health_check_jitter, 1 + self.health_check_jitter)
+
+    async def _probe(self, address: str):
+        address, card = await self._health_check(address)
+        if card and card.name not in self.remote_agent_connections:
+            logger.info(f"--- New agent discovered during health check: `{card.name}` at `{address}` ---")
+            self._add_connection(address, card)
+        self._schedule_probe(address, self._next_probe_delay(address, card is not None))
+
+    async def _start_health_check_loop(self):
+        """Runs every probe when it is due, each agent on its own schedule."""
+        try:
+            while True:
+                now = asyncio.get_running_loop().time()
+                while self._probe_schedule and self._probe_schedule[0][0] <= now:
+                    _, address = heapq.heappop(self._probe_schedule)
+                    task = asyncio.create_task(self._probe(address))
+                    self._probe_tasks.add(task)
+                    task.add_done_callback(self._probe_tasks.discard)
 
-            await asyncio.sleep(self.health_check_interval)
+                timeout = self._probe_schedule[0][0] - now if self._probe_schedule else None
+                self._schedule_changed.clear()
+                try:
+                    await asyncio.wait_for(self._schedule_changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in self._probe_tasks:
+                task.cancel()
 
     async def _initialize(self):
         """
         Initializes the connections to the remote agents and starts the health check loop.
+
+        Agent cards cached on disk by a previous run are used right away and revalidated
+        by probes spread over the first `health_check_timeout` seconds.
         """
         if not self.remote_agent_addresses or not self.remote_agent_addresses[0]:
             logger.critical("CRITICAL FAILURE: REMOTE_AGENT_ADDRESSES variable is empty. Cannot proceed.")
             self.is_initialized = True
             return
 
-        timeout = httpx.Timeout(60.0, read=60.0, write=60.0, connect=10.0)
-        httpx_client = httpx.AsyncClient(timeout=timeout)
+        for address in self.remote_agent_addresses:
+            card = self.card_cache.cached(address)
+            if card:
+                logger.info(f"--- Loaded cached agent card for {card.name} from: `{address}` ---")
+                self._add_connection(address, card)
 
-        tasks = [self._health_check(address, httpx_client) for address in self.remote_agent_addresses]
-        results = await asyncio.gather(*tasks)
+        if self.remote_agent_connections:
+            for address in self.remote_agent_addresses:
+                self._schedule_probe(address, random.uniform(0, self.health_check_timeout))
+        else:
+            tasks = [self._health_check(address) for address in self.remote_agent_addresses]
+            results = await asyncio.gather(*tasks)
 
-        for address, card in results:
-            if card:
-                logger.info(f"--- Successfully fetched public agent card from: `{address}` ---")
-                remote_connection = tools.RemoteAgentConnection(agent_card=card, agent_url=address, is_connected=True)
-                self.remote_agent_connections[card.name] = remote_connection
-                self.cards[card.name] = card.model_dump()
-                logger.info(f"--- Successfully stored connection for {card.name} ---")
+            for address, card in results:
+                if card:
+                    logger.info(f"--- Successfully fetched public agent card from: `{address}` ---")
+                    self._add_connection(address, card)
+                    logger.info(f"--- Successfully stored connection for {card.name} ---")
+                self._schedule_probe(address, self._next_probe_delay(address, card is not None))
 
         if self.remote_agent_connections:
             logger.info(f"--- Initialization complete. {len(self.remote_agent_connections)} agents loaded. ---")
@@ -101,6 +180,18 @@ class AgentLogic:
 
         self.is_initialized = True
 
+    async def close(self):
+        """Stops the health check loop and releases the pooled HTTP connections."""
+        if self.health_check_task:
+            self.health_check_task.cancel()
+            try:
+                await self.health_check_task
+            except asyncio.CancelledError:
+                pass
+            self.health_check_task = None
+        await self.monitor_publisher.close()
+        await self.transport.aclose()
+
 
 # In a real-world scenario, this would come from a config file or service discovery
 REMOTE_AGENT_ADDRESSES = ["http://localhost:10003", "http://localhost:10004"]
@@ -119,13 +210,21 @@ def subtract_from_daily_balance(amount_str: str, tool_context: ToolContext):
     """Subtracts an amount from the user's daily cash balance. Expects a string like '$10.50' or '10.50'."""
     return tools.subtract_from_daily_balance(amount_str, tool_context)
 
+async def get_menu(agent_name: str):
+    """Get the full menu, with prices, of a remote restaurant agent."""
+    return await tools.get_menu(agent_logic, agent_name)
+
 async def send_message(agent_name: str, task: str, tool_context: ToolContext):
     """Send a message to the remote agent."""
     return await tools.send_message(agent_logic, agent_name, message=task, tool_context=tool_context)
 
+# The instruction and tools are static, so they can be served from a context cache (A2A_PROMPT_CACHE=1).
+prompt_cache = PromptCache(agent_logic.agent_name)
+tracing.configure(agent_logic.agent_name)
+
 helper_bot = Agent(
     name=agent_logic.agent_name,
-    model="gemini-2.5-flash",
+    model=model_backend("gemini-2.5-flash", agent_logic.agent_name),
     description="A personal food ordering AI assistant that communicates orders with various restaurants.",
     instruction="""You are Alex, a friendly and super-efficient personal assistant for a hungry teenager. You are conversational and use a slightly casual tone, like using 'awesome' or 'gotcha'.
         Your primary responsibility is to intelligently interpret user requests and communicate with a single restaurant.
@@ -144,7 +243,7 @@ helper_bot = Agent(
 
         3.  **Executing the Order:**
             * **First, use the `get_daily_cash_balance` tool to check the user's available budget.**
-            * **Then, use the `send_message` tool to fetch the menu from the selected restaurant agent by sending the message "Send me your full menu.".**
+            * **Then, use the `get_menu` tool to fetch the menu of the selected restaurant agent.**
             * **CRITICAL: Before suggesting any items to the user, you MUST filter the menu to show only items that are within the user's budget. NEVER suggest an item that costs more than the available balance.**
             * **Compare the user's request with the *filtered, affordable* menu items. Correct any minor discrepancies (e.g., map "large" to "Large Pizza").**
             * If the user's specific request is affordable, you can proceed with the order.
@@ -165,6 +264,20 @@ helper_bot = Agent(
         5.  **Closing the Loop:**
             * After confirming the order with the user, end the conversation cheerfully.
     """,
+    before_model_callback=[
+        tracing.before_model_callback,
+        prompt_cache.before_model_callback,
+        metrics.before_model_callback,
+        usage.before_model_callback,
+    ],
+    after_model_callback=[
+        usage.after_model_callback,
+        metrics.after_model_callback,
+        prompt_cache.after_model_callback,
+        tracing.after_model_callback,
+    ],
+    before_tool_callback=[tracing.before_tool_callback, metrics.before_tool_callback],
+    after_tool_callback=[metrics.after_tool_callback, tracing.after_tool_callback],
     tools=[
         list_remote_agents,
         tools.get_user_address,
@@ -172,6 +285,7 @@ helper_bot = Agent(
         get_daily_cash_balance,
         subtract_from_daily_balance,
         tools.get_current_date,
+        get_menu,
         send_message,
     ],
 )
@@ -2,9 +2,9 @@ from a2a.types import AgentCard, AgentCapabilities, AgentSkill
 
 SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-def get_agent_card(public_url: str) -> AgentCard:
+def get_agent_card(public_url: str, streaming: bool = True) -> AgentCard:
     """Generates the agent card for the personal helper agent."""
-    capabilities = AgentCapabilities(streaming=False, tools=True, push_notifications=False)
+    capabilities = AgentCapabilities(streaming=streaming, tools=True, push_notifications=False)
 
     food_ordering_skill = AgentSkill(
         id="food-ordering",
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import uuid
 
 from typing import TYPE_CHECKING
 
@@ -13,11 +15,14 @@ from a2a.types import (
     Part,
     TaskState,
     TextPart,
-    UnsupportedOperationError,
 )
-from a2a.utils.errors import ServerError
 from google.adk import Runner
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import GetSessionConfig
 from google.genai import types
+from shared import metrics, tracing, usage
+from shared.response_cache import ResponseCache
 
 
 if TYPE_CHECKING:
@@ -32,11 +37,26 @@ DEFAULT_USER_ID = 'self'
 
 
 class HelperBotAgentExecutor(AgentExecutor):
-    def __init__(self, runner: Runner, card: AgentCard):
+    def __init__(
+        self,
+        runner: Runner,
+        card: AgentCard,
+        streaming: bool = True,
+        response_cache: ResponseCache | None = None,
+    ):
         self.runner = runner
         self._card = card
+        # In streaming mode the model's partial text is forwarded to the client
+        # as incremental artifact chunks instead of waiting for the whole turn.
+        self._run_config = RunConfig(
+            streaming_mode=StreamingMode.SSE if streaming else StreamingMode.NONE
+        )
         # Track active sessions for potential cancellation
         self._active_sessions: set[str] = set()
+        # The asyncio task running each in-flight request, by task id.
+        self._running: dict[str, asyncio.Task] = {}
+        # Answers of read-only turns (opt-in), served without a model call.
+        self._response_cache = response_cache
 
     async def _process_request(
         self,
@@ -49,27 +69,81 @@ class HelperBotAgentExecutor(AgentExecutor):
         # (it may be the same as the one passed in if it already exists)
         session_id = session_obj.id
 
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = self._response_cache.key(self.runner.agent.name, new_message, session_obj)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                await self._answer_from_cache(session_obj, new_message, cached, task_updater)
+                return
+        cacheable = cache_key is not None
+
         # Track this session as active
         self._active_sessions.add(session_id)
 
+        # All chunks of the answer share one artifact, so the final response
+        # can replace whatever was streamed before it.
+        artifact_id = uuid.uuid4().hex
+        streamed_chunks = False
+        events = 0
+        # The model usage of the turn is collected under its invocation id.
+        invocation_id = None
+        billed = False
+
         try:
             async for event in self.runner.run_async(
                 session_id=session_id,
                 user_id=DEFAULT_USER_ID,
                 new_message=new_message,
+                run_config=self._run_config,
             ):
+                invocation_id = invocation_id or event.invocation_id
+                if event.partial:
+                    parts = [
+                        convert_genai_part_to_a2a(part)
+                        for part in (event.content.parts if event.content else [])
+                        if part.text
+                    ]
+                    if parts:
+                        logger.debug('Yielding partial response: %s', parts)
+                        await task_updater.add_artifact(
+                            parts,
+                            artifact_id=artifact_id,
+                            append=streamed_chunks,
+                            last_chunk=False,
+                        )
+                        streamed_chunks = True
+                    continue
+                events += 1
+                if cacheable and not self._response_cache.is_read_only(event):
+                    cacheable = False
                 if event.is_final_response():
+                    if cacheable:
+                        self._response_cache.put(cache_key, event.content)
+                    elif cache_key is not None:
+                        self._response_cache.skip()
                     parts = [
                         convert_genai_part_to_a2a(part)
                         for part in event.content.parts
                         if (part.text or part.file_data or part.inline_data)
                     ]
                     logger.debug('Yielding final response: %s', parts)
-                    await task_updater.add_artifact(parts)
-                    await task_updater.update_status(TaskState.completed, final=True)
+                    await task_updater.add_artifact(
+                        parts, artifact_id=artifact_id, last_chunk=True
+                    )
+                    billed = True
+                    await task_updater.update_status(
+                        TaskState.completed, final=True, metadata=usage.LEDGER.close_turn(session_id, invocation_id)
+                    )
                     break
+                # Any text streamed so far belonged to an intermediate step, so
+                # the next answer starts the artifact over.
+                streamed_chunks = False
                 if not event.get_function_calls():
                     logger.debug('Yielding update response')
+                    if event.content and any(part.text for part in event.content.parts or []):
+                        # Only the final answer would be replayed from the cache.
+                        cacheable = False
                     await task_updater.update_status(
                         TaskState.working,
                         message=task_updater.new_agent_message(
@@ -85,11 +159,27 @@ class HelperBotAgentExecutor(AgentExecutor):
         finally:
             # Remove from active sessions when done
             self._active_sessions.discard(session_id)
+            metrics.EVENTS_PER_TURN.observe(events)
+            if not billed:
+                # Cancelled or failed turns used the model too.
+                usage.LEDGER.close_turn(session_id, invocation_id)
 
     async def execute(
         self,
         context: RequestContext,
         event_queue: EventQueue,
+    ):
+        # Continue the caller's trace, if it sent one with the message.
+        metadata = context.message.metadata if context.message else None
+        with tracing.span(
+            'a2a execute', parent=tracing.extract(metadata), agent=self._card.name, task_id=context.task_id
+        ):
+            await self._execute(context, event_queue)
+
+    async def _execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
     ):
         # Run the agent until either complete or the task is suspended.
         updater = TaskUpdater(event_queue, context.task_id, context.context_id)
@@ -98,7 +188,7 @@ class HelperBotAgentExecutor(AgentExecutor):
         if not context.current_task:
             await updater.update_status(TaskState.submitted)
         await updater.update_status(TaskState.working)
-        await self._process_request(
+        run = asyncio.create_task(self._process_request(
             types.UserContent(
                 parts=[
                     convert_a2a_part_to_genai(part)
@@ -107,40 +197,78 @@ class HelperBotAgentExecutor(AgentExecutor):
             ),
             context.context_id,
             updater,
+        ))
+        self._running[context.task_id] = run
+        try:
+            await run
+        except asyncio.CancelledError:
+            # Only swallow the cancellation of the run itself, not of execute().
+            current = asyncio.current_task()
+            if not run.cancelled() or (current is not None and current.cancelling()):
+                raise
+            logger.info('Run for task %s was cancelled', context.task_id)
+        finally:
+            self._running.pop(context.task_id, None)
+
+    async def _answer_from_cache(
+        self,
+        session: 'Session',
+        new_message: types.Content,
+        texts: tuple[str, ...],
+        task_updater: TaskUpdater,
+    ):
+        """Answers with a cached response and records the turn in the session like a model turn."""
+        logger.debug('Answering session %s from the response cache', session.id)
+        invocation_id = 'e-' + uuid.uuid4().hex
+        content = types.ModelContent(parts=[types.Part(text=text) for text in texts])
+        for event in (
+            Event(invocation_id=invocation_id, author='user', content=new_message),
+            Event(invocation_id=invocation_id, author=self.runner.agent.name, content=content),
+        ):
+            await self.runner.session_service.append_event(session, event)
+        await task_updater.add_artifact([TextPart(text=text) for text in texts], last_chunk=True)
+        # No model call, but the task may still carry the bill of an earlier turn.
+        await task_updater.update_status(
+            TaskState.completed, final=True, metadata=usage.LEDGER.close_turn(session.id, None)
         )
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue):
         """Cancel the execution for the given context.
 
-        Currently logs the cancellation attempt as the underlying ADK runner
-        doesn't support direct cancellation of ongoing tasks.
+        The in-flight run is interrupted at its next await point, i.e. between
+        runner events, so no further artifacts are emitted and the task moves to
+        the canceled state.
         """
         session_id = context.context_id
-        if session_id in self._active_sessions:
-            logger.info('Cancellation requested for active weather session: %s', session_id)
-            #TODO. Implement proper cancellation when ADK supports it
-            self._active_sessions.discard(session_id)
+        run = self._running.get(context.task_id)
+        if run is not None:
+            logger.info('Cancelling run for task %s in session: %s', context.task_id, session_id)
+            run.cancel()
         else:
-            logger.debug('Cancellation requested for inactive weather session: %s', session_id)
+            logger.debug('Cancellation requested for inactive session: %s', session_id)
 
-        raise ServerError(error=UnsupportedOperationError())
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.update_status(TaskState.canceled, final=True)
 
     async def _upsert_session(self, session_id: str) -> 'Session':
         """Retrieves a session if it exists, otherwise creates a new one.
 
-        Ensures that async session service methods are properly awaited.
+        Ensures that async session service methods are properly awaited. Only the
+        latest event is loaded, since the runner reloads the full session itself.
         """
-        session = await self.runner.session_service.get_session(
-            app_name=self.runner.app_name,
-            user_id=DEFAULT_USER_ID,
-            session_id=session_id,
-        )
-        if session is None:
-            session = await self.runner.session_service.create_session(
+        with tracing.span('session load', session_id=session_id):
+            session = await self.runner.session_service.get_session(
                 app_name=self.runner.app_name,
                 user_id=DEFAULT_USER_ID,
                 session_id=session_id,
+                config=GetSessionConfig(num_recent_events=1),
             )
+            if session is None:
+                session = await self.runner.session_service.create_session(
+                    app_name=self.runner.app_name,
+                    user_id=DEFAULT_USER_ID,
+                    session_id=session_id,
+                )
         return session
 
 def convert_a2a_part_to_genai(part: Part) -> types.Part:
@@ -0,0 +1,81 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-agent circuit breaker: closed, open or half-open.
+
+    After `failure_threshold` consecutive failures the breaker opens and requests
+    fail fast. Once the open period is over, a single trial request is let through
+    (half-open); its outcome closes the breaker or opens it again. A trial that
+    ends without an outcome, e.g. because it was cancelled, is given up with
+    `release_trial` so that the next request becomes the trial. Every
+    consecutive trip doubles the open period, up to `max_reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 300.0,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_until = 0.0
+
+    def allow_request(self) -> bool:
+        """Returns whether a request may be sent now. Moves an expired open breaker to half-open."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self._clock() >= self.opened_until:
+            self.state = HALF_OPEN
+            logger.info(f"Circuit for {self.name} is half-open, letting a trial request through.")
+            return True
+        # Open, or half-open with the trial request still in flight.
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a request through again."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(self.opened_until - self._clock(), 0.0)
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info(f"Circuit for {self.name} closed.")
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def release_trial(self):
+        """Gives up the half-open trial without an outcome; the next request is let through as the trial."""
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+            self.opened_until = self._clock()
+
+    def trip(self):
+        """Opens the breaker now, for an exponentially growing period."""
+        self.trips += 1
+        timeout = min(self.reset_timeout * 2 ** (self.trips - 1), self.max_reset_timeout)
+        self.state = OPEN
+        self.opened_until = self._clock() + timeout
+        logger.warning(f"Circuit for {self.name} opened for {timeout:.0f}s.")
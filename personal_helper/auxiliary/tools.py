@@ -1,15 +1,20 @@
+import os
 import re
 import json
 import asyncio
+import contextvars
+import time
 from collections.abc import Callable
 import httpx
 from a2a.client import A2AClient
 from a2a.types import (
     AgentCard,
+    DataPart,
     SendMessageRequest,
     SendMessageResponse,
     Task,
     TaskArtifactUpdateEvent,
+    TaskState,
     TaskStatusUpdateEvent,
     MessageSendParams,
     SendMessageSuccessResponse,
@@ -20,6 +25,9 @@ import uuid
 from typing import List, Dict, Any
 import logging
 from datetime import datetime
+from shared import tracing, usage
+from shared.transport import HttpTransport, shared_transport
+from .circuit_breaker import OPEN, CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +63,17 @@ def get_current_date():
     """Returns the current date."""
     return datetime.now().strftime("%Y-%m-%d")
 
+# Tools (by the name the model calls them) that neither change state nor contact a
+# restaurant's order flow; turns using only these can be answered from the response cache.
+READ_ONLY_TOOLS = frozenset({
+    "list_remote_agents",
+    "get_user_address",
+    "get_user_phone_number",
+    "get_daily_cash_balance",
+    "get_current_date",
+    "get_menu",
+})
+
 def get_agent_name(agent_name: str) -> str:
     """Returns the agent name."""
     return re.sub(r'([a-z])([A-Z])', r'\1 \2', agent_name)
@@ -62,16 +81,157 @@ def get_agent_name(agent_name: str) -> str:
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
+MONITOR_URL = os.environ.get("A2A_MONITOR_URL", "http://localhost:10111/log")
+
+
+class PacingPolicy:
+    """Optional delays around every restaurant round trip.
+
+    Defaults to no delay. Set `A2A_PACING_BEFORE_SEND` / `A2A_PACING_AFTER_RECEIVE`
+    (seconds) to slow the conversation down, e.g. to follow it live in the monitor.
+    """
+
+    def __init__(self, before_send: float = 0.0, after_receive: float = 0.0):
+        self.before_send = before_send
+        self.after_receive = after_receive
+
+    @classmethod
+    def from_env(cls) -> "PacingPolicy":
+        return cls(
+            before_send=float(os.environ.get("A2A_PACING_BEFORE_SEND", 0)),
+            after_receive=float(os.environ.get("A2A_PACING_AFTER_RECEIVE", 0)),
+        )
+
+    async def wait_before_send(self):
+        if self.before_send > 0:
+            await asyncio.sleep(self.before_send)
+
+    async def wait_after_receive(self):
+        if self.after_receive > 0:
+            await asyncio.sleep(self.after_receive)
+
+
+class MonitorPublisher:
+    """Fire-and-forget reporting of A2A messages to the a2a_monitor.
+
+    `publish` only enqueues the message; a background task posts it to the monitor,
+    so a slow or missing monitor never adds latency to the delegation path. Messages
+    that queued up meanwhile are sent together to the monitor's `/log/batch` endpoint.
+    When the queue is full new messages are dropped.
+    """
+
+    def __init__(
+        self,
+        monitor_url: str = MONITOR_URL,
+        max_queue_size: int = 1000,
+        max_batch_size: int = 100,
+        transport: HttpTransport = shared_transport,
+    ):
+        self.monitor_url = monitor_url
+        self.max_batch_size = max_batch_size
+        self._transport = transport
+        # Messages with the trace context they were published in.
+        self._queue: asyncio.Queue[tuple[dict, tracing.SpanContext | None]] = asyncio.Queue(maxsize=max_queue_size)
+        self._worker: asyncio.Task | None = None
+        self.dropped = 0
+
+    def publish(self, sender: str, receiver: str, message: str):
+        """Queues a message for the monitor without waiting for it to be delivered."""
+        if self._worker is None or self._worker.done():
+            # A fresh context, so the worker does not inherit the span of whoever started it.
+            self._worker = asyncio.create_task(self._run(), context=contextvars.Context())
+        try:
+            self._queue.put_nowait(({"sender": sender, "receiver": receiver, "message": message}, tracing.current_span()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Monitor queue is full, dropped message from {sender} to {receiver}.")
+
+    async def _run(self):
+        batch_url = f"{self.monitor_url}/batch"
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                # The post is traced as part of the first message's trace.
+                with tracing.span("monitor post", parent=batch[0][1], messages=len(batch)):
+                    logging_client = self._transport.client_for(batch_url)
+                    await logging_client.post(batch_url, json=[event for event, _ in batch], timeout=5)
+            except httpx.HTTPError as ex:
+                logger.error(f"Could not log {len(batch)} messages to monitor: {ex}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def flush(self):
+        """Waits until every queued message has been handed to the monitor."""
+        if self._worker is not None and not self._worker.done():
+            await self._queue.join()
+
+    async def close(self):
+        """Stops the background publisher."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+MENU_SKILL_ID = "view-menu"
+MENU_REQUEST_TEXT = "Send me your full menu."
+
+
+class MenuCache:
+    """The last menu received from each restaurant agent, with its version.
+
+    A menu younger than `max_age` seconds is used as is. An older one is revalidated
+    by sending its version to the restaurant's menu skill, which answers without a
+    model turn and only resends the menu if it changed.
+    """
+
+    def __init__(self, max_age: float = 60.0):
+        self.max_age = max_age
+        self._entries: dict[str, dict] = {}
+
+    def get(self, agent_name: str) -> dict | None:
+        return self._entries.get(agent_name)
+
+    def is_fresh(self, agent_name: str) -> bool:
+        entry = self._entries.get(agent_name)
+        return entry is not None and time.monotonic() - entry["fetched_at"] < self.max_age
+
+    def store(self, agent_name: str, version: str | None, menu):
+        self._entries[agent_name] = {"version": version, "menu": menu, "fetched_at": time.monotonic()}
+
+    def touch(self, agent_name: str):
+        """Marks the cached menu as just revalidated."""
+        self._entries[agent_name]["fetched_at"] = time.monotonic()
+
+
 class RemoteAgentConnection:
     """A class to hold the connection to a remote agent."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str, is_connected: bool = False):
-        self._httpx_client = httpx.AsyncClient(timeout=30)
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str,
+        is_connected: bool = False,
+        transport: HttpTransport = shared_transport,
+    ):
+        self._httpx_client = transport.client_for(agent_url)
         self.agent_client = A2AClient(
             self._httpx_client, agent_card, url=agent_url
         )
         self.card = agent_card
-        self.is_connected = is_connected
+        self.breaker = CircuitBreaker(agent_card.name)
+        if not is_connected:
+            self.breaker.trip()
+
+    @property
+    def is_connected(self) -> bool:
+        return self.breaker.state != OPEN
 
     def get_agent(self) -> AgentCard:
         return self.card
@@ -81,8 +241,13 @@ class RemoteAgentConnection:
     ) -> SendMessageResponse:
         return await self.agent_client.send_message(message_request)
 
-def create_send_message_payload(text: str, task_id: str | None = None, context_id: str | None = None) -> dict[str, any]:
-    """Create a payload for sending a message to the remote agent."""
+def create_send_message_payload(
+    text: str, task_id: str | None = None, context_id: str | None = None, metadata: dict | None = None
+) -> dict[str, any]:
+    """Create a payload for sending a message to the remote agent.
+
+    The current trace context is added to the message metadata, so the remote agent continues the trace.
+    """
     payload: dict[str, any] = {
         'message': {
             'role': 'user',
@@ -94,6 +259,9 @@ def create_send_message_payload(text: str, task_id: str | None = None, context_i
         payload['message']['taskId'] = task_id
     if context_id:
         payload['message']['contextId'] = context_id
+    metadata = tracing.inject(metadata)
+    if metadata:
+        payload['message']['metadata'] = metadata
     return payload
 
 def list_remote_agents(host_agent):
@@ -133,6 +301,11 @@ async def send_message(host_agent, agent_name: str, message: str, tool_context:
     state = tool_context.state
     state['active_agent'] = agent_name
     client = host_agent.remote_agent_connections[agent_name]
+    if not client.breaker.allow_request():
+        # Fail fast instead of waiting for the request to time out.
+        retry_after = client.breaker.retry_after()
+        logger.warning(f"Circuit for '{agent_name}' is open, not sending (retry in {retry_after:.0f}s).")
+        return {"error": f"{agent_name} is not reachable right now. Try again in {max(int(retry_after), 1)} seconds."}
 
     if 'restaurant_sessions' not in state:
         state['restaurant_sessions'] = {}
@@ -148,21 +321,25 @@ async def send_message(host_agent, agent_name: str, message: str, tool_context:
     task_id = session_data["task_id"]
     message_id = state.get('input_message_metadata', {}).get('message_id', str(uuid.uuid4()))
 
-    payload = create_send_message_payload(message, task_id, context_id)
-    payload['message']['messageId'] = message_id
-
-    message_request = SendMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload))
+    host_agent.monitor_publisher.publish(get_agent_name(host_agent.agent_name), agent_name, message)
 
     try:
-        async with httpx.AsyncClient() as logging_client:
-            sender_name = get_agent_name(host_agent.agent_name)
-            await logging_client.post("http://localhost:10111/log", json={"sender": sender_name, "receiver": agent_name, "message": message})
-    except httpx.RequestError as ex:
-        logger.error(f"Could not log message to monitor: {ex}")
-
-    await asyncio.sleep(2)
-
-    send_response: SendMessageResponse = await client.send_message(message_request=message_request)
+        await host_agent.pacing_policy.wait_before_send()
+
+        with tracing.span("a2a send_message", receiver=agent_name):
+            payload = create_send_message_payload(message, task_id, context_id)
+            payload['message']['messageId'] = message_id
+            message_request = SendMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload))
+            try:
+                send_response: SendMessageResponse = await client.send_message(message_request=message_request)
+            except Exception:
+                client.breaker.record_failure()
+                raise
+    except asyncio.CancelledError:
+        # No outcome, but a half-open breaker must not wait for this trial forever.
+        client.breaker.release_trial()
+        raise
+    client.breaker.record_success()
 
     if not isinstance(send_response.root, SendMessageSuccessResponse) or not isinstance(send_response.root.result, Task):
         return None
@@ -170,42 +347,91 @@ async def send_message(host_agent, agent_name: str, message: str, tool_context:
     if hasattr(send_response.root.result, 'id') and send_response.root.result.id:
         state['restaurant_sessions'][agent_name]["task_id"] = send_response.root.result.id
 
+    # The restaurant's model usage is part of the bill of this turn.
+    usage.add_remote_usage(tool_context.invocation_id, send_response.root.result.metadata)
+
+    if send_response.root.result.status.state == TaskState.rejected:
+        # Turned away by the restaurant's admission control, with a hint when to retry.
+        retry_after = (send_response.root.result.metadata or {}).get('retry_after', 1)
+        logger.warning(f"'{agent_name}' is overloaded and rejected the message (retry in {retry_after}s).")
+        return {"error": f"{agent_name} is busy right now. Try again in {retry_after} seconds."}
+
+    if send_response.root.result.artifacts:
+        receiver_name = get_agent_name(host_agent.agent_name)
+        for part in send_response.root.result.artifacts[-1].parts:
+            if hasattr(part, 'root') and hasattr(part.root, 'text'):
+                host_agent.monitor_publisher.publish(agent_name, receiver_name, part.root.text)
+            logger.debug(f"Artifact part from {agent_name}: {part}")
+
+    await host_agent.pacing_policy.wait_after_receive()
+
+    return send_response.root.result
+
+async def get_menu(host_agent, agent_name: str) -> dict:
+    """Returns the menu of a restaurant agent, from the per-agent menu cache when possible."""
+    if agent_name not in host_agent.remote_agent_connections:
+        logger.error(f"LLM asked for the menu of '{agent_name}' but it was not found. Available agents: {list(host_agent.remote_agent_connections.keys())}")
+        raise ValueError(f"Agent '{agent_name}' not found.")
+
+    menu_cache = host_agent.menu_cache
+    cached = menu_cache.get(agent_name)
+    if cached and menu_cache.is_fresh(agent_name):
+        return {"menu": cached["menu"]}
+
+    client = host_agent.remote_agent_connections[agent_name]
+    if not client.breaker.allow_request():
+        if cached:
+            return {"menu": cached["menu"]}
+        return {"error": f"{agent_name} is not reachable right now. Try again in {max(int(client.breaker.retry_after()), 1)} seconds."}
+
+    host_agent.monitor_publisher.publish(get_agent_name(host_agent.agent_name), agent_name, MENU_REQUEST_TEXT)
     try:
-        async with httpx.AsyncClient() as logging_client:
-            print("**********************************")
-            # print(send_response.root.result)
-            # print(send_response.root.result.artifacts)
-            artifact_number = 0
-            if send_response.root.result and hasattr(send_response.root.result, 'artifacts'):
-                artifact = send_response.root.result.artifacts[-1]
-                # for artifact in send_response.root.result.artifacts:
-                for part in artifact.parts:
-                    if hasattr(part, 'root') and hasattr(part.root, 'text'):
-                        receiver_name = get_agent_name(host_agent.agent_name)
-                        await logging_client.post("http://localhost:10111/log", json={"sender": agent_name, "receiver": receiver_name, "message": part.root.text})
-                    print(f"artifact number {artifact_number} part {part}")
-                artifact_number += 1
-            print("**********************************")
-    except httpx.RequestError as e:
-        logger.error(f"Could not log message to monitor: {e}")
-
-    await asyncio.sleep(2)
-
-    # If the task was to get the menu, parse it and return the content
-    if message == "Send me your full menu.":
-        if send_response.root.result and hasattr(send_response.root.result, 'artifacts') and send_response.root.result.artifacts:
-            for part in send_response.root.result.artifacts[-1].parts:
-                if isinstance(part.root, TextPart):
-                    try:
-                        menu_data = json.loads(part.root.text)
-                        if "menu" in menu_data:
-                            return menu_data
-                    except json.JSONDecodeError:
-                        return {"menu": part.root.text}
-                    return {"menu": part.root.text}
+        with tracing.span("a2a get_menu", receiver=agent_name):
+            # The text is only read by restaurants that do not implement the menu skill.
+            payload = create_send_message_payload(
+                MENU_REQUEST_TEXT,
+                metadata={"skill": MENU_SKILL_ID, "menu_version": cached["version"] if cached else None},
+            )
+            message_request = SendMessageRequest(id=uuid.uuid4().hex, params=MessageSendParams.model_validate(payload))
+            send_response: SendMessageResponse = await client.send_message(message_request=message_request)
+    except asyncio.CancelledError:
+        client.breaker.release_trial()
+        raise
+    except Exception as e:
+        client.breaker.record_failure()
+        if cached:
+            logger.warning(f"Could not revalidate the menu of {agent_name}, using the cached one: {e}")
+            return {"menu": cached["menu"]}
+        raise
+    client.breaker.record_success()
+
+    result = send_response.root.result if isinstance(send_response.root, SendMessageSuccessResponse) else None
+    if not isinstance(result, Task) or not result.artifacts:
         return {"error": f"Could not retrieve the menu from {agent_name}."}
 
-    return send_response.root.result
+    receiver_name = get_agent_name(host_agent.agent_name)
+    for part in result.artifacts[-1].parts:
+        if isinstance(part.root, DataPart):
+            data = part.root.data
+            if data.get("unchanged") and cached and cached["version"] == data.get("version"):
+                menu_cache.touch(agent_name)
+                host_agent.monitor_publisher.publish(agent_name, receiver_name, f"Menu unchanged (version {data['version']}).")
+                return {"menu": cached["menu"]}
+            if "menu" in data:
+                menu_cache.store(agent_name, data.get("version"), data["menu"])
+                host_agent.monitor_publisher.publish(agent_name, receiver_name, f"Menu version {data.get('version')}.")
+                return {"menu": data["menu"]}
+        elif isinstance(part.root, TextPart):
+            # A restaurant without the menu skill answers through its model.
+            host_agent.monitor_publisher.publish(agent_name, receiver_name, part.root.text)
+            try:
+                menu_data = json.loads(part.root.text)
+            except json.JSONDecodeError:
+                menu_data = None
+            menu = menu_data["menu"] if isinstance(menu_data, dict) and "menu" in menu_data else part.root.text
+            menu_cache.store(agent_name, None, menu)
+            return {"menu": menu}
+    return {"error": f"Could not retrieve the menu from {agent_name}."}
 
 async def plan_order(host_agent, user_request: str, tool_context: ToolContext) -> List[Dict[str, Any]]:
     """
@@ -1 +1 @@
-from .agent import pizza_bot as root_agent
+from .agent import root_agent
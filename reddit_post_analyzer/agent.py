@@ -2,6 +2,8 @@ import dotenv
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 
+from shared.model_backend import model_backend
+
 
 dotenv.load_dotenv()
 
@@ -19,7 +21,7 @@ reddit_post_fetcher_tool = FunctionTool(func=get_reddit_post)
 
 reply_generator = Agent(
     name="reply_generator",
-    model="gemini-2.5-flash-preview-05-20",
+    model=model_backend("gemini-2.5-flash-preview-05-20", "reply_generator"),
     description="An AI assistant specialized in crafting Reddit comments according to the provided post data.",
     instruction="""You are an AI assistant specialized in crafting Reddit comments.
     You will receive a single JSON string as input. This JSON string contains details of a Reddit post, including 'title', 'body', 'author', and a list of 'comments'. Each comment in the list is an object with 'body', 'score', and 'author'.
@@ -44,7 +46,7 @@ reply_generator = Agent(
 
 reddit_post_analyzer = Agent(
     name="reddit_post_analyzer",
-    model="gemini-2.5-flash-preview-05-20",
+    model=model_backend("gemini-2.5-flash-preview-05-20", "reddit_post_analyzer"),
     description="An AI assistant that analyzes Reddit posts and crafts suitable replies.",
     instruction="""You are an AI assistant that analyzes Reddit posts and crafts suitable replies.
     Your process is:
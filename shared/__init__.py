@@ -0,0 +1,11 @@
+"""Modules shared by every agent of the repository.
+
+Model backends, tracing, metrics, usage accounting and prompt caching are used
+by all agents; the session service, response cache, task store, admission
+control and agent card middleware by the A2A servers; the HTTP transport and the
+agent card cache by the agents that call other agents.
+
+The A2A servers are started as scripts from their own directory and put the
+repository root on `sys.path` to import this package; agents that ADK loads from
+the repository root import it directly.
+"""
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from .metrics import Counter, Gauge, Histogram
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 16
+DEFAULT_MAX_QUEUED = 64
+DEFAULT_QUEUE_TIMEOUT = 15.0
+# Used for retry hints until the first runs have finished.
+INITIAL_RUN_SECONDS = 5.0
+RUN_SECONDS_SMOOTHING = 0.2
+
+QUEUE_DEPTH = Gauge("a2a_admission_queue_depth", "Requests waiting for a run slot.")
+ACTIVE_RUNS = Gauge("a2a_admission_active_runs", "Agent runs in progress.")
+QUEUE_WAIT = Histogram("a2a_admission_wait_seconds", "Time requests waited for a run slot, admitted or not.")
+REJECTIONS = Counter("a2a_admission_rejections_total", "Requests turned away, by reason.", ("reason",))
+
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+
+
+class AdmissionRejected(Exception):
+    """No run slot for a request; the client should retry after `retry_after` seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Too busy ({reason}), retry in {retry_after}s.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Bounds the agent runs of an executor.
+
+    At most `max_concurrent` runs go on at once. Further requests wait in a
+    first-come first-served queue of at most `max_queued`. A request that finds
+    the queue full is rejected at once, and one that has not started after
+    `queue_timeout` seconds gives up its place. Either way the rejection carries
+    a retry hint: the time the queue ahead needs at the recent run duration.
+
+    So a burst turns into a bounded backlog and quick "try again" answers
+    instead of unbounded concurrent model calls.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._run_seconds = INITIAL_RUN_SECONDS
+        QUEUE_DEPTH.set_function(lambda: len(self._waiters))
+        ACTIVE_RUNS.set_function(lambda: self.active)
+
+    @classmethod
+    def from_env(cls) -> Optional['AdmissionController']:
+        """The controller configured through the environment, or None if `A2A_MAX_CONCURRENT_RUNS` is 0.
+
+        `A2A_MAX_QUEUED_RUNS` is the size of the wait queue and
+        `A2A_QUEUE_TIMEOUT` how many seconds a request may wait in it.
+        """
+        max_concurrent = int(os.environ.get("A2A_MAX_CONCURRENT_RUNS", DEFAULT_MAX_CONCURRENT))
+        if max_concurrent <= 0:
+            return None
+        controller = cls(
+            max_concurrent,
+            max_queued=int(os.environ.get("A2A_MAX_QUEUED_RUNS", DEFAULT_MAX_QUEUED)),
+            queue_timeout=float(os.environ.get("A2A_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)),
+        )
+        logger.info(
+            f"Admitting {max_concurrent} concurrent runs, queueing up to {controller.max_queued} "
+            f"for {controller.queue_timeout:.0f}s."
+        )
+        return controller
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self, position: Optional[int] = None) -> int:
+        """Seconds until a request at `position` in the queue (default: the end) would likely start."""
+        position = self.queued if position is None else position
+        return max(1, math.ceil((position // self.max_concurrent + 1) * self._run_seconds))
+
+    def _reject(self, reason: str, waited: float, position: Optional[int] = None) -> AdmissionRejected:
+        REJECTIONS.inc(reason=reason)
+        QUEUE_WAIT.observe(waited)
+        return AdmissionRejected(reason, self.retry_after(position))
+
+    async def _acquire(self):
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            QUEUE_WAIT.observe(0.0)
+            return
+        if len(self._waiters) >= self.max_queued:
+            raise self._reject(QUEUE_FULL, 0.0)
+
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        # Not `asyncio.wait_for`: before Python 3.12 it swallows a cancellation that
+        # arrives together with the slot, and the request would run anyway.
+        expiry = loop.call_later(self.queue_timeout, self._expire, waiter, started)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # The slot was handed over just as the request went away.
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        finally:
+            expiry.cancel()
+        # A released slot is handed to the waiter as is, so `active` already counts it.
+        QUEUE_WAIT.observe(time.monotonic() - started)
+
+    def _expire(self, waiter: asyncio.Future, started: float):
+        """Turns a waiter away once it has waited `queue_timeout` seconds without a slot."""
+        if not waiter.done():
+            self._waiters.remove(waiter)
+            waiter.set_exception(self._reject(QUEUE_TIMEOUT, time.monotonic() - started, 0))
+
+    def _release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Holds a run slot for the block; raises `AdmissionRejected` if there is none in time."""
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            run_seconds = time.monotonic() - started
+            self._run_seconds += RUN_SECONDS_SMOOTHING * (run_seconds - self._run_seconds)
+            self._release()
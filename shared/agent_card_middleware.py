@@ -0,0 +1,53 @@
+import hashlib
+import json
+import time
+from email.utils import formatdate
+
+from a2a.types import AgentCard
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+
+class AgentCardMiddleware:
+    """ASGI middleware that serves the agent card with ETag and Last-Modified.
+
+    The card is serialized once. Clients that send back a matching
+    `If-None-Match` or `If-Modified-Since` get an empty 304 response, so periodic
+    discovery and health checks don't download and re-parse an unchanged card.
+    """
+
+    def __init__(self, app, agent_card: AgentCard):
+        self.app = app
+        self.body = json.dumps(agent_card.model_dump(mode="json", exclude_none=True)).encode()
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.last_modified_at = int(time.time())
+        self.last_modified = formatdate(self.last_modified_at, usegmt=True)
+
+    def _not_modified(self, headers: dict[bytes, bytes]) -> bool:
+        if_none_match = headers.get(b"if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.decode("latin-1").split(",")]
+            return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+        if_modified_since = headers.get(b"if-modified-since")
+        if if_modified_since is not None:
+            return if_modified_since.decode("latin-1") == self.last_modified
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != AGENT_CARD_PATH or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = [
+            (b"etag", self.etag.encode()),
+            (b"last-modified", self.last_modified.encode()),
+            (b"cache-control", b"no-cache"),
+        ]
+        if self._not_modified(dict(scope["headers"])):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(self.body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else self.body})
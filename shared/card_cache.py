@@ -0,0 +1,83 @@
+import hashlib
+import json
+import logging
+import os
+
+import httpx
+from a2a.types import AgentCard
+
+logger = logging.getLogger(__name__)
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+
+class AgentCardCache:
+    """Agent cards cached on disk and revalidated with ETag / Last-Modified.
+
+    Each remote agent's card is stored in `cache_dir` together with the validators
+    the server sent. `fetch` sends them back as `If-None-Match` / `If-Modified-Since`,
+    so an unchanged card costs a 304 and is served from the already parsed copy.
+    The cache survives restarts, which lets startup use the cards right away.
+    """
+
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = cache_dir or os.environ.get("A2A_CARD_CACHE_DIR", ".agent_card_cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._cards: dict[str, AgentCard] = {}
+        self._validators: dict[str, dict[str, str]] = {}
+
+    def _path(self, address: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(address.encode()).hexdigest() + ".json")
+
+    def cached(self, address: str) -> AgentCard | None:
+        """Returns the cached card for `address` without any network call."""
+        if address in self._cards:
+            return self._cards[address]
+        try:
+            with open(self._path(address)) as f:
+                entry = json.load(f)
+            card = AgentCard.model_validate(entry["card"])
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Ignoring unreadable cached agent card for {address}: {e}")
+            return None
+        self._cards[address] = card
+        self._validators[address] = entry.get("validators", {})
+        return card
+
+    def _store(self, address: str, card: AgentCard, validators: dict[str, str]):
+        self._cards[address] = card
+        self._validators[address] = validators
+        path = self._path(address)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"address": address, "validators": validators, "card": card.model_dump(mode="json", exclude_none=True)}, f)
+        os.replace(tmp_path, path)
+
+    async def fetch(self, address: str, httpx_client: httpx.AsyncClient, timeout: float | None = None) -> AgentCard:
+        """Returns the current card of the agent at `address`, revalidating the cached copy."""
+        cached_card = self.cached(address)
+        headers = {}
+        if cached_card is not None:
+            validators = self._validators.get(address, {})
+            if "etag" in validators:
+                headers["If-None-Match"] = validators["etag"]
+            if "last_modified" in validators:
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        kwargs = {"headers": headers}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        response = await httpx_client.get(address.rstrip("/") + AGENT_CARD_PATH, **kwargs)
+        if response.status_code == 304 and cached_card is not None:
+            return cached_card
+        response.raise_for_status()
+
+        card = AgentCard.model_validate(response.json())
+        validators = {}
+        if "etag" in response.headers:
+            validators["etag"] = response.headers["etag"]
+        if "last-modified" in response.headers:
+            validators["last_modified"] = response.headers["last-modified"]
+        self._store(address, card, validators)
+        return card
@@ -0,0 +1,316 @@
+"""Runtime metrics of an A2A server, in the Prometheus text format.
+
+`MetricsMiddleware` serves everything registered here at `/metrics` and times
+every JSON-RPC request by method (`message/send`, `message/stream`, `tasks/get`,
+...). The agent adds LLM and tool-call latency through the ADK callbacks below,
+and the executor reports the events of each turn. Active sessions and the task
+store size are read when scraped, from the functions set with
+`Gauge.set_function`.
+
+Event-loop lag is the delay of a timer that should fire every
+`EVENT_LOOP_LAG_INTERVAL` seconds: a loop that is busy with blocking work or
+saturated with callbacks fires it late.
+
+With several server workers, each one keeps its own metrics and a scrape reports
+the worker that answered it; active sessions and the task store are shared by all.
+"""
+
+import asyncio
+import json
+import math
+import time
+from typing import Callable, Iterable, Optional
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = b"text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+EVENT_LOOP_LAG_INTERVAL = 0.5
+MAX_OPEN_CALLBACK_TIMERS = 10_000
+# Methods are client input; beyond this many distinct ones the rest are counted as "other".
+MAX_RPC_METHODS = 32
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[tuple[str, tuple[str, ...], tuple[str, ...], float]]:
+        """(name suffix, label names, label values, value) of every sample."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in list(self._values.items()):
+            yield "", self.labelnames, key, value
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Reads the (unlabelled) value from `function` on every scrape."""
+        self._function = function
+
+    def samples(self):
+        if self._function is not None:
+            yield "", (), (), self._function()
+        for key, value in list(self._values.items()):
+            yield "", self.labelnames, key, value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labels -> (count per bucket, sum, count)
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][i] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in list(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield "_bucket", names, key + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, key, total
+            yield "_count", self.labelnames, key, count
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render() -> bytes:
+    """All metrics in the Prometheus text format."""
+    return ("\n".join(metric.render() for metric in REGISTRY) + "\n").encode()
+
+
+RPC_REQUESTS = Counter("a2a_rpc_requests_total", "JSON-RPC requests by method and HTTP status.", ("method", "status"))
+RPC_DURATION = Histogram(
+    "a2a_rpc_request_duration_seconds",
+    "Time from receiving a JSON-RPC request to the end of its response (or stream).",
+    ("method",),
+)
+# The metric keeps its name; it counts runs, of which a session may have several at once.
+ACTIVE_SESSIONS = Gauge("a2a_active_sessions", "Agent runs in progress.")
+TASK_STORE_SIZE = Gauge("a2a_task_store_tasks", "Tasks held by the task store.")
+EVENTS_PER_TURN = Histogram(
+    "a2a_events_per_turn", "Non-partial runner events per agent turn.", buckets=COUNT_BUCKETS
+)
+LLM_DURATION = Histogram("a2a_llm_call_duration_seconds", "Duration of model calls.", ("agent",))
+TOOL_DURATION = Histogram("a2a_tool_call_duration_seconds", "Duration of tool calls.", ("agent", "tool"))
+EVENT_LOOP_LAG = Histogram(
+    "a2a_event_loop_lag_seconds", "How late a periodic event-loop timer fired.", buckets=LAG_BUCKETS
+)
+
+
+def task_store_size(task_store) -> int:
+    """The number of tasks in an in-memory or SQLite task store."""
+    tasks = getattr(task_store, "tasks", None)
+    return len(tasks) if tasks is not None else len(task_store)
+
+
+# --- ADK callbacks: LLM and tool-call latency ---
+
+_started: dict[str, float] = {}
+
+
+def _start(key: str):
+    if len(_started) >= MAX_OPEN_CALLBACK_TIMERS:
+        # Calls that failed never reach their after-callback.
+        _started.clear()
+    _started[key] = time.monotonic()
+
+
+def before_model_callback(callback_context, llm_request):
+    _start(f"llm:{callback_context.invocation_id}:{callback_context.agent_name}")
+    return None
+
+
+def after_model_callback(callback_context, llm_response):
+    if llm_response.partial:
+        return None
+    started = _started.pop(f"llm:{callback_context.invocation_id}:{callback_context.agent_name}", None)
+    if started is not None:
+        LLM_DURATION.observe(time.monotonic() - started, agent=callback_context.agent_name)
+    return None
+
+
+def before_tool_callback(tool, args, tool_context):
+    _start(f"tool:{tool_context.function_call_id}")
+    return None
+
+
+def after_tool_callback(tool, args, tool_context, tool_response):
+    started = _started.pop(f"tool:{tool_context.function_call_id}", None)
+    if started is not None:
+        TOOL_DURATION.observe(time.monotonic() - started, agent=tool_context.agent_name, tool=tool.name)
+    return None
+
+
+# --- Event-loop lag ---
+
+_lag_watcher: Optional[asyncio.Task] = None
+
+
+async def _watch_event_loop(interval: float):
+    while True:
+        started = time.monotonic()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, time.monotonic() - started - interval))
+
+
+def watch_event_loop(interval: float = EVENT_LOOP_LAG_INTERVAL):
+    """Starts measuring the lag of the running event loop, once."""
+    global _lag_watcher
+    if _lag_watcher is None or _lag_watcher.done():
+        _lag_watcher = asyncio.get_running_loop().create_task(_watch_event_loop(interval))
+
+
+# --- Server ---
+
+class MetricsMiddleware:
+    """ASGI middleware that serves `/metrics` and times JSON-RPC requests by method.
+
+    The request body is read up front to find the method and then handed to the
+    app unchanged; A2A requests are small JSON documents.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "lifespan"):
+            watch_event_loop()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == METRICS_PATH and scope["method"] in ("GET", "HEAD"):
+            body = render()
+            headers = [(b"content-type", CONTENT_TYPE), (b"content-length", str(len(body)).encode())]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+            return
+        if scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        chunks = []
+        message = {"type": "http.request", "more_body": True}
+        while message["type"] == "http.request" and message.get("more_body", False):
+            message = await receive()
+            chunks.append(message.get("body", b""))
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            if message["type"] != "http.request":
+                return message  # disconnected while sending the body
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status = 500
+
+        async def send_with_status(response):
+            nonlocal status
+            if response["type"] == "http.response.start":
+                status = response["status"]
+            await send(response)
+
+        method = _rpc_method(body)
+        try:
+            await self.app(scope, replay, send_with_status)
+        finally:
+            RPC_REQUESTS.inc(method=method, status=status)
+            RPC_DURATION.observe(time.monotonic() - started, method=method)
+
+
+_rpc_methods: set[str] = set()
+
+
+def _rpc_method(body: bytes) -> str:
+    try:
+        request = json.loads(body)
+    except ValueError:
+        return "invalid"
+    if isinstance(request, list):
+        return "batch"
+    method = request.get("method") if isinstance(request, dict) else None
+    if not isinstance(method, str):
+        return "invalid"
+    if method not in _rpc_methods:
+        if len(_rpc_methods) >= MAX_RPC_METHODS:
+            return "other"
+        _rpc_methods.add(method)
+    return method
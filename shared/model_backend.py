@@ -0,0 +1,264 @@
+"""Record/replay model backend, for running the agents without a live model.
+
+`model_backend(model, agent_name)` is what the agents pass as their `model`. The
+environment picks the backend:
+
+    A2A_MODEL_MODE=live     the Gemini model itself (default)
+    A2A_MODEL_MODE=record   Gemini, and every request/response pair is appended to a tape
+    A2A_MODEL_MODE=replay   answers come from the tape, no network access at all
+    A2A_MODEL_MODE=stub     every request gets the same short text answer (`A2A_STUB_REPLY`)
+
+There is one tape per agent, `<A2A_MODEL_TAPE_DIR>/<agent_name>.jsonl`
+(default directory `model_tapes`). Requests are matched by a fingerprint of the
+conversation, the instruction and the tool declarations, with ids, uuids and
+thought signatures left out so a recorded flow replays in a new session. A
+request that was not recorded exactly falls back to the recordings that answered
+the same last message; if there is none `ReplayMissError` is raised.
+
+Replayed answers are delayed like a real model: `A2A_REPLAY_LATENCY` seconds
+before the first response (`recorded` for the recorded time to first token, the
+default), and `A2A_REPLAY_CHUNK_DELAY` seconds between the streamed chunks of a
+text answer. Stub answers use the same settings, with no delay for `recorded`.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, AsyncGenerator, Optional, Union
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+LIVE, RECORD, REPLAY, STUB = "live", "record", "replay", "stub"
+DEFAULT_STUB_REPLY = "Got it! Anything else?"
+DEFAULT_TAPE_DIR = "model_tapes"
+REPLAY_CHUNK_CHARS = 24
+
+# uuids and 32-digit hex ids (task, context and message ids) differ in every run.
+_VOLATILE_IDS = re.compile(
+    r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b|\b[0-9a-f]{32}\b", re.IGNORECASE
+)
+_VOLATILE_KEYS = {"thought_signature"}
+
+
+class ReplayMissError(LookupError):
+    """The tape has no recording for a request."""
+
+
+def _stable(value: Any) -> Any:
+    """`value` without the parts that change from run to run."""
+    if isinstance(value, dict):
+        # Function calls and responses get a fresh id per run.
+        drop = _VOLATILE_KEYS | ({"id"} if "name" in value else set())
+        return {key: _stable(item) for key, item in value.items() if key not in drop}
+    if isinstance(value, list):
+        return [_stable(item) for item in value]
+    if isinstance(value, str):
+        return _VOLATILE_IDS.sub("<id>", value)
+    return value
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:24]
+
+
+def _dump(value: Any) -> Any:
+    return value.model_dump(mode="json", exclude_none=True) if hasattr(value, "model_dump") else value
+
+
+def request_fingerprints(llm_request: LlmRequest) -> tuple[str, str]:
+    """The exact and the fallback fingerprint of a request.
+
+    The exact one covers the instruction, the tools and the whole conversation;
+    the fallback one only the last message.
+    """
+    config = llm_request.config
+    contents = _stable([_dump(content) for content in llm_request.contents])
+    prefix = _stable({
+        "system_instruction": _dump(config.system_instruction),
+        "tools": [_dump(tool) for tool in config.tools or []],
+    })
+    return _hash([prefix, contents]), _hash(contents[-1:])
+
+
+class Tape:
+    """The recorded request/response pairs of one agent, as JSON lines."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._exact: dict[str, list[dict]] = defaultdict(list)
+        self._fallback: dict[str, list[dict]] = defaultdict(list)
+        # How often each fingerprint was replayed, so repeated requests cycle through their recordings.
+        self._replayed: dict[str, int] = defaultdict(int)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+            logger.info(f"Loaded {sum(map(len, self._exact.values()))} model recordings from {path}.")
+
+    def _index(self, entry: dict):
+        self._exact[entry["fingerprint"]].append(entry)
+        self._fallback[entry["fallback"]].append(entry)
+
+    def record(self, entry: dict):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # One write per line, so several server workers can append to the same tape.
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._index(entry)
+
+    def lookup(self, llm_request: LlmRequest) -> dict:
+        fingerprint, fallback = request_fingerprints(llm_request)
+        for key, index in ((fingerprint, self._exact), (fallback, self._fallback)):
+            entries = index.get(key)
+            if entries:
+                with self._lock:
+                    count = self._replayed[key]
+                    self._replayed[key] += 1
+                return entries[count % len(entries)]
+        raise ReplayMissError(f"No recording in {self.path} for request {fingerprint}.")
+
+
+_tapes: dict[str, Tape] = {}
+_tapes_lock = threading.Lock()
+
+
+def get_tape(path: str) -> Tape:
+    with _tapes_lock:
+        if path not in _tapes:
+            _tapes[path] = Tape(path)
+        return _tapes[path]
+
+
+class RecordingLlm(BaseLlm):
+    """Gemini, recording every request and its responses to a tape."""
+
+    tape_path: str
+    _inner: Optional[BaseLlm] = PrivateAttr(default=None)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self._inner is None:
+            self._inner = Gemini(model=self.model)
+        # Fingerprinted before the call, which may add to the request.
+        fingerprint, fallback = request_fingerprints(llm_request)
+        last_message = _stable(_dump(llm_request.contents[-1])) if llm_request.contents else None
+        started = time.monotonic()
+        first_response = None
+        responses = []
+        async for response in self._inner.generate_content_async(llm_request, stream):
+            if first_response is None:
+                first_response = time.monotonic() - started
+            # Streamed chunks are rebuilt from the complete responses on replay.
+            if not response.partial:
+                responses.append(_dump(response))
+            yield response
+        get_tape(self.tape_path).record({
+            "fingerprint": fingerprint,
+            "fallback": fallback,
+            "model": self.model,
+            "last_message": last_message,
+            "responses": responses,
+            "first_response_seconds": round(first_response or 0.0, 4),
+            "total_seconds": round(time.monotonic() - started, 4),
+        })
+
+
+async def _stream_text(response: LlmResponse, stream: bool, chunk_delay: float) -> AsyncGenerator[LlmResponse, None]:
+    """Yields `response`, preceded by its text in streamed chunks if `stream` is set."""
+    parts = response.content.parts if response.content and response.content.parts else []
+    text = "".join(part.text for part in parts if part.text and not part.thought)
+    if stream and text and not any(part.function_call for part in parts):
+        for start in range(0, len(text), REPLAY_CHUNK_CHARS):
+            yield LlmResponse(
+                content=types.ModelContent(parts=[types.Part(text=text[start:start + REPLAY_CHUNK_CHARS])]),
+                partial=True,
+            )
+            await asyncio.sleep(chunk_delay)
+    yield response
+
+
+class ReplayLlm(BaseLlm):
+    """Answers from a tape, with synthetic latency and without any network access.
+
+    `latency` is the delay before the first response, None for the recorded one;
+    `chunk_delay` the delay between the chunks of a streamed text answer.
+    """
+
+    tape_path: str
+    latency: Optional[float] = None
+    chunk_delay: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        entry = get_tape(self.tape_path).lookup(llm_request)
+        await asyncio.sleep(entry.get("first_response_seconds", 0.0) if self.latency is None else self.latency)
+        for recorded in entry["responses"]:
+            async for response in _stream_text(LlmResponse.model_validate(recorded), stream, self.chunk_delay):
+                yield response
+
+
+class StubLlm(BaseLlm):
+    """Answers every request with the same text, to load-test everything but the model."""
+
+    reply: str = DEFAULT_STUB_REPLY
+    latency: float = 0.0
+    chunk_delay: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency)
+        response = LlmResponse(content=types.ModelContent(parts=[types.Part(text=self.reply)]))
+        async for chunk in _stream_text(response, stream, self.chunk_delay):
+            yield chunk
+
+
+def model_mode() -> str:
+    return os.environ.get("A2A_MODEL_MODE", LIVE).lower()
+
+
+def model_backend(model: str, agent_name: str) -> Union[str, BaseLlm]:
+    """The model for an agent: the model name itself when live, or a recording / replaying backend."""
+    mode = model_mode()
+    if mode == LIVE:
+        return model
+    latency = os.environ.get("A2A_REPLAY_LATENCY", "recorded")
+    chunk_delay = float(os.environ.get("A2A_REPLAY_CHUNK_DELAY", 0.0))
+    if mode == STUB:
+        return StubLlm(
+            model=model,
+            reply=os.environ.get("A2A_STUB_REPLY", DEFAULT_STUB_REPLY),
+            latency=0.0 if latency == "recorded" else float(latency),
+            chunk_delay=chunk_delay,
+        )
+    tape_path = os.path.join(os.environ.get("A2A_MODEL_TAPE_DIR", DEFAULT_TAPE_DIR), f"{agent_name}.jsonl")
+    if mode == RECORD:
+        logger.info(f"Recording the model calls of {agent_name} to {tape_path}.")
+        return RecordingLlm(model=model, tape_path=tape_path)
+    if mode == REPLAY:
+        logger.info(f"Replaying the model calls of {agent_name} from {tape_path} (latency {latency}).")
+        return ReplayLlm(
+            model=model,
+            tape_path=tape_path,
+            latency=None if latency == "recorded" else float(latency),
+            chunk_delay=chunk_delay,
+        )
+    raise ValueError(f"Unknown A2A_MODEL_MODE {mode!r}, expected {LIVE}, {RECORD}, {REPLAY} or {STUB}.")
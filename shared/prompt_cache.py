@@ -0,0 +1,248 @@
+"""Context caching of an agent's static prompt prefix.
+
+Every model call re-sends the agent's instruction and tool declarations, which
+are the same for every turn of every session. `PromptCache` stores that static
+prefix once as a Gemini cached content and points each request at it, so only
+the conversation is sent and processed as new input tokens.
+
+Cached content is billed for its storage, so caching is opt-in: set
+`A2A_PROMPT_CACHE=1` (live model mode only). A cache replaced because the prefix
+changed or is about to expire is deleted; the last one expires after its ttl.
+
+Use it as the agent's model callbacks:
+
+    prompt_cache = PromptCache("LuigisPizzaBot")
+    Agent(..., before_model_callback=prompt_cache.before_model_callback,
+          after_model_callback=prompt_cache.after_model_callback)
+
+Dynamic parts must not be in the instruction, or the prefix changes every turn;
+pass them as `dynamic_suffix`, a function of the context returning text. The API
+does not accept a system instruction next to a cached content, and plain
+conversation content would let the suffix pass for user input. So on a cached
+request the suffix follows the conversation as a call of the agent's tool
+`dynamic_tool` and its result, as if the model had just looked it up; on an
+uncached one it is appended to the system instruction. An agent with a suffix
+but no `dynamic_tool` is never cached. When a cache cannot be created (prefix
+below the model's minimum, API without caching, ...) the request is sent
+unchanged and creation is retried after `retry_after` seconds.
+
+Hit rates come from the `cached_content_token_count` the model reports, so they
+also count the model's own implicit caching of a stable prefix.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import Client, types
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 3600
+# A cache is replaced this long before it expires, so no request points at an expired one.
+EXPIRY_MARGIN = 60
+DEFAULT_RETRY_AFTER = 300
+STATS_LOG_INTERVAL = 50
+
+DynamicSuffix = Callable[[ReadonlyContext], str]
+
+
+def prefix_fingerprint(model: str, config: types.GenerateContentConfig) -> str:
+    """A hash of everything that goes into the cached prefix."""
+    prefix = {
+        "model": model,
+        "system_instruction": _as_json(config.system_instruction),
+        "tools": [_as_json(tool) for tool in config.tools or []],
+        "tool_config": _as_json(config.tool_config),
+    }
+    return hashlib.sha256(json.dumps(prefix, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _as_json(value):
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    return value
+
+
+class _CachedPrefix:
+    def __init__(self, name: str, expires_at: float):
+        self.name = name
+        self.expires_at = expires_at
+
+
+class PromptCache:
+    """Caches the static instruction and tool declarations of one agent."""
+
+    def __init__(
+        self,
+        agent_name: str,
+        dynamic_suffix: Optional[DynamicSuffix] = None,
+        dynamic_tool: Optional[str] = None,
+        ttl: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        retry_after: float = DEFAULT_RETRY_AFTER,
+        client: Optional[Client] = None,
+    ):
+        self.agent_name = agent_name
+        self.dynamic_suffix = dynamic_suffix
+        self.dynamic_tool = dynamic_tool
+        self.ttl = ttl or int(os.environ.get("A2A_PROMPT_CACHE_TTL", DEFAULT_TTL))
+        if enabled is None:
+            enabled = os.environ.get("A2A_PROMPT_CACHE", "0").lower() in ("1", "true", "yes", "on")
+            # Recorded requests must look the same as the ones replayed offline, where nothing can be cached.
+            enabled = enabled and os.environ.get("A2A_MODEL_MODE", "live").lower() == "live"
+        # Without a tool to send it as, the suffix has to go into the system instruction,
+        # which cannot be sent with a cache.
+        self.enabled = enabled and (dynamic_suffix is None or dynamic_tool is not None)
+        self.retry_after = retry_after
+        self._client = client
+        self._prefixes: dict[str, _CachedPrefix] = {}
+        self._failed_until: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Per-agent counters, see `stats`.
+        self.calls = 0
+        self.cached_calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.caches_created = 0
+        self.cache_failures = 0
+        _registry[agent_name] = self
+
+    @property
+    def client(self) -> Client:
+        if self._client is None:
+            self._client = Client()
+        return self._client
+
+    async def _cached_prefix(self, llm_request: LlmRequest) -> Optional[_CachedPrefix]:
+        """The live cache for the request's prefix, created if needed; None if it cannot be cached."""
+        config = llm_request.config
+        if not config.system_instruction and not config.tools:
+            return None
+        fingerprint = prefix_fingerprint(llm_request.model, config)
+        cached = self._prefixes.get(fingerprint)
+        if cached is not None and cached.expires_at - EXPIRY_MARGIN > time.time():
+            return cached
+        if self._failed_until.get(fingerprint, 0) > time.monotonic():
+            return None
+
+        # Concurrent first turns wait for a single creation instead of each creating a cache.
+        async with self._locks.setdefault(fingerprint, asyncio.Lock()):
+            cached = self._prefixes.get(fingerprint)
+            if cached is not None and cached.expires_at - EXPIRY_MARGIN > time.time():
+                return cached
+            try:
+                created = await self.client.aio.caches.create(
+                    model=llm_request.model,
+                    config=types.CreateCachedContentConfig(
+                        display_name=f"{self.agent_name}-{fingerprint}",
+                        system_instruction=config.system_instruction,
+                        tools=config.tools,
+                        tool_config=config.tool_config,
+                        ttl=f"{self.ttl}s",
+                    ),
+                )
+            except Exception as e:
+                self.cache_failures += 1
+                self._failed_until[fingerprint] = time.monotonic() + self.retry_after
+                logger.warning(
+                    f"Could not cache the prompt prefix of {self.agent_name}, sending it uncached "
+                    f"for the next {self.retry_after:.0f}s: {e}"
+                )
+                return None
+            expires_at = created.expire_time.timestamp() if created.expire_time else time.time() + self.ttl
+            cached = _CachedPrefix(created.name, expires_at)
+            # A changed or expiring prefix replaces the old cache, which is no longer used.
+            superseded, self._prefixes = self._prefixes, {fingerprint: cached}
+            self.caches_created += 1
+            logger.info(f"Cached the prompt prefix of {self.agent_name} as {created.name} (prefix {fingerprint}).")
+            for old in superseded.values():
+                await self._delete(old)
+            return cached
+
+    async def _delete(self, cached: _CachedPrefix):
+        try:
+            await self.client.aio.caches.delete(name=cached.name)
+        except Exception as e:
+            # It still expires after its ttl.
+            logger.warning(f"Could not delete the superseded prompt cache {cached.name}: {e}")
+        else:
+            logger.info(f"Deleted the superseded prompt cache {cached.name} of {self.agent_name}.")
+
+    async def before_model_callback(self, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        """Points the request at the cached prefix and adds the dynamic suffix where it fits."""
+        suffix = self.dynamic_suffix(callback_context) if self.dynamic_suffix is not None else ""
+        cached = await self._cached_prefix(llm_request) if self.enabled else None
+        if cached is None:
+            if suffix:
+                llm_request.append_instructions([suffix])
+            return None
+
+        config = llm_request.config
+        config.cached_content = cached.name
+        # Whatever is in the cache must not be sent again with the request.
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+        if suffix:
+            llm_request.contents.extend(self._dynamic_exchange(suffix))
+        return None
+
+    def _dynamic_exchange(self, suffix: str) -> list[types.Content]:
+        """The suffix as a call of `dynamic_tool` and its result, to follow the conversation."""
+        return [
+            types.Content(
+                role="model",
+                parts=[types.Part(function_call=types.FunctionCall(name=self.dynamic_tool, args={}))],
+            ),
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part(
+                        function_response=types.FunctionResponse(name=self.dynamic_tool, response={"result": suffix})
+                    )
+                ],
+            ),
+        ]
+
+    def after_model_callback(self, callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        """Records how many prompt tokens were served from a cache."""
+        usage = llm_response.usage_metadata
+        if usage is None or llm_response.partial:
+            return None
+        cached_tokens = usage.cached_content_token_count or 0
+        self.calls += 1
+        self.cached_calls += 1 if cached_tokens else 0
+        self.prompt_tokens += usage.prompt_token_count or 0
+        self.cached_tokens += cached_tokens
+        if self.calls % STATS_LOG_INTERVAL == 0:
+            logger.info(f"Prompt cache stats: {self.stats()}")
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "agent": self.agent_name,
+            "calls": self.calls,
+            "hit_rate": self.cached_calls / self.calls if self.calls else 0.0,
+            "cached_token_ratio": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "caches_created": self.caches_created,
+            "cache_failures": self.cache_failures,
+        }
+
+
+_registry: dict[str, PromptCache] = {}
+
+
+def prompt_cache_stats() -> dict[str, dict]:
+    """Cache statistics of every agent in this process, by agent name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+from google.genai import types
+
+
+if TYPE_CHECKING:
+    from google.adk.events.event import Event
+    from google.adk.sessions.session import Session
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300
+STATS_LOG_INTERVAL = 100
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases and drops punctuation and extra whitespace: "What's on the menu?" -> "whats on the menu"."""
+    return " ".join(_PUNCTUATION.sub("", text.lower()).split())
+
+
+def content_text(content: Optional[types.Content]) -> str:
+    return "".join(part.text for part in (content.parts if content and content.parts else []) if part.text)
+
+
+class ResponseCache:
+    """An opt-in LRU cache of final agent answers for turns that did not change anything.
+
+    A turn is looked up by the agent, the normalized user text and a fingerprint
+    of what the answer may depend on: the session state, the agent's previous
+    reply (so "yes" only hits after the same question) and any `extra` the
+    executor adds, such as the catalog version. A turn is only stored if it
+    called nothing but `read_only_tools`, changed no state or artifacts and
+    produced no intermediate messages, so payments and other state-mutating
+    turns always reach the model.
+
+    Entries expire after `ttl` seconds; beyond `max_entries` the least recently
+    used entry is dropped.
+    """
+
+    def __init__(
+        self,
+        read_only_tools: Iterable[str] = (),
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.read_only_tools = frozenset(read_only_tools)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (expiry time, texts of the final answer's parts)
+        self._entries: "OrderedDict[str, tuple[float, tuple[str, ...]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls, read_only_tools: Iterable[str] = ()) -> Optional['ResponseCache']:
+        """The cache configured through the environment, or None unless `A2A_RESPONSE_CACHE` is enabled.
+
+        `A2A_RESPONSE_CACHE_SIZE` is the maximum number of answers kept and
+        `A2A_RESPONSE_CACHE_TTL` how many seconds each one is served.
+        """
+        if os.environ.get("A2A_RESPONSE_CACHE", "").lower() not in ("1", "true", "yes", "on"):
+            return None
+        return cls(
+            read_only_tools,
+            max_entries=int(os.environ.get("A2A_RESPONSE_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+            ttl=float(os.environ.get("A2A_RESPONSE_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+        )
+
+    def key(self, agent_name: str, new_message: types.Content, session: 'Session', extra: Any = None) -> Optional[str]:
+        """The cache key of a turn, or None if the message has no text to key on."""
+        text = normalize_text(content_text(new_message))
+        if not text:
+            return None
+        previous_reply = next(
+            (content_text(event.content) for event in reversed(session.events) if event.author != 'user'),
+            '',
+        )
+        fingerprint = json.dumps([session.state, previous_reply, extra], sort_keys=True, default=str)
+        return hashlib.sha256(f"{agent_name}\0{text}\0{fingerprint}".encode()).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[tuple[str, ...]]:
+        """The cached answer for `key`, counting a hit or a miss."""
+        entry = self._entries.get(key) if key else None
+        if entry is not None and entry[0] <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            self._maybe_log_stats()
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._maybe_log_stats()
+        return entry[1]
+
+    def is_read_only(self, event: 'Event') -> bool:
+        """Whether a (non-partial) event of the turn keeps the turn cacheable."""
+        actions = event.actions
+        if actions and (actions.state_delta or actions.artifact_delta):
+            return False
+        return all(call.name in self.read_only_tools for call in event.get_function_calls())
+
+    def put(self, key: str, content: Optional[types.Content]):
+        """Stores the final answer of a read-only turn; answers with anything but text are not cached."""
+        parts = content.parts if content and content.parts else []
+        if not parts or any(not part.text for part in parts):
+            self.skip()
+            return
+        self._entries[key] = (self._clock() + self.ttl, tuple(part.text for part in parts))
+        self._entries.move_to_end(key)
+        self.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def skip(self):
+        """Counts a turn that could not be cached."""
+        self.skipped += 1
+
+    def _maybe_log_stats(self):
+        if (self.hits + self.misses) % STATS_LOG_INTERVAL == 0:
+            logger.info(f"Response cache stats: {self.stats()}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "skipped": self.skipped,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,8 @@
+"""Everything a restaurant agent runs on, configured by the restaurant's catalog file.
+
+The catalog (`catalog`) holds the menu, prices, tax rate and how order lines are
+built, plus an `agent` section with the agent's persona, model, port and agent
+card. The matcher, the integer-cents pricing engine, the order tools, the agent,
+its executor and the A2A server are the same for every restaurant, so adding a
+restaurant takes a catalog file and a start script, like `pizza_house_worker`.
+"""
@@ -0,0 +1,128 @@
+"""The A2A server of a restaurant, configured by its catalog file.
+
+Each restaurant directory holds its catalog (`menu.json`) and an `a2a_server.py`
+script that calls `main` with it. `A2A_MENU_FILE` overrides the file, so the same
+server can run any restaurant.
+"""
+
+import logging
+import os
+
+import uvicorn
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from dotenv import load_dotenv
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.runners import Runner
+from starlette.middleware.cors import CORSMiddleware
+
+from shared.admission import AdmissionController
+from shared.agent_card_middleware import AgentCardMiddleware
+from shared.metrics import ACTIVE_SESSIONS, TASK_STORE_SIZE, MetricsMiddleware, task_store_size
+from shared.response_cache import ResponseCache
+from shared.session_service import build_session_service
+from shared.usage import UsageApiMiddleware
+from shared.worker_state import build_run_registry, build_task_store
+
+from .agent import build_agent
+from .agent_card import get_agent_card
+from .agent_executor import RestaurantAgentExecutor
+from .catalog import Catalog
+from .tools import READ_ONLY_TOOLS
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+streaming=os.environ.get("A2A_STREAMING", "true").lower() == "true"
+workers=int(os.environ.get("A2A_WORKERS", 1))
+DEFAULT_PORT = 10003
+
+
+def server_port(catalog: Catalog) -> int:
+    """`A2A_PORT`, or the port of the restaurant's catalog."""
+    return int(os.environ.get("A2A_PORT", catalog.current().agent.get("port", DEFAULT_PORT)))
+
+
+class RestaurantAgent:
+    """Builds the agent, runner and agent card of the restaurant in a catalog."""
+
+    def __init__(self, catalog: Catalog, public_url: str):
+        self.catalog = catalog
+        self._agent = build_agent(catalog)
+        self.runner = Runner(
+            app_name=self._agent.name,
+            agent=self._agent,
+            artifact_service=InMemoryArtifactService(),
+            session_service=build_session_service(self._agent.name),
+            memory_service=InMemoryMemoryService(),
+        )
+        self.agent_card = get_agent_card(catalog, public_url, streaming)
+
+
+def create_app(catalog: Catalog | None = None):
+    """Builds the ASGI app of the restaurant in `A2A_MENU_FILE`. Each server worker builds its own."""
+    catalog = catalog or Catalog.from_env()
+    public_url = os.environ.get("PUBLIC_URL", f"http://localhost:{server_port(catalog)}")
+    restaurant = RestaurantAgent(catalog, public_url)
+    app_name = restaurant.runner.app_name
+
+    active_runs = build_run_registry(app_name)
+    task_store = build_task_store(app_name)
+    ACTIVE_SESSIONS.set_function(lambda: len(active_runs))
+    TASK_STORE_SIZE.set_function(lambda: task_store_size(task_store))
+
+    request_handler = DefaultRequestHandler(
+        agent_executor=RestaurantAgentExecutor(
+            restaurant.runner,
+            restaurant.agent_card,
+            catalog,
+            streaming,
+            active_runs=active_runs,
+            response_cache=ResponseCache.from_env(READ_ONLY_TOOLS),
+            admission=AdmissionController.from_env(),
+        ),
+        task_store=task_store,
+    )
+
+    server = A2AStarletteApplication(
+        agent_card=restaurant.agent_card,
+        http_handler=request_handler,
+    )
+
+    app = CORSMiddleware(
+        UsageApiMiddleware(MetricsMiddleware(AgentCardMiddleware(server.build(), restaurant.agent_card))),
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    logger.info(f"Attempting to start server with Agent Card: {restaurant.agent_card.name}")
+    return app
+
+
+def main(menu_file: str):
+    """Runs the A2A server of the restaurant described by `menu_file`, unless `A2A_MENU_FILE` names another."""
+    # Server workers are separate processes; they find the catalog through the environment.
+    os.environ.setdefault("A2A_MENU_FILE", menu_file)
+    try:
+        catalog = Catalog.from_env()
+        port = server_port(catalog)
+        if workers > 1:
+            # Every worker imports this module and calls create_app(); tasks, sessions
+            # and the running-task registry are shared through the SQLite stores.
+            uvicorn.run(
+                "shared.restaurant.a2a_server:create_app",
+                factory=True,
+                workers=workers,
+                host='0.0.0.0',
+                port=port,
+            )
+        else:
+            uvicorn.run(create_app(catalog), host='0.0.0.0', port=port)
+    except Exception as e:
+        logger.error(f"An error occurred during server startup: {e}")
+        exit(1)
@@ -0,0 +1,139 @@
+"""The LLM agent of a restaurant, built from the `agent` section of its catalog.
+
+    "agent": {
+        "name": "LuigisPizzaBot",                # agent and app name
+        "model": "gemini-2.5-flash-lite",
+        "description": "...",
+        "assistant": "Alex",                     # who the customer talks to
+        "greeting": "...", "special": "...",     # optional special to mention
+        "confirmation_example": "...", "upsell": "...",
+        "phone": "555-123-PIZZA", "farewell": "...",
+        "eta_minutes": {"delivery": [30, 45], "pickup": [15, 20]},
+        "port": 10003,
+        "card": {"name": "...", "description": "...", "skills": [...]}
+    }
+
+The instruction is the same for every restaurant; how to order the lines that are
+built from several menu items is written from the catalog's line components.
+"""
+
+from google.adk.agents import Agent
+
+from shared import metrics, tracing, usage
+from shared.model_backend import model_backend
+from shared.prompt_cache import PromptCache
+
+from .catalog import MANY, OPTIONAL, Catalog, CatalogSnapshot
+from .tools import PAYMENT_METHODS, OrderTools, label
+
+INSTRUCTION = """You are {assistant}, a friendly and efficient worker at {restaurant}. Your goal is to provide a seamless and pleasant ordering experience for every customer. The order is kept for you on the server throughout the conversation.
+
+        **Conversational Flow:**
+        1.  **Greeting & Intent:**
+            - Start with a warm welcome: "{greeting}".{special}
+            - If for delivery, you MUST get the customer's full address and phone number and record them with the `set_order_details` tool, with `is_delivery` set to `True`.
+
+        2.  **Present Menu & Take Order:**
+            - If the customer asks for the menu, use the `get_full_menu` tool. When you receive the result from the tool, your response to the user **must be only the menu content, formatted clearly**. Do not include any greetings or other conversational text. Just provide the menu.
+            - As the customer adds items, use the `add_item_to_order` tool once per item, with the item's menu category ({order_lines}).{line_options}
+            - If the customer changes their mind about an item, use the `remove_item_from_order` tool.
+            - Confirm each item and its customizations clearly after adding it. For example: "{confirmation_example}"
+
+        3.  **Upsell & Special Requests:**
+            - After the main items are added, politely ask: "{upsell}"
+            - Ask about allergies or dietary preferences and record them with the `set_order_details` tool (`special_requests`).
+
+        4.  **Summarize & Bill:**
+            - When the customer confirms they are finished, use the `get_order_summary` tool and read back the entire order for confirmation.
+            - Then, use the `calculate_total` tool to get the billing summary.
+            - Present the subtotal, tax ({tax_percent}%), and the final total clearly to the customer. For example: "Your subtotal is $X.XX, tax is $Y.YY, for a final total of $Z.ZZ."
+
+        5.  **Process Payment:**
+            - Ask for the preferred payment method ({payment_methods}).
+            - Use the `process_payment` tool to handle this step. Wait for the confirmation message.
+
+        6.  **Confirm & Provide ETA:**
+            - After successful payment, confirm that the order is placed.
+            - Use the `get_order_eta` tool to provide an estimated time for pickup or delivery.
+
+        7.  **Closing:**
+            - Inform the customer they will receive text updates (if delivery) and provide the restaurant's number ({phone}) for any questions.
+            - End with: "{farewell}"
+
+        **Tool Usage Rules:**
+        - **State Management:** The order is built progressively and stored on the server. Tools only take the item or detail that changes and answer with a short confirmation, so never repeat the whole order. Do not forget items or start a new order.
+        - **Error Handling:** If a tool returns an error (e.g., item not available), apologize, state the specific error, and offer valid alternatives from the menu.
+        - **Menu Changes:** If a tool result lists `no_longer_available` items, tell the customer they were taken off the menu and removed from the order, and offer alternatives.
+        - **Clarity:** Be explicit about what you are adding to the order. Don't assume choices such as sizes or toppings. Always ask for clarification.
+        - **No Assumptions:** Do not add items to the order unless the user explicitly asks for them. After providing the menu, do not guess what the user wants. Wait for them to tell you.
+    """
+
+
+def _line_options(snapshot: CatalogSnapshot) -> str:
+    """How to pass the options of every line that is built from several menu items."""
+    notes = []
+    for category, components in snapshot.line_components.items():
+        (_, base_category, _), *choices = components
+        amounts = []
+        for _, menu_category, kind in choices:
+            amount = "any number" if kind == MANY else "at most one" if kind == OPTIONAL else "exactly one"
+            amounts.append(f"{amount} of the {label(menu_category)}")
+        if amounts:
+            notes.append(
+                f"\n            - For {label(category)}, `item` is one of the {label(base_category)}, "
+                f"and `options` lists {' and '.join(amounts)}."
+            )
+    return "".join(notes)
+
+
+def instruction(snapshot: CatalogSnapshot) -> str:
+    """The agent's instruction for the restaurant of `snapshot`."""
+    config = snapshot.agent
+    special = f"\n            - Optionally, mention a special like {config['special']}." if config.get("special") else ""
+    return INSTRUCTION.format(
+        assistant=config["assistant"],
+        restaurant=snapshot.restaurant,
+        greeting=config["greeting"],
+        special=special,
+        order_lines=", ".join(f"`{category}`" for category in snapshot.order_lines),
+        line_options=_line_options(snapshot),
+        confirmation_example=config["confirmation_example"],
+        upsell=config["upsell"],
+        tax_percent=f"{snapshot.prices.tax_basis_points / 100:g}",
+        payment_methods=f"{', '.join(PAYMENT_METHODS[:-1])}, or {PAYMENT_METHODS[-1]}",
+        phone=config["phone"],
+        farewell=config["farewell"],
+    )
+
+
+def build_agent(catalog: Catalog) -> Agent:
+    """Builds the agent of the restaurant in `catalog`, with its tools bound to the catalog."""
+    snapshot = catalog.current()
+    config = snapshot.agent
+    name = config["name"]
+    # The instruction and tools are static, so they can be served from a context cache (A2A_PROMPT_CACHE=1).
+    prompt_cache = PromptCache(name)
+    tracing.configure(name)
+    order_tools = OrderTools(catalog, config.get("eta_minutes"))
+
+    return Agent(
+        name=name,
+        model=model_backend(config["model"], name),
+        description=config["description"],
+        instruction=instruction(snapshot),
+        before_model_callback=[
+            tracing.before_model_callback,
+            prompt_cache.before_model_callback,
+            metrics.before_model_callback,
+            usage.before_model_callback,
+        ],
+        after_model_callback=[
+            usage.after_model_callback,
+            metrics.after_model_callback,
+            prompt_cache.after_model_callback,
+            tracing.after_model_callback,
+        ],
+        before_tool_callback=[tracing.before_tool_callback, metrics.before_tool_callback],
+        after_tool_callback=[metrics.after_tool_callback, tracing.after_tool_callback],
+        tools=order_tools.tools(),
+    )
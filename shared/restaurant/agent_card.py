@@ -0,0 +1,42 @@
+from a2a.types import AgentCard, AgentCapabilities, AgentSkill
+
+from .catalog import Catalog
+from .tools import label
+
+SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
+
+# The menu is also served as a structured A2A skill, answered without the model.
+# Clients send the version they already have and get the full menu only if it changed.
+MENU_SKILL_ID = "view-menu"
+
+
+def get_agent_card(catalog: Catalog, public_url: str, streaming: bool = True) -> AgentCard:
+    """Generates the agent card of the restaurant from the `agent.card` section of its catalog."""
+    snapshot = catalog.current()
+    card = snapshot.agent["card"]
+    capabilities = AgentCapabilities(streaming=streaming, tools=True, push_notifications=False)
+
+    lines = [label(category) for category in snapshot.order_lines]
+    listed = f"{', '.join(lines[:-1])}, and {lines[-1]}" if len(lines) > 1 else "".join(lines)
+    view_menu_skill = AgentSkill(
+        id=MENU_SKILL_ID,
+        name="View Full Menu",
+        description=f"""Provides the entire menu, including {listed}.
+        Send a message with metadata {{"skill": "view-menu", "menu_version": <known version>}} to get it as
+        JSON data {{"version", "menu"}} without a model turn, or {{"version", "unchanged": true}} if the known version is current.""",
+        tags=["menu", "information"],
+        examples=card.get("menu_examples", ["What's on the menu?", "Can you tell me what you have?"]),
+        outputModes=["application/json"],
+    )
+    skills = [AgentSkill(**skill) for skill in card.get("skills", [])]
+    agent_card = AgentCard(
+        name=card["name"],
+        description=card["description"],
+        url=f"{public_url}",
+        version="1.0.0",
+        defaultInputModes=SUPPORTED_CONTENT_TYPES,
+        defaultOutputModes=SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[*skills, view_menu_skill],
+    )
+    return agent_card
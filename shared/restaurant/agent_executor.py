@@ -0,0 +1,415 @@
+import asyncio
+import contextlib
+import logging
+import uuid
+
+from typing import TYPE_CHECKING
+
+from a2a.server.agent_execution import AgentExecutor
+from a2a.server.agent_execution.context import RequestContext
+from a2a.server.events.event_queue import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import (
+    AgentCard,
+    DataPart,
+    FilePart,
+    FileWithBytes,
+    Part,
+    TaskState,
+    TextPart,
+)
+from google.adk import Runner
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+from shared import metrics, tracing, usage
+from shared.admission import AdmissionController, AdmissionRejected
+from shared.response_cache import ResponseCache
+from shared.worker_state import CANCEL_POLL_SECONDS, ActiveRunRegistry, LocalRunRegistry
+
+from .agent_card import MENU_SKILL_ID
+from .catalog import Catalog
+
+
+if TYPE_CHECKING:
+    from google.adk.sessions.session import Session
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+DEFAULT_USER_ID = 'self'
+
+
+class RestaurantAgentExecutor(AgentExecutor):
+    def __init__(
+        self,
+        runner: Runner,
+        card: AgentCard,
+        catalog: Catalog,
+        streaming: bool = True,
+        active_runs: LocalRunRegistry | ActiveRunRegistry | None = None,
+        response_cache: ResponseCache | None = None,
+        admission: AdmissionController | None = None,
+    ):
+        self.runner = runner
+        self._card = card
+        self._catalog = catalog
+        # In streaming mode the model's partial text is forwarded to the client
+        # as incremental artifact chunks instead of waiting for the whole turn.
+        self._run_config = RunConfig(
+            streaming_mode=StreamingMode.SSE if streaming else StreamingMode.NONE
+        )
+        # Track running tasks for potential cancellation. A shared registry can be
+        # passed in so that tasks running on other workers are visible too.
+        self._active_runs = active_runs if active_runs is not None else LocalRunRegistry()
+        # The asyncio task running each in-flight request on this worker, by task id.
+        self._running: dict[str, asyncio.Task] = {}
+        # Tasks of this worker whose cancellation was requested through another worker.
+        self._cancelled_elsewhere: set[str] = set()
+        # Answers of read-only turns (opt-in), served without a model call.
+        self._response_cache = response_cache
+        # Bounds the concurrent runs on this worker; None runs every request at once.
+        self._admission = admission
+
+    async def _process_request(
+        self,
+        new_message: types.Content,
+        session_id: str,
+        task_updater: TaskUpdater,
+    ) -> None:
+        session_obj = await self._upsert_session(session_id)
+        # Update session_id with the ID from the resolved session object.
+        # (it may be the same as the one passed in if it already exists)
+        session_id = session_obj.id
+
+        # The cache was looked up before the run slot was taken (`_answer_cached`). The key
+        # is taken again, since another turn may have changed the session in the meantime.
+        cache_key = self._cache_key(new_message, session_obj)
+        cacheable = cache_key is not None
+
+        # Track this task as running
+        task_id = task_updater.task_id
+        await self._active_runs.add(task_id, session_id)
+
+        # All chunks of the answer share one artifact, so the final response
+        # can replace whatever was streamed before it.
+        artifact_id = uuid.uuid4().hex
+        streamed_chunks = False
+        events = 0
+        # The model usage of the turn is collected under its invocation id.
+        invocation_id = None
+        billed = False
+
+        try:
+            async for event in self.runner.run_async(
+                session_id=session_id,
+                user_id=DEFAULT_USER_ID,
+                new_message=new_message,
+                run_config=self._run_config,
+            ):
+                invocation_id = invocation_id or event.invocation_id
+                if event.partial:
+                    parts = [
+                        convert_genai_part_to_a2a(part)
+                        for part in (event.content.parts if event.content else [])
+                        if part.text
+                    ]
+                    if parts:
+                        logger.debug('Yielding partial response: %s', parts)
+                        await task_updater.add_artifact(
+                            parts,
+                            artifact_id=artifact_id,
+                            append=streamed_chunks,
+                            last_chunk=False,
+                        )
+                        streamed_chunks = True
+                    continue
+                events += 1
+                if cacheable and not self._response_cache.is_read_only(event):
+                    cacheable = False
+                if event.is_final_response():
+                    if cacheable:
+                        self._response_cache.put(cache_key, event.content)
+                    elif cache_key is not None:
+                        self._response_cache.skip()
+                    parts = [
+                        convert_genai_part_to_a2a(part)
+                        for part in event.content.parts
+                        if (part.text or part.file_data or part.inline_data)
+                    ]
+                    logger.debug('Yielding final response: %s', parts)
+                    await task_updater.add_artifact(
+                        parts, artifact_id=artifact_id, last_chunk=True
+                    )
+                    billed = True
+                    await task_updater.update_status(
+                        TaskState.completed, final=True, metadata=usage.LEDGER.close_turn(session_id, invocation_id)
+                    )
+                    break
+                # Any text streamed so far belonged to an intermediate step, so
+                # the next answer starts the artifact over.
+                streamed_chunks = False
+                if not event.get_function_calls():
+                    logger.debug('Yielding update response')
+                    if event.content and any(part.text for part in event.content.parts or []):
+                        # Only the final answer would be replayed from the cache.
+                        cacheable = False
+                    await task_updater.update_status(
+                        TaskState.working,
+                        message=task_updater.new_agent_message(
+                            [
+                                convert_genai_part_to_a2a(part)
+                                for part in event.content.parts
+                                if (part.text or part.file_data or part.inline_data)
+                            ],
+                        ),
+                    )
+                else:
+                    logger.debug('Skipping event')
+        except asyncio.CancelledError:
+            if streamed_chunks:
+                # Close the partly streamed answer, so clients stop waiting for chunks.
+                await task_updater.add_artifact(
+                    [Part(root=TextPart(text=''))], artifact_id=artifact_id, append=True, last_chunk=True
+                )
+            raise
+        finally:
+            # Remove from running tasks when done
+            await self._active_runs.discard(task_id)
+            metrics.EVENTS_PER_TURN.observe(events)
+            if not billed:
+                # Cancelled or failed turns used the model too.
+                usage.LEDGER.close_turn(session_id, invocation_id)
+
+    async def execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ):
+        # Continue the caller's trace, if it sent one with the message.
+        metadata = context.message.metadata if context.message else None
+        with tracing.span(
+            'a2a execute', parent=tracing.extract(metadata), agent=self._card.name, task_id=context.task_id
+        ):
+            await self._execute(context, event_queue)
+
+    async def _execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ):
+        # Run the agent until either complete or the task is suspended.
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+
+        # Immediately notify that the task is submitted.
+        if not context.current_task:
+            await updater.update_status(TaskState.submitted)
+        if is_menu_request(context):
+            await self._answer_menu_request(context, updater)
+            return
+        new_message = types.UserContent(
+            parts=[
+                convert_a2a_part_to_genai(part)
+                for part in context.message.parts
+            ],
+        )
+        if await self._answer_cached(context.context_id, new_message, updater):
+            return
+        # Only model turns need a run slot; the menu and cached answers are served right away.
+        slot = self._admission.slot() if self._admission is not None else contextlib.nullcontext()
+        try:
+            async with slot:
+                await self._run_turn(context, updater, new_message)
+        except AdmissionRejected as e:
+            logger.warning('Rejecting task %s: %s', context.task_id, e)
+            text = f"{self._card.name} is busy right now. Please try again in {e.retry_after} seconds."
+            await updater.update_status(
+                TaskState.rejected,
+                message=updater.new_agent_message([Part(root=TextPart(text=text))]),
+                final=True,
+                metadata={'retry_after': e.retry_after},
+            )
+        logger.debug('[RestaurantAgentExecutor] execute exiting')
+
+    async def _run_turn(self, context: RequestContext, updater: TaskUpdater, new_message: types.Content):
+        await updater.update_status(TaskState.working)
+        run = asyncio.create_task(self._process_request(new_message, context.context_id, updater))
+        self._running[context.task_id] = run
+        # Cancellations from other workers only show up in the shared registry.
+        watcher = None
+        if self._active_runs.shared:
+            watcher = asyncio.create_task(self._watch_cancel(context.task_id, run))
+        try:
+            await run
+        except asyncio.CancelledError:
+            # Only swallow the cancellation of the run itself, not of execute().
+            current = asyncio.current_task()
+            if not run.cancelled() or (current is not None and current.cancelling()):
+                raise
+            logger.info('Run for task %s was cancelled', context.task_id)
+            if context.task_id in self._cancelled_elsewhere:
+                # The worker that took the request has no hold on this task's stream.
+                await updater.update_status(TaskState.canceled, final=True)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            self._running.pop(context.task_id, None)
+            self._cancelled_elsewhere.discard(context.task_id)
+
+    async def _watch_cancel(self, task_id: str, run: asyncio.Task):
+        """Cancels the run once another worker has flagged its task for cancellation."""
+        while not run.done():
+            await asyncio.sleep(CANCEL_POLL_SECONDS)
+            if await self._active_runs.cancel_requested(task_id):
+                logger.info('Stopping task %s, cancelled through another worker', task_id)
+                self._cancelled_elsewhere.add(task_id)
+                run.cancel()
+                return
+
+    async def _answer_menu_request(self, context: RequestContext, updater: TaskUpdater):
+        """Answers the menu skill straight from the catalog, without a model turn.
+
+        If the client already has the current version only that is confirmed.
+        """
+        catalog = self._catalog.current()
+        known_version = (context.message.metadata or {}).get('menu_version')
+        if known_version == catalog.version:
+            data = {'version': catalog.version, 'unchanged': True}
+        else:
+            data = {'version': catalog.version, 'menu': catalog.menu}
+        logger.debug('Answering menu request (version %s, unchanged=%s)', catalog.version, 'unchanged' in data)
+        await updater.add_artifact([Part(root=DataPart(data=data))], name='menu', last_chunk=True)
+        await updater.update_status(TaskState.completed, final=True)
+
+    def _cache_key(self, new_message: types.Content, session: 'Session') -> str | None:
+        """The response cache key of the turn, or None if there is no cache or nothing to key on."""
+        if self._response_cache is None:
+            return None
+        return self._response_cache.key(self.runner.agent.name, new_message, session, self._catalog.current().version)
+
+    async def _answer_cached(self, session_id: str, new_message: types.Content, updater: TaskUpdater) -> bool:
+        """Answers the turn from the response cache if it is there. Returns whether it was."""
+        if self._response_cache is None:
+            return False
+        session = await self._upsert_session(session_id)
+        cached = self._response_cache.get(self._cache_key(new_message, session))
+        if cached is None:
+            return False
+        await updater.update_status(TaskState.working)
+        await self._answer_from_cache(session, new_message, cached, updater)
+        return True
+
+    async def _answer_from_cache(
+        self,
+        session: 'Session',
+        new_message: types.Content,
+        texts: tuple[str, ...],
+        task_updater: TaskUpdater,
+    ):
+        """Answers with a cached response and records the turn in the session like a model turn."""
+        logger.debug('Answering session %s from the response cache', session.id)
+        invocation_id = 'e-' + uuid.uuid4().hex
+        content = types.ModelContent(parts=[types.Part(text=text) for text in texts])
+        for event in (
+            Event(invocation_id=invocation_id, author='user', content=new_message),
+            Event(invocation_id=invocation_id, author=self.runner.agent.name, content=content),
+        ):
+            await self.runner.session_service.append_event(session, event)
+        await task_updater.add_artifact([TextPart(text=text) for text in texts], last_chunk=True)
+        # No model call, but the task may still carry the bill of an earlier turn.
+        await task_updater.update_status(
+            TaskState.completed, final=True, metadata=usage.LEDGER.close_turn(session.id, None)
+        )
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue):
+        """Cancel the execution for the given context.
+
+        The in-flight run is interrupted at its next await point, i.e. between
+        runner events, so no further artifacts are emitted and the task moves to
+        the canceled state. A task running on another worker is flagged in the
+        shared registry; that worker stops it and publishes its canceled state.
+        """
+        task_id = context.task_id
+        run = self._running.get(task_id)
+        if run is not None:
+            logger.info('Cancelling run for task %s in session: %s', task_id, context.context_id)
+            run.cancel()
+            # Let the run close its artifact before the task is marked canceled.
+            await asyncio.wait({run})
+        elif await self._active_runs.contains(task_id):
+            logger.info('Cancellation requested for task on another worker: %s', task_id)
+            await self._active_runs.request_cancel(task_id)
+        else:
+            logger.debug('Cancellation requested for inactive task: %s', task_id)
+
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.update_status(TaskState.canceled, final=True)
+
+    async def _upsert_session(self, session_id: str) -> 'Session':
+        """Retrieves a session if it exists, otherwise creates a new one.
+
+        Ensures that async session service methods are properly awaited. Only the
+        latest event is loaded, since the runner reloads the full session itself.
+        """
+        with tracing.span('session load', session_id=session_id):
+            session = await self.runner.session_service.get_session(
+                app_name=self.runner.app_name,
+                user_id=DEFAULT_USER_ID,
+                session_id=session_id,
+                config=GetSessionConfig(num_recent_events=1),
+            )
+            if session is None:
+                session = await self.runner.session_service.create_session(
+                    app_name=self.runner.app_name,
+                    user_id=DEFAULT_USER_ID,
+                    session_id=session_id,
+                )
+        return session
+
+def is_menu_request(context: RequestContext) -> bool:
+    """Whether the message asks for the structured menu skill."""
+    metadata = context.message.metadata if context.message else None
+    return bool(metadata) and metadata.get('skill') == MENU_SKILL_ID
+
+
+def convert_a2a_part_to_genai(part: Part) -> types.Part:
+    """Convert a single A2A Part type into a Google Gen AI Part type.
+
+    Args:
+        part: The A2A Part to convert
+    Returns:
+        The equivalent Google Gen AI Part
+    Raises:
+        ValueError: If the part type is not supported
+    """
+    part = part.root
+    if isinstance(part, TextPart):
+        return types.Part(text=part.text)
+    raise ValueError(f'Unsupported part type: {type(part)}')
+
+
+def convert_genai_part_to_a2a(part: types.Part) -> Part:
+    """Convert a single Google Gen AI Part type into an A2A Part type.
+
+    Args:
+        part: The Google Gen AI Part to convert
+    Returns:
+        The equivalent A2A Part
+    Raises:
+        ValueError: If the part type is not supported
+    """
+    if part.text:
+        return TextPart(text=part.text)
+    if part.inline_data:
+        return Part(
+            root=FilePart(
+                file=FileWithBytes(
+                    bytes=part.inline_data.data,
+                    mime_type=part.inline_data.mime_type,
+                )
+            )
+        )
+    raise ValueError(f'Unsupported part type: {part}')
@@ -0,0 +1,249 @@
+"""Data-driven restaurant catalog with hot reload.
+
+A catalog file (JSON, or YAML if PyYAML is installed) describes one restaurant:
+
+    {
+        "restaurant": "Luigi's Pizza House",
+        "tax_rate": 0.08,
+        "order_lines": ["pizzas", "sides", "drinks", "combos"],
+        "line_components": {
+            "pizzas": [["size", "pizzas"], ["crust", "crusts"], ["toppings", "toppings", "many"]]
+        },
+        "menu": {"pizzas": {"Large Pizza": 16.99, ...}, ...},
+        "agent": {"name": "LuigisPizzaBot", "model": "gemini-2.5-flash-lite", ...}
+    }
+
+`order_lines` are the categories customers order from; by default every menu
+category that is not only a component of another line. A line with components is
+built from several menu items: its first component is the item itself, the others
+are options that are "required" (the default), "optional" or that the customer
+may choose "many" of. The `agent` section configures the restaurant's agent and
+server (see `shared.restaurant.agent`) and is read when the server starts.
+
+It is compiled into a `CatalogSnapshot`: the menu, its version, the item matchers
+and the integer-cents price table. `Catalog` checks the file for changes and swaps
+in a new snapshot atomically, so prices, items and categories change without a
+restart. A file that fails to load or validate is ignored and the previous
+snapshot stays in use.
+
+Orders remember the version they were started with, and keep being matched and
+priced against that snapshot for as long as it is retained, so an in-flight order
+never mixes two price lists. An order whose snapshot is gone is repriced with the
+current one, which drops the items that are no longer on the menu.
+
+Snapshots are retained per process. With several server workers (`A2A_WORKERS`),
+a worker that never loaded an order's version treats it as dropped, so after a
+menu change an open order is repriced as soon as one of its requests reaches a
+worker that started after the change.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .matcher import MenuMatcher
+from .pricing import PriceTable
+
+try:
+    import yaml
+except ImportError:  # YAML catalogs are optional
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 1.0
+RETAINED_SNAPSHOTS = 16
+
+# How many items of a component's category a line takes.
+REQUIRED = "required"
+OPTIONAL = "optional"
+MANY = "many"
+COMPONENT_KINDS = (REQUIRED, OPTIONAL, MANY)
+
+
+class CatalogError(ValueError):
+    """The catalog file could not be read or is not a valid catalog."""
+
+
+def catalog_version(document: dict) -> str:
+    """A short content hash of the catalog, which changes whenever any item or price does."""
+    return hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class CatalogSnapshot:
+    """One immutable, compiled version of a restaurant's catalog."""
+
+    def __init__(self, document: dict):
+        validate(document)
+        self.version = catalog_version(document)
+        self.restaurant: str = document.get("restaurant", "")
+        self.menu: Dict[str, Dict[str, float]] = document["menu"]
+        self.notes: Dict[str, str] = document.get("notes", {})
+        self.agent: Dict[str, Any] = document.get("agent", {})
+        # (field of the line, menu category, kind) for every line built from several items.
+        self.line_components: Dict[str, List[Tuple[str, str, str]]] = {
+            category: [
+                (component[0], component[1], component[2] if len(component) > 2 else REQUIRED)
+                for component in components
+            ]
+            for category, components in document.get("line_components", {}).items()
+        }
+        self.order_lines: Tuple[str, ...] = tuple(document.get("order_lines") or default_order_lines(document))
+        self.prices = PriceTable(
+            self.menu,
+            document.get("tax_rate", 0.0),
+            components={
+                category: [(field, menu_category) for field, menu_category, _ in components]
+                for category, components in self.line_components.items()
+            },
+        )
+        self.matchers = {category: MenuMatcher(items) for category, items in self.menu.items()}
+        self.category_matcher = MenuMatcher(self.menu.keys())
+        self.line_matcher = MenuMatcher(self.order_lines)
+
+    def match(self, user_input: str, category: str) -> Union[str, List[str], None]:
+        """Resolves `user_input` to an item of `category`; see `MenuMatcher.match`."""
+        return self.matchers[category].match(user_input)
+
+    def base_category(self, line_category: str) -> str:
+        """The menu category the items of an order line are named from."""
+        components = self.line_components.get(line_category)
+        return components[0][1] if components else line_category
+
+
+def default_order_lines(document: dict) -> List[str]:
+    """Every menu category except those only used as options of another line."""
+    options = {
+        component[1]
+        for components in document.get("line_components", {}).values()
+        for component in components[1:]
+    }
+    return [category for category in document["menu"] if category not in options]
+
+
+def validate(document: Any):
+    if not isinstance(document, dict) or not isinstance(document.get("menu"), dict):
+        raise CatalogError("A catalog must be an object with a 'menu' object.")
+    for category, items in document["menu"].items():
+        if not isinstance(items, dict):
+            raise CatalogError(f"Menu category '{category}' must map item names to prices.")
+        for name, price in items.items():
+            if isinstance(price, bool) or not isinstance(price, (int, float)) or price < 0:
+                raise CatalogError(f"Invalid price for '{name}' in '{category}': {price!r}")
+    for category, components in document.get("line_components", {}).items():
+        if not components:
+            raise CatalogError(f"Line '{category}' must have at least one component.")
+        for index, component in enumerate(components):
+            if (
+                not isinstance(component, list)
+                or len(component) not in (2, 3)
+                or component[1] not in document["menu"]
+                or (len(component) == 3 and component[2] not in COMPONENT_KINDS)
+            ):
+                raise CatalogError(f"Invalid line component for '{category}': {component!r}")
+            if index == 0 and len(component) == 3 and component[2] != REQUIRED:
+                raise CatalogError(f"The first component of '{category}' is the item itself and must be required.")
+    for category in document.get("order_lines") or []:
+        if category not in document["menu"] and category not in document.get("line_components", {}):
+            raise CatalogError(f"Order line '{category}' is not a menu category.")
+    if not isinstance(document.get("agent", {}), dict):
+        raise CatalogError("The 'agent' section must be an object.")
+
+
+def load_document(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                if yaml is None:
+                    raise CatalogError(f"PyYAML is required to load {path}.")
+                return yaml.safe_load(f)
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise CatalogError(f"Could not load catalog {path}: {e}") from e
+
+
+class Catalog:
+    """A restaurant catalog backed by a file, hot-reloaded when the file changes.
+
+    The file's modification time is checked at most every `check_interval`
+    seconds, when the catalog is used, so every server worker picks up a change
+    on its own.
+    """
+
+    def __init__(self, path: str, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[str, CatalogSnapshot]" = OrderedDict()
+        self._mtime = os.stat(path).st_mtime_ns
+        self._snapshot = self._retain(CatalogSnapshot(load_document(path)))
+        self._next_check = time.monotonic() + check_interval
+        logger.info(f"Loaded catalog {path} (version {self._snapshot.version}).")
+
+    @classmethod
+    def from_env(cls, default_path: Optional[str] = None) -> "Catalog":
+        """The catalog in `A2A_MENU_FILE` (or `default_path`), checked every `A2A_MENU_CHECK_INTERVAL` seconds."""
+        path = os.environ.get("A2A_MENU_FILE", default_path)
+        if not path:
+            raise CatalogError("No catalog file given; set A2A_MENU_FILE.")
+        return cls(path, check_interval=float(os.environ.get("A2A_MENU_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL)))
+
+    def _retain(self, snapshot: CatalogSnapshot) -> CatalogSnapshot:
+        self._snapshots[snapshot.version] = snapshot
+        self._snapshots.move_to_end(snapshot.version)
+        while len(self._snapshots) > RETAINED_SNAPSHOTS:
+            self._snapshots.popitem(last=False)
+        return snapshot
+
+    def current(self) -> CatalogSnapshot:
+        """The latest snapshot, reloading the file first if it changed."""
+        if time.monotonic() >= self._next_check:
+            self.reload()
+        return self._snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """Loads the file again if it changed. Returns whether a new snapshot was swapped in."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                logger.error(f"Catalog {self.path} is not readable, keeping version {self._snapshot.version}: {e}")
+                return False
+            if mtime == self._mtime and not force:
+                return False
+            self._mtime = mtime
+            try:
+                snapshot = CatalogSnapshot(load_document(self.path))
+            except CatalogError as e:
+                logger.error(f"Ignoring invalid catalog, keeping version {self._snapshot.version}: {e}")
+                return False
+            if snapshot.version == self._snapshot.version:
+                return False
+            # A single reference swap: readers see either the old or the new snapshot.
+            self._snapshot = self._retain(snapshot)
+            logger.info(f"Reloaded catalog {self.path} (version {snapshot.version}).")
+            return True
+
+    def snapshot(self, version: Optional[str]) -> Optional[CatalogSnapshot]:
+        """A retained snapshot by version, or None if it is unknown or was dropped."""
+        return self._snapshots.get(version) if version else None
+
+    def for_order(self, order: Dict[str, Any]) -> CatalogSnapshot:
+        """The snapshot an order is matched and priced with.
+
+        A new order is pinned to the current snapshot. An order whose snapshot is no
+        longer retained moves to the current one and is repriced.
+        """
+        snapshot = self.snapshot(order.get("catalog_version"))
+        if snapshot is None:
+            snapshot = self.current()
+            if order.get("catalog_version") is not None:
+                snapshot.prices.reprice(order)
+            order["catalog_version"] = snapshot.version
+        return snapshot
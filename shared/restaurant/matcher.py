@@ -0,0 +1,223 @@
+"""Typo-tolerant lookup of menu item names.
+
+A `MenuMatcher` is built once per menu category and resolves what a customer (or
+the model) typed to a menu item name:
+
+1. exact match on the normalized name or one of its aliases,
+2. partial match through a token index (every query word must be a word of the
+   item, or a prefix of one),
+3. misspelled words, corrected against the menu vocabulary with a trigram index
+   and a bounded edit distance,
+4. as a last resort, trigram similarity of the whole name.
+
+Lookups touch only the index entries of the query words, so they stay in the
+microsecond range for menus with thousands of items.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Union
+
+# Query words this short are ignored when they match nothing ("a", "of", ...).
+MIN_SIGNIFICANT_TOKEN = 3
+MIN_PREFIX = 2
+MIN_NAME_SIMILARITY = 0.5
+CORRECTION_CACHE_SIZE = 4096
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_APOSTROPHES = re.compile(r"['\u2019]")
+_PARENTHESIZED = re.compile(r"\([^)]*\)")
+
+
+def normalize(text: str) -> str:
+    """Lowercases, strips accents and punctuation: "Jalapeños" -> "jalapenos", "Tso's" -> "tsos"."""
+    text = unicodedata.normalize("NFKD", _APOSTROPHES.sub("", text))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(token: str) -> int:
+    """Edit distance tolerated for a word of this length."""
+    if len(token) <= 3:
+        return 0
+    if len(token) <= 7:
+        return 1
+    return 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein distance (adjacent swaps count once), or `limit + 1` if larger."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class MenuMatcher:
+    """Precompiled index over the item names of one menu category."""
+
+    def __init__(self, names: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.names: List[str] = list(names)
+        self._aliases: Dict[str, List[int]] = defaultdict(list)
+        self._item_tokens: List[frozenset] = []
+        self._token_items: Dict[str, set] = defaultdict(set)
+        self._prefix_tokens: Dict[str, set] = defaultdict(set)
+        self._token_grams: Dict[str, set] = defaultdict(set)
+        self._name_grams: List[set] = []
+        self._gram_items: Dict[str, set] = defaultdict(set)
+        self._correction_cache: Dict[str, Dict[str, int]] = {}
+
+        for item_id, name in enumerate(self.names):
+            normalized = normalize(name)
+            self._add_alias(normalized, item_id)
+            # "Spring Rolls (2)" is also known as "spring rolls".
+            self._add_alias(normalize(_PARENTHESIZED.sub(" ", name)), item_id)
+            tokens = frozenset(normalized.split())
+            self._item_tokens.append(tokens)
+            for token in tokens:
+                self._token_items[token].add(item_id)
+                for end in range(MIN_PREFIX, len(token)):
+                    self._prefix_tokens[token[:end]].add(token)
+                for gram in trigrams(token):
+                    self._token_grams[gram].add(token)
+            grams = trigrams(normalized)
+            self._name_grams.append(grams)
+            for gram in grams:
+                self._gram_items[gram].add(item_id)
+
+        for alias, name in (aliases or {}).items():
+            if name in self.names:
+                self._add_alias(normalize(alias), self.names.index(name))
+
+    def _add_alias(self, alias: str, item_id: int):
+        if alias and item_id not in self._aliases[alias]:
+            self._aliases[alias].append(item_id)
+
+    def _corrections(self, token: str) -> Dict[str, int]:
+        """Menu words that `token` may stand for, with the number of typos for each."""
+        if token in self._token_items:
+            return {token: 0}
+        if token in self._prefix_tokens:
+            return {word: 0 for word in self._prefix_tokens[token]}
+        limit = max_typos(token)
+        if limit == 0:
+            return {}
+        cached = self._correction_cache.get(token)
+        if cached is not None:
+            return cached
+        grams = trigrams(token)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for word in self._token_grams.get(gram, ()):
+                shared[word] += 1
+        # One edit (a swap included) changes at most four trigrams, so words sharing
+        # fewer cannot be within the limit.
+        min_shared = len(grams) - 4 * limit
+        corrections = {}
+        for word, count in shared.items():
+            if count >= min_shared and abs(len(word) - len(token)) <= limit:
+                distance = edit_distance(token, word, limit)
+                if distance <= limit:
+                    corrections[word] = distance
+        if len(self._correction_cache) >= CORRECTION_CACHE_SIZE:
+            self._correction_cache.clear()
+        self._correction_cache[token] = corrections
+        return corrections
+
+    def _token_candidates(self, tokens: List[str]) -> Dict[int, tuple]:
+        """Items containing every significant query word, with their rank."""
+        per_token = []
+        for token in tokens:
+            corrections = self._corrections(token)
+            if corrections:
+                per_token.append(corrections)
+            elif len(token) >= MIN_SIGNIFICANT_TOKEN:
+                return {}
+        if not per_token:
+            return {}
+
+        item_sets = []
+        for corrections in per_token:
+            if len(corrections) == 1:
+                item_sets.append(self._token_items[next(iter(corrections))])
+            else:
+                item_sets.append(set().union(*(self._token_items[word] for word in corrections)))
+        item_sets.sort(key=len)
+        items = item_sets[0].intersection(*item_sets[1:])
+        if not items:
+            return {}
+
+        # Fewer typos first, then the item with the fewest words the query did not mention.
+        ranks = {}
+        for item_id in items:
+            item_tokens = self._item_tokens[item_id]
+            typos = sum(
+                min(distance for word, distance in corrections.items() if word in item_tokens)
+                for corrections in per_token
+            )
+            ranks[item_id] = (typos, len(item_tokens) - len(per_token), len(self.names[item_id]))
+        return ranks
+
+    def _similar_names(self, normalized: str) -> Dict[int, tuple]:
+        grams = trigrams(normalized)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for item_id in self._gram_items.get(gram, ()):
+                shared[item_id] += 1
+        ranked = {}
+        for item_id, count in shared.items():
+            similarity = 2 * count / (len(grams) + len(self._name_grams[item_id]))
+            if similarity >= MIN_NAME_SIMILARITY:
+                ranked[item_id] = (-similarity,)
+        return ranked
+
+    def _rank(self, query: str) -> Dict[int, tuple]:
+        """Candidate items for `query` with their rank; a lower rank is a better match."""
+        normalized = normalize(query)
+        if not normalized:
+            return {}
+        if normalized in self._aliases:
+            return {item_id: () for item_id in self._aliases[normalized]}
+        return self._token_candidates(normalized.split()) or self._similar_names(normalized)
+
+    def lookup(self, query: str, limit: int = 5) -> List[str]:
+        """Returns up to `limit` item names for `query`, best match first."""
+        ranks = self._rank(query)
+        ranked = sorted(ranks, key=lambda item_id: (ranks[item_id], item_id))
+        return [self.names[item_id] for item_id in ranked[:limit]]
+
+    def match(self, query: str) -> Union[str, List[str], None]:
+        """
+        - Returns the single matched item name if the best match is unambiguous.
+        - Returns a list of item names, best first, if several match equally well.
+        - Returns None if no match is found.
+        """
+        ranks = self._rank(query)
+        if not ranks:
+            return None
+        ranked = sorted(ranks, key=lambda item_id: (ranks[item_id], item_id))
+        # The name length only orders the candidates, it does not break ties.
+        best = ranks[ranked[0]][:2]
+        tied = [item_id for item_id in ranked if ranks[item_id][:2] == best]
+        if len(tied) == 1:
+            return self.names[tied[0]]
+        return [self.names[item_id] for item_id in tied]
@@ -0,0 +1,34 @@
+"""The order of a restaurant, as kept in the session state.
+
+An order is a plain dict, so that it is stored in the session as is. Besides the
+fields below, it has one list per order line of the restaurant's catalog, e.g.
+`pizzas` or `main_courses`.
+"""
+
+import copy
+from typing import Any, Dict, Iterable
+
+ORDER_FIELDS: Dict[str, Any] = {
+    "customer_name": None,
+    "delivery_address": None,
+    "phone_number": None,
+    "is_delivery": False,
+    "special_requests": None,
+    "subtotal": 0.0,
+    "tax": 0.0,
+    "total": 0.0,
+    # Running totals kept exact by the pricing engine as items are added.
+    "subtotal_cents": 0,
+    "priced_items": 0,
+    "catalog_version": None,
+    "totals_calculated": False,
+    "payment_status": "pending",
+    "order_status": "draft",
+}
+
+
+def new_order(order_lines: Iterable[str]) -> Dict[str, Any]:
+    """An empty order with one list per order line."""
+    order = copy.deepcopy(ORDER_FIELDS)
+    order.update({category: [] for category in order_lines})
+    return order
@@ -0,0 +1,152 @@
+"""Exact, incremental order pricing in integer cents.
+
+The menu prices are compiled once into a `PriceTable` of integer cents. Adding
+an item to an order prices only the line it adds and updates the running totals kept in
+the order, so checkout reads them in O(1) and no float error builds up. A full
+reprice is only needed when the order was edited outside the tools, or in bulk
+when prices change (`reprice_all`). A reprice drops the lines whose items are no
+longer on the menu and lists them under `DROPPED_LINES_KEY`, so that they are
+neither charged nor given away.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Components of a composite order line: (field of the line, menu category priced from).
+LineComponents = Dict[str, List[Tuple[str, str]]]
+# Where a reprice puts the `[category, line]` pairs it dropped from the order.
+DROPPED_LINES_KEY = "dropped_lines"
+
+
+def to_cents(amount: float) -> int:
+    """Converts a price in dollars, as written in the menu, to integer cents."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_dollars(cents: int) -> float:
+    return cents / 100
+
+
+class PriceTable:
+    """The menu prices of one restaurant, precompiled to integer cents.
+
+    `components` describes the order lines that are built from several menu
+    items, e.g. a pizza is priced from its size, its crust and every topping, or a
+    main course from the dish and its rice choice. Other lines are plain item
+    names priced from the category they are listed in.
+    """
+
+    def __init__(self, menu: Dict[str, Dict[str, float]], tax_rate: float, components: LineComponents | None = None):
+        self.cents = {category: {name: to_cents(price) for name, price in items.items()} for category, items in menu.items()}
+        # Tax rate in basis points, so the tax is computed in integers too.
+        self.tax_basis_points = int((Decimal(str(tax_rate)) * 10_000).to_integral_value())
+        self.components = components or {}
+        self.categories = tuple(dict.fromkeys([*self.cents, *self.components]))
+
+    def price(self, category: str, name: str | None) -> int:
+        """Price of one menu item in cents, 0 for no item; raises `KeyError` for an item not on the menu."""
+        return self.cents[category][name] if name else 0
+
+    def line_cents(self, category: str, line: Any) -> int:
+        """Price in cents of one order line; raises `KeyError` if one of its items is not on the menu."""
+        if category not in self.components or not isinstance(line, dict):
+            return self.price(category, line)
+        cents = 0
+        for field, menu_category in self.components[category]:
+            value = line.get(field)
+            if isinstance(value, list):
+                cents += sum(self.price(menu_category, name) for name in value)
+            else:
+                cents += self.price(menu_category, value)
+        return cents
+
+    def tax_cents(self, subtotal_cents: int) -> int:
+        """Tax rounded half up to the cent."""
+        return (subtotal_cents * self.tax_basis_points + 5_000) // 10_000
+
+    def item_count(self, order: Dict[str, Any]) -> int:
+        return sum(len(order[category]) for category in self.categories if isinstance(order.get(category), list))
+
+    def _set_totals(self, order: Dict[str, Any], subtotal_cents: int, item_count: int):
+        tax_cents = self.tax_cents(subtotal_cents)
+        order["subtotal_cents"] = subtotal_cents
+        order["priced_items"] = item_count
+        order["subtotal"] = to_dollars(subtotal_cents)
+        order["tax"] = to_dollars(tax_cents)
+        order["total"] = to_dollars(subtotal_cents + tax_cents)
+
+    def add_line(self, order: Dict[str, Any], category: str, line: Any) -> int:
+        """Appends `line` to the order, updates the running totals and returns its price in cents.
+
+        If the running totals no longer match the order they are rebuilt first.
+        """
+        if not self.is_current(order):
+            self.reprice(order)
+        cents = self.line_cents(category, line)
+        order.setdefault(category, []).append(line)
+        self._set_totals(order, int(order["subtotal_cents"]) + cents, int(order["priced_items"]) + 1)
+        return cents
+
+    def remove_line(self, order: Dict[str, Any], category: str, index: int) -> Any:
+        """Removes line `index` of `category` from the order, updates the running totals and returns the line."""
+        if not self.is_current(order):
+            self.reprice(order)
+        line = order[category].pop(index)
+        cents = self.line_cents(category, line)
+        self._set_totals(order, int(order["subtotal_cents"]) - cents, int(order["priced_items"]) - 1)
+        return line
+
+    def is_current(self, order: Dict[str, Any]) -> bool:
+        """Whether the running totals cover exactly the lines in the order.
+
+        Only added or removed lines are detected; a line edited in place needs `reprice`.
+        """
+        return "subtotal_cents" in order and order.get("priced_items") == self.item_count(order)
+
+    def reprice(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Recomputes the totals from every line of the order.
+
+        Lines with an item that is not on the menu are dropped and added to the
+        order's `DROPPED_LINES_KEY` list.
+        """
+        subtotal_cents = 0
+        item_count = 0
+        dropped = []
+        for category in self.categories:
+            lines = order.get(category)
+            if not isinstance(lines, list):
+                continue
+            kept = []
+            for line in lines:
+                try:
+                    subtotal_cents += self.line_cents(category, line)
+                except KeyError:
+                    dropped.append([category, line])
+                else:
+                    kept.append(line)
+            if len(kept) < len(lines):
+                # A new list, since the old one may be shared with a saved copy of the order.
+                order[category] = kept
+            item_count += len(kept)
+        if dropped:
+            order[DROPPED_LINES_KEY] = [*order.get(DROPPED_LINES_KEY, []), *dropped]
+        self._set_totals(order, subtotal_cents, item_count)
+        return order
+
+    def checkout(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Final totals of the order: the running totals, or a full reprice if they are stale."""
+        if not self.is_current(order):
+            self.reprice(order)
+        return order
+
+
+def reprice_all(tables: Dict[str, PriceTable], orders: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+    """Reprices many orders, each with the price table of its restaurant, e.g. after a price change.
+
+    Takes `(restaurant, order)` pairs and returns how many orders were repriced.
+    """
+    count = 0
+    for restaurant, order in orders:
+        tables[restaurant].reprice(order)
+        count += 1
+    return count
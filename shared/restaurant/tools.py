@@ -0,0 +1,328 @@
+"""The order tools of a restaurant agent, driven by the restaurant's catalog.
+
+Every restaurant orders the same way: an item of one of the catalog's order lines,
+plus, for lines built from several menu items, the options that the catalog lists
+as the line's components (a pizza's crust and toppings, a main course's rice).
+The bound methods of `OrderTools` are the agent's tools.
+"""
+
+import random
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from google.adk.tools.tool_context import ToolContext
+
+from .catalog import MANY, REQUIRED, Catalog, CatalogSnapshot
+from .matcher import MenuMatcher
+from .order import new_order
+from .pricing import DROPPED_LINES_KEY, to_dollars
+
+# The order lives in the session state, so the model only ever sends what changes.
+ORDER_STATE_KEY = "order"
+# Tools that neither change the order nor have side effects; turns using only these can be cached.
+READ_ONLY_TOOLS = frozenset({"get_full_menu", "get_order_summary"})
+PAYMENT_METHODS = ("credit card", "debit", "cash on delivery")
+# Minutes until an order arrives or is ready, unless the catalog's agent section sets `eta_minutes`.
+DEFAULT_ETA_MINUTES = {"delivery": (30, 45), "pickup": (15, 20)}
+
+
+def label(name: str) -> str:
+    """A catalog name as read to the customer: "rice_and_noodles" -> "rice and noodles"."""
+    return name.replace("_", " ")
+
+
+def _resolve(user_input: str, matcher: MenuMatcher, what: str) -> Union[str, Dict[str, Any]]:
+    """Returns the matched name, or an error listing the closest candidates."""
+    match = matcher.match(user_input)
+    if isinstance(match, str):
+        return match
+    if match:
+        return {"error": f"Your request for '{user_input}' is ambiguous. Did you mean one of: {', '.join(match)}?"}
+    suggestions = matcher.lookup(user_input, limit=3)
+    hint = f" Did you mean one of: {', '.join(suggestions)}?" if suggestions else ""
+    return {"error": f"Sorry, we don't have '{user_input}' {what}.{hint}"}
+
+
+def _build_line(
+    catalog: CatalogSnapshot, category: str, item: str, options: List[str]
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Builds a line with components from the item and its options. Returns the line or an error."""
+    (base_field, base_category, _), *choices = catalog.line_components[category]
+    base = _resolve(item, catalog.matchers[base_category], f"in the '{label(base_category)}' category")
+    if isinstance(base, dict):
+        return None, base
+    line: Dict[str, Any] = {base_field: base}
+    for field, _, kind in choices:
+        line[field] = [] if kind == MANY else None
+
+    errors = []
+    for option in options:
+        # The option goes to the first component category it names an item of.
+        candidates = []
+        for field, menu_category, kind in choices:
+            match = catalog.match(option, menu_category)
+            if isinstance(match, str):
+                break
+            candidates.extend(match or [])
+        else:
+            if candidates:
+                errors.append(f"Your request for '{option}' is ambiguous. Did you mean one of: {', '.join(candidates)}?")
+            else:
+                offered = " or ".join(label(menu_category) for _, menu_category, _ in choices) or "options"
+                errors.append(f"Sorry, '{option}' is not one of our {offered} for {base}.")
+            continue
+        if kind == MANY:
+            line[field].append(match)
+        elif line[field] not in (None, match):
+            errors.append(f"Only one {label(field)} can be chosen for {base}, not both {line[field]} and {match}.")
+        else:
+            line[field] = match
+
+    for field, menu_category, kind in choices:
+        if kind == REQUIRED and line[field] is None:
+            errors.append(f"Please choose the {label(field)} for {base}: {', '.join(catalog.menu[menu_category])}.")
+    if errors:
+        return None, {"error": " ".join(errors)}
+    return line, None
+
+
+def describe_line(catalog: CatalogSnapshot, category: str, line: Any) -> str:
+    """The item name of a line, followed by its chosen options."""
+    if not isinstance(line, dict):
+        return line
+    (base_field, _, _), *choices = catalog.line_components.get(category) or [(None, None, None)]
+    chosen = []
+    for field, _, _ in choices:
+        value = line.get(field)
+        if value:
+            chosen.append(f"{label(field)}: {', '.join(value) if isinstance(value, list) else value}")
+    name = line.get(base_field, "")
+    return f"{name} ({'; '.join(chosen)})" if chosen else name
+
+
+def _confirmation(order: Dict[str, Any], message: str) -> Dict[str, Any]:
+    """A short tool result: what changed plus the running totals, never the whole order."""
+    return {
+        "confirmation_message": message,
+        "items_in_order": order.get("priced_items", 0),
+        "subtotal": order.get("subtotal", 0.0),
+    }
+
+
+class OrderTools:
+    """The order tools of one restaurant, bound to its catalog.
+
+    `eta_minutes` maps "delivery" and "pickup" to the (earliest, latest) minutes
+    until the order arrives or is ready.
+    """
+
+    def __init__(self, catalog: Catalog, eta_minutes: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.catalog = catalog
+        self.eta_minutes = {**DEFAULT_ETA_MINUTES, **(eta_minutes or {})}
+
+    def tools(self) -> list:
+        """The tools to give the agent."""
+        return [
+            self.get_full_menu,
+            self.add_item_to_order,
+            self.remove_item_from_order,
+            self.set_order_details,
+            self.get_order_summary,
+            self.calculate_total,
+            self.process_payment,
+            self.get_order_eta,
+        ]
+
+    def _load_order(self, tool_context: ToolContext) -> Dict[str, Any]:
+        """Returns the current order of this session, starting a new one if there is none or it was placed."""
+        order = tool_context.state.get(ORDER_STATE_KEY)
+        if not order or order.get("order_status") == "confirmed":
+            return new_order(self.catalog.current().order_lines)
+        # A shallow copy, so that only `_save_order` changes the session state. The line
+        # lists are shared with the state until a tool changes one (`_own_lines`).
+        return dict(order)
+
+    @staticmethod
+    def _own_lines(order: Dict[str, Any], category: str):
+        """Gives the order its own copy of one line list before a tool changes it."""
+        order[category] = list(order.get(category) or [])
+
+    @staticmethod
+    def _save_order(tool_context: ToolContext, order: Dict[str, Any]):
+        # Assigning (rather than mutating in place) records the change in the session state.
+        tool_context.state[ORDER_STATE_KEY] = order
+
+    def _catalog_for(self, tool_context: ToolContext, order: Dict[str, Any]) -> CatalogSnapshot:
+        """The catalog snapshot of the order; pinning or repricing the order is saved right away."""
+        version = order.get("catalog_version")
+        catalog = self.catalog.for_order(order)
+        if order.get("catalog_version") != version:
+            self._save_order(tool_context, order)
+        return catalog
+
+    @staticmethod
+    def _take_dropped(catalog: CatalogSnapshot, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Moves the lines that a reprice dropped from the order into the tool result, for the customer."""
+        dropped = order.pop(DROPPED_LINES_KEY, None)
+        if not dropped:
+            return {}
+        return {"no_longer_available": [describe_line(catalog, category, line) for category, line in dropped]}
+
+    def get_full_menu(self) -> Dict[str, Any]:
+        """Returns the entire menu with all categories and prices, which you can then present to the customer."""
+        return {"menu": self.catalog.current().menu}
+
+    def add_item_to_order(
+        self,
+        category: str,
+        item: str,
+        tool_context: ToolContext,
+        options: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Adds one item of a menu category to the current order. Partial and misspelled names are resolved to the menu item.
+        Choices that are priced from other menu categories (as described in your instructions) go in `options`.
+        """
+        order = self._load_order(tool_context)
+        catalog = self._catalog_for(tool_context, order)
+        category = _resolve(category, catalog.line_matcher, "on the menu")
+        if isinstance(category, dict):
+            return category
+
+        if category in catalog.line_components:
+            line, error = _build_line(catalog, category, item, options or [])
+            if error:
+                return error
+            self._own_lines(order, category)
+            line["price"] = to_dollars(catalog.prices.add_line(order, category, line))
+        else:
+            if options:
+                return {"error": f"Items in '{label(category)}' have no options; add them as separate items."}
+            line = _resolve(item, catalog.matchers[category], f"in the '{label(category)}' category")
+            if isinstance(line, dict):
+                return line
+            self._own_lines(order, category)
+            catalog.prices.add_line(order, category, line)
+
+        order["order_status"] = "building"
+        order["totals_calculated"] = False
+        dropped = self._take_dropped(catalog, order)
+        self._save_order(tool_context, order)
+        return {**_confirmation(order, f"Added one {describe_line(catalog, category, line)}."), **dropped}
+
+    def remove_item_from_order(self, item: str, tool_context: ToolContext) -> Dict[str, Any]:
+        """Removes one item from the current order, matching it by name; customized items by the item they were built from."""
+        order = self._load_order(tool_context)
+        catalog = self._catalog_for(tool_context, order)
+        for category in catalog.order_lines:
+            lines = order.get(category) or []
+            base_field = catalog.line_components[category][0][0] if category in catalog.line_components else None
+            names = [line.get(base_field) if isinstance(line, dict) else line for line in lines]
+            matched = catalog.match(item, catalog.base_category(category)) if names else None
+            if isinstance(matched, str) and matched in names:
+                # The most recently added matching item goes first.
+                index = len(names) - 1 - names[::-1].index(matched)
+                self._own_lines(order, category)
+                removed = catalog.prices.remove_line(order, category, index)
+                order["totals_calculated"] = False
+                dropped = self._take_dropped(catalog, order)
+                self._save_order(tool_context, order)
+                message = f"Removed {describe_line(catalog, category, removed)} from the order."
+                return {**_confirmation(order, message), **dropped}
+        return {"error": f"There is no '{item}' in the current order."}
+
+    def set_order_details(
+        self,
+        tool_context: ToolContext,
+        is_delivery: Optional[bool] = None,
+        delivery_address: Optional[str] = None,
+        phone_number: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        special_requests: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Records pickup or delivery, the customer's address, phone number, name and special requests. Only pass what changed."""
+        order = self._load_order(tool_context)
+        details = {
+            "is_delivery": is_delivery,
+            "delivery_address": delivery_address,
+            "phone_number": phone_number,
+            "customer_name": customer_name,
+            "special_requests": special_requests,
+        }
+        updated = {field: value for field, value in details.items() if value is not None}
+        order.update(updated)
+        self._save_order(tool_context, order)
+        return {"confirmation_message": f"Updated {', '.join(updated) or 'nothing'}."}
+
+    def get_order_summary(self, tool_context: ToolContext) -> Dict[str, Any]:
+        """Returns the items, details and running totals of the current order, e.g. to read it back to the customer."""
+        order = self._load_order(tool_context)
+        catalog = self._catalog_for(tool_context, order)
+        dropped = self._take_dropped(catalog, order)
+        if dropped:
+            self._save_order(tool_context, order)
+        return {
+            "items": [
+                describe_line(catalog, category, line)
+                for category in catalog.order_lines
+                for line in order.get(category) or []
+            ],
+            "is_delivery": order.get("is_delivery", False),
+            "delivery_address": order.get("delivery_address"),
+            "phone_number": order.get("phone_number"),
+            "special_requests": order.get("special_requests"),
+            "subtotal": order.get("subtotal", 0.0),
+            "order_status": order.get("order_status"),
+            **dropped,
+        }
+
+    def calculate_total(self, tool_context: ToolContext) -> Dict[str, Any]:
+        """
+        Calculates the subtotal, tax, and total for the current order based on the items added.
+        This should be called when the customer is ready to checkout.
+        """
+        order = self._load_order(tool_context)
+        catalog = self._catalog_for(tool_context, order)
+        catalog.prices.checkout(order)
+        order["totals_calculated"] = True
+        dropped = self._take_dropped(catalog, order)
+        self._save_order(tool_context, order)
+        return {
+            "billing_summary": {"subtotal": order["subtotal"], "tax": order["tax"], "total": order["total"]},
+            **dropped,
+        }
+
+    def process_payment(self, payment_method: str, tool_context: ToolContext) -> Dict[str, Any]:
+        """
+        Processes the payment for the order. In this simulation, it confirms payment.
+        It should only be called after the total has been calculated.
+        """
+        order = self._load_order(tool_context)
+        if not order.get("totals_calculated") or order.get("total", 0) == 0:
+            return {"error": "The total has not been calculated yet. Please call `calculate_total` first."}
+
+        if payment_method.lower() not in PAYMENT_METHODS:
+            return {"error": f"Invalid payment method. Please choose from: {', '.join(PAYMENT_METHODS)}."}
+
+        order["payment_status"] = "paid"
+        order["order_status"] = "confirmed"
+        self._save_order(tool_context, order)
+
+        return {
+            "confirmation_message": f"Payment of ${order['total']:.2f} via {payment_method} confirmed. Your order is placed!",
+        }
+
+    def get_order_eta(self, tool_context: ToolContext) -> str:
+        """
+        Provides an estimated time of arrival (ETA) for the order.
+        The ETA depends on whether the order is for delivery or pickup.
+        """
+        order = tool_context.state.get(ORDER_STATE_KEY)
+        if not order or order.get("order_status") != "confirmed":
+            return "Please confirm the order and payment before I can provide an ETA."
+
+        if order.get("is_delivery", False):
+            eta = f"{random.randint(*self.eta_minutes['delivery'])} minutes"
+            return f"Your delivery order should arrive in about {eta}."
+        else:
+            eta = f"{random.randint(*self.eta_minutes['pickup'])} minutes"
+            return f"Your pickup order will be ready in about {eta}."
@@ -0,0 +1,349 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_EVICTION_INTERVAL_SECONDS = 5 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sessions_by_update_time ON sessions (last_update_time);
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteSessionService(BaseSessionService):
+    """A session service that keeps sessions in a SQLite database (WAL mode).
+
+    Sessions, their events and the app/user scoped state live on disk and survive
+    restarts; nothing is cached in process memory, so memory stays flat no matter
+    how many sessions were created. Every lookup goes through the
+    (app_name, user_id, session_id) primary key. Sessions that have not been
+    updated for `ttl_seconds` are evicted.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: Optional[float] = DEFAULT_SESSION_TTL_SECONDS,
+        eviction_interval_seconds: float = DEFAULT_EVICTION_INTERVAL_SECONDS,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.eviction_interval_seconds = eviction_interval_seconds
+        self._last_eviction = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Several server workers may share the database file.
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    async def _run(self, fn, *args):
+        """Runs a blocking database call without stalling the event loop."""
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    def _is_expired(self, last_update_time: float, now: float) -> bool:
+        return self.ttl_seconds is not None and last_update_time < now - self.ttl_seconds
+
+    def _maybe_evict(self, now: float):
+        if self.ttl_seconds is None or now - self._last_eviction < self.eviction_interval_seconds:
+            return
+        self._last_eviction = now
+        self._evict_expired(now)
+
+    def _evict_expired(self, now: float) -> int:
+        cutoff = now - self.ttl_seconds
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "DELETE FROM events WHERE (app_name, user_id, session_id) IN ("
+                "SELECT app_name, user_id, session_id FROM sessions WHERE last_update_time < ?)",
+                (cutoff,),
+            )
+            evicted = self._conn.execute("DELETE FROM sessions WHERE last_update_time < ?", (cutoff,)).rowcount
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        if evicted:
+            logger.info(f"Evicted {evicted} expired sessions from {self.db_path}.")
+        return evicted
+
+    async def evict_expired(self) -> int:
+        """Deletes every session that outlived the TTL. Returns how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        return await self._run(self._evict_expired, time.time())
+
+    def _load_scoped_state(self, app_name: str, user_id: str) -> tuple[dict[str, Any], dict[str, Any]]:
+        row = self._conn.execute("SELECT state FROM app_states WHERE app_name = ?", (app_name,)).fetchone()
+        app_state = json.loads(row[0]) if row else {}
+        row = self._conn.execute(
+            "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+        ).fetchone()
+        user_state = json.loads(row[0]) if row else {}
+        return app_state, user_state
+
+    def _merge_state(self, session: Session, app_state: dict[str, Any], user_state: dict[str, Any]) -> Session:
+        for key, value in app_state.items():
+            session.state[State.APP_PREFIX + key] = value
+        for key, value in user_state.items():
+            session.state[State.USER_PREFIX + key] = value
+        return session
+
+    @staticmethod
+    def _split_state(state: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+        """Splits a state dict into app, user and session scoped parts (temp keys are dropped)."""
+        app_state, user_state, session_state = {}, {}, {}
+        for key, value in state.items():
+            if key.startswith(State.APP_PREFIX):
+                app_state[key.removeprefix(State.APP_PREFIX)] = value
+            elif key.startswith(State.USER_PREFIX):
+                user_state[key.removeprefix(State.USER_PREFIX)] = value
+            elif not key.startswith(State.TEMP_PREFIX):
+                session_state[key] = value
+        return app_state, user_state, session_state
+
+    def _store_scoped_state(self, app_name: str, user_id: str, app_delta: dict, user_delta: dict):
+        if not app_delta and not user_delta:
+            return
+        app_state, user_state = self._load_scoped_state(app_name, user_id)
+        if app_delta:
+            app_state.update(app_delta)
+            self._conn.execute(
+                "INSERT INTO app_states (app_name, state) VALUES (?, ?) "
+                "ON CONFLICT (app_name) DO UPDATE SET state = excluded.state",
+                (app_name, json.dumps(app_state)),
+            )
+        if user_delta:
+            user_state.update(user_delta)
+            self._conn.execute(
+                "INSERT INTO user_states (app_name, user_id, state) VALUES (?, ?, ?) "
+                "ON CONFLICT (app_name, user_id) DO UPDATE SET state = excluded.state",
+                (app_name, user_id, json.dumps(user_state)),
+            )
+
+    def _create_session(self, app_name: str, user_id: str, state: dict[str, Any], session_id: str) -> Session:
+        now = time.time()
+        self._maybe_evict(now)
+        app_delta, user_delta, session_state = self._split_state(state)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            created = self._conn.execute(
+                "INSERT INTO sessions (app_name, user_id, session_id, state, last_update_time) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT DO NOTHING",
+                (app_name, user_id, session_id, json.dumps(session_state), now),
+            ).rowcount
+            if created:
+                self._store_scoped_state(app_name, user_id, app_delta, user_delta)
+                app_state, user_state = self._load_scoped_state(app_name, user_id)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        if not created:
+            # Another worker created the session first, e.g. for a concurrent first
+            # request; that session is returned. An expired one is replaced.
+            existing = self._get_session(app_name, user_id, session_id, None)
+            return existing or self._create_session(app_name, user_id, state, session_id)
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=session_state,
+            last_update_time=now,
+        )
+        return self._merge_state(session, app_state, user_state)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        return await self._run(self._create_session, app_name, user_id, state or {}, session_id)
+
+    def _get_session(
+        self, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig]
+    ) -> Optional[Session]:
+        row = self._conn.execute(
+            "SELECT state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            (app_name, user_id, session_id),
+        ).fetchone()
+        if row is None:
+            return None
+        if self._is_expired(row[1], time.time()):
+            self._delete_session(app_name, user_id, session_id)
+            return None
+
+        query = "SELECT seq, event FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        params: list[Any] = [app_name, user_id, session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        if config and config.num_recent_events:
+            query = f"SELECT seq, event FROM ({query} ORDER BY seq DESC LIMIT ?) ORDER BY seq"
+            params.append(config.num_recent_events)
+        else:
+            query += " ORDER BY seq"
+        events = [Event.model_validate_json(event_row[1]) for event_row in self._conn.execute(query, params)]
+
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=json.loads(row[0]),
+            events=events,
+            last_update_time=row[1],
+        )
+        app_state, user_state = self._load_scoped_state(app_name, user_id)
+        return self._merge_state(session, app_state, user_state)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        return await self._run(self._get_session, app_name, user_id, session_id, config)
+
+    def _list_sessions(self, app_name: str, user_id: str) -> ListSessionsResponse:
+        now = time.time()
+        sessions = [
+            Session(app_name=app_name, user_id=user_id, id=session_id, state={}, last_update_time=last_update_time)
+            for session_id, last_update_time in self._conn.execute(
+                "SELECT session_id, last_update_time FROM sessions WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            )
+            if not self._is_expired(last_update_time, now)
+        ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return await self._run(self._list_sessions, app_name, user_id)
+
+    def _delete_session(self, app_name: str, user_id: str, session_id: str):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            key = (app_name, user_id, session_id)
+            self._conn.execute("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+            self._conn.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self._run(self._delete_session, app_name, user_id, session_id)
+
+    def _append_event(self, session: Session, event: Event):
+        self._maybe_evict(event.timestamp)
+        app_delta, user_delta, session_delta = {}, {}, {}
+        if event.actions and event.actions.state_delta:
+            app_delta, user_delta, session_delta = self._split_state(event.actions.state_delta)
+
+        key = (session.app_name, session.user_id, session.id)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT state FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Session {session.id} not found.")
+            stored_state = json.loads(row[0])
+            stored_state.update(session_delta)
+            self._conn.execute(
+                "UPDATE sessions SET state = ?, last_update_time = ? "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (json.dumps(stored_state), event.timestamp, *key),
+            )
+            self._conn.execute(
+                "INSERT INTO events (app_name, user_id, session_id, seq, timestamp, event) "
+                "SELECT ?, ?, ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM events "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (*key, event.timestamp, event.model_dump_json(exclude_none=True), *key),
+            )
+            self._store_scoped_state(session.app_name, session.user_id, app_delta, user_delta)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        # Partial (streamed) events are never persisted, same as the in-memory service.
+        if event.partial:
+            return event
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        await self._run(self._append_event, session, event)
+        return event
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def build_session_service(app_name: str) -> BaseSessionService:
+    """Builds the session service configured through the environment.
+
+    `A2A_SESSION_DB` is the SQLite file to use (defaults to `<app_name>_sessions.db`);
+    set it to `memory` to keep sessions in process memory instead. `A2A_SESSION_TTL`
+    is the number of idle seconds after which a session is evicted (0 disables eviction).
+    """
+    db_path = os.environ.get("A2A_SESSION_DB", f"{app_name}_sessions.db")
+    if db_path == "memory":
+        return InMemorySessionService()
+    ttl_seconds = float(os.environ.get("A2A_SESSION_TTL", DEFAULT_SESSION_TTL_SECONDS)) or None
+    logger.info(f"Using SQLite session store at {db_path} (ttl={ttl_seconds}).")
+    return SqliteSessionService(db_path, ttl_seconds=ttl_seconds)
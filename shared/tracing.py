@@ -0,0 +1,304 @@
+"""Distributed tracing across A2A hops.
+
+The trace context travels in the A2A message metadata as a W3C `traceparent`
+(`00-<trace id>-<span id>-01`): `inject` adds the current span to an outgoing
+message and an executor continues the trace with `extract`. Spans are opened with
+`span(...)`, and the ADK callbacks below add one span per LLM call and per tool
+call, so a single order can be followed from the helper through the restaurants.
+
+Finished spans are exported in batches from a background thread, chosen with
+`A2A_TRACE_EXPORT`:
+
+    file    JSON lines in `A2A_TRACE_FILE` (default `traces/<service>.jsonl`)
+    otlp    OTLP/HTTP JSON to `A2A_TRACE_OTLP_ENDPOINT` (default http://localhost:4318/v1/traces)
+
+Tracing is off (and costs nothing) when it is not set. `benchmarks/trace_report.py`
+turns the exported files into a critical-path report.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_KEY = "traceparent"
+DEFAULT_OTLP_ENDPOINT = "http://localhost:4318/v1/traces"
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL = 1.0
+MAX_OPEN_CALLBACK_SPANS = 10_000
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class SpanContext:
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class Span(SpanContext):
+    def __init__(self, name: str, parent: Optional[SpanContext], attributes: Optional[dict] = None):
+        super().__init__(parent.trace_id if parent else secrets.token_hex(16), secrets.token_hex(8))
+        self.name = name
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self, error: Optional[str] = None):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self.error = error or self.error
+        if _exporter is not None:
+            _exporter.export(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "service": _service_name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current: contextvars.ContextVar[Optional[SpanContext]] = contextvars.ContextVar("a2a_current_span", default=None)
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Optional[SpanContext]:
+    return _current.get()
+
+
+def start_span(name: str, parent: Optional[SpanContext] = None, attributes: Optional[dict] = None) -> Optional[Span]:
+    """Starts a span under `parent` (default: the current span) without making it current.
+
+    Returns None when tracing is off.
+    """
+    if _exporter is None:
+        return None
+    return Span(name, parent or _current.get(), attributes)
+
+
+@contextmanager
+def span(name: str, parent: Optional[SpanContext] = None, **attributes) -> Iterator[Optional[Span]]:
+    """Runs the block in a new span, which is the current span (and parent of new ones) meanwhile."""
+    new_span = start_span(name, parent, attributes)
+    if new_span is None:
+        yield None
+        return
+    token = _current.set(new_span)
+    try:
+        yield new_span
+    except BaseException as e:
+        new_span.end(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current.reset(token)
+        new_span.end()
+
+
+def inject(metadata: Optional[dict] = None) -> dict:
+    """Adds the current trace context to A2A message metadata."""
+    metadata = dict(metadata or {})
+    context = _current.get()
+    if context is not None:
+        metadata[TRACEPARENT_KEY] = context.traceparent
+    return metadata
+
+
+def extract(metadata: Optional[dict]) -> Optional[SpanContext]:
+    """The trace context sent with an A2A message, if any."""
+    match = _TRACEPARENT.match(str((metadata or {}).get(TRACEPARENT_KEY, "")))
+    return SpanContext(match.group(1), match.group(2)) if match else None
+
+
+# --- ADK callbacks: one span per LLM call and per tool call ---
+
+_open_spans: dict[str, tuple[Span, Optional[SpanContext]]] = {}
+
+
+def _open(key: str, new_span: Span, restore: Optional[SpanContext] = None):
+    stale = _open_spans.pop(key, None)
+    if stale is not None:
+        stale[0].end(error="no response")
+    if len(_open_spans) >= MAX_OPEN_CALLBACK_SPANS:
+        _open_spans.clear()
+    _open_spans[key] = (new_span, restore)
+
+
+def before_model_callback(callback_context, llm_request):
+    new_span = start_span("llm", attributes={"agent": callback_context.agent_name, "model": llm_request.model})
+    if new_span is not None:
+        _open(f"llm:{callback_context.invocation_id}:{callback_context.agent_name}", new_span)
+    return None
+
+
+def after_model_callback(callback_context, llm_response):
+    if llm_response.partial:
+        return None
+    opened = _open_spans.pop(f"llm:{callback_context.invocation_id}:{callback_context.agent_name}", None)
+    if opened is not None:
+        usage = llm_response.usage_metadata
+        if usage is not None:
+            opened[0].set(
+                prompt_tokens=usage.prompt_token_count or 0,
+                cached_tokens=usage.cached_content_token_count or 0,
+                output_tokens=usage.candidates_token_count or 0,
+            )
+        opened[0].end(error=llm_response.error_message)
+    return None
+
+
+def before_tool_callback(tool, args, tool_context):
+    new_span = start_span(f"tool {tool.name}", attributes={"agent": tool_context.agent_name})
+    if new_span is not None:
+        _open(f"tool:{tool_context.function_call_id}", new_span, _current.get())
+        # Whatever the tool does (e.g. messaging another agent) belongs to its span.
+        _current.set(new_span)
+    return None
+
+
+def after_tool_callback(tool, args, tool_context, tool_response):
+    opened = _open_spans.pop(f"tool:{tool_context.function_call_id}", None)
+    if opened is not None:
+        error = tool_response.get("error") if isinstance(tool_response, dict) else None
+        opened[0].end(error=str(error) if error else None)
+        _current.set(opened[1])
+    return None
+
+
+# --- Export ---
+
+class _Exporter:
+    """Exports finished spans in batches from a background thread."""
+
+    def __init__(self, mode: str, target: str):
+        self.mode = mode
+        self.target = target
+        self._queue: "queue.Queue[Span]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def export(self, finished: Span):
+        self._queue.put(finished)
+
+    def _drain(self) -> list[Span]:
+        batch = []
+        while len(batch) < EXPORT_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            time.sleep(EXPORT_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        # Also called at exit, while the thread may be exporting.
+        with self._lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return
+                try:
+                    if self.mode == "otlp":
+                        self._post_otlp(batch)
+                    else:
+                        self._append(batch)
+                except Exception as e:
+                    logger.error(f"Could not export {len(batch)} spans to {self.target}: {e}")
+
+    def _append(self, batch: list[Span]):
+        os.makedirs(os.path.dirname(self.target) or ".", exist_ok=True)
+        with open(self.target, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(finished.to_dict()) + "\n" for finished in batch))
+
+    def _post_otlp(self, batch: list[Span]):
+        body = {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", _service_name)]},
+            "scopeSpans": [{"scope": {"name": "a2a"}, "spans": [_otlp_span(finished) for finished in batch]}],
+        }]}
+        request = urllib.request.Request(
+            self.target, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+        )
+        urllib.request.urlopen(request, timeout=5).close()
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(finished: Span) -> dict:
+    otlp = {
+        "traceId": finished.trace_id,
+        "spanId": finished.span_id,
+        "name": finished.name,
+        "kind": 1,
+        "startTimeUnixNano": str(finished.start_ns),
+        "endTimeUnixNano": str(finished.end_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in finished.attributes.items()],
+        "status": {"code": 2, "message": finished.error} if finished.error else {"code": 1},
+    }
+    if finished.parent_id:
+        otlp["parentSpanId"] = finished.parent_id
+    return otlp
+
+
+_service_name = "unknown"
+_exporter: Optional[_Exporter] = None
+
+
+def configure(service_name: str):
+    """Sets the service name of this process and starts the exporter chosen by `A2A_TRACE_EXPORT`."""
+    global _service_name, _exporter
+    _service_name = service_name
+    mode = os.environ.get("A2A_TRACE_EXPORT", "").lower()
+    if not mode or _exporter is not None:
+        return
+    if mode == "file":
+        target = os.environ.get("A2A_TRACE_FILE", os.path.join("traces", f"{service_name}.jsonl"))
+    elif mode == "otlp":
+        target = os.environ.get("A2A_TRACE_OTLP_ENDPOINT", DEFAULT_OTLP_ENDPOINT)
+    else:
+        raise ValueError(f"Unknown A2A_TRACE_EXPORT {mode!r}, expected file or otlp.")
+    _exporter = _Exporter(mode, target)
+    logger.info(f"Exporting traces of {service_name} to {target}.")
@@ -0,0 +1,60 @@
+import importlib.util
+import logging
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 is only negotiated when the optional `h2` package is installed (httpx[http2]).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HttpTransport:
+    """Process-wide pool of HTTP clients shared by every remote agent connection.
+
+    One `httpx.AsyncClient` is kept per remote origin (scheme, host and port), each with
+    a bounded keep-alive pool, so repeated calls to the same agent reuse their TCP/TLS
+    connections instead of opening new ones. Call `aclose` on shutdown to release them.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: httpx.Timeout = httpx.Timeout(30.0, connect=10.0),
+        http2: bool = HTTP2_AVAILABLE,
+    ):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = timeout
+        self._http2 = http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Returns the pooled client for the origin of `url`, creating it on first use."""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout, http2=self._http2)
+            self._clients[origin] = client
+            logger.info(f"Created pooled HTTP client for {origin} (http2={self._http2}).")
+        return client
+
+    async def aclose(self):
+        """Closes every pooled client and its keep-alive connections."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+shared_transport = HttpTransport()
@@ -0,0 +1,275 @@
+"""Token and cost accounting of model calls, per turn, session and agent.
+
+The ADK callbacks below add up the `usage_metadata` and the latency of every
+model call of an invocation, and count each call in the metrics. When the turn
+is over the executor closes it with `LEDGER.close_turn(session_id,
+invocation_id)`, which adds the turn to the session's and the agents' totals and
+returns what goes into the task metadata:
+
+    {"usage": {"turn": <bill>, "session": <bill>}}
+    bill = {"total": <usage>, "by_agent": {agent: <usage>}}
+    usage = {"calls", "input_tokens", "cached_tokens", "output_tokens", "model_seconds", "cost_usd"}
+
+An agent that calls other agents adds the turn bill they send back with
+`add_remote_usage`, so a completed order reports its full bill across the
+helper and the restaurant. Remote usage is part of the bills and the `/usage`
+totals, but not of the metrics, which every agent exports for its own calls.
+`UsageApiMiddleware` serves the totals at `/usage` and a single session at
+`/usage/sessions/<session id>`.
+
+Costs use the list prices in `MODEL_PRICES` (USD per million tokens); set
+`A2A_MODEL_PRICES` to a JSON object `{"model": [input, cached input, output]}`
+to override or add models. A model without a price of its own, e.g. a dated
+preview, costs what the longest priced model name it starts with costs. Models
+without any price are logged once and counted at no cost.
+"""
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+USAGE_KEY = "usage"
+USAGE_PATH = "/usage"
+SESSIONS_PATH = USAGE_PATH + "/sessions/"
+MAX_SESSIONS = 10_000
+MAX_OPEN_TURNS = 10_000
+TOP_SESSIONS = 10
+
+# USD per million tokens: input, cached input, output (including thinking).
+MODEL_PRICES: dict[str, tuple[float, float, float]] = {
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.025, 0.40),
+    "gemini-2.5-pro": (1.25, 0.31, 10.00),
+}
+
+TOKENS = Counter("a2a_llm_tokens_total", "Model tokens by agent, model and kind (uncached input, cached input, output).",
+                 ("agent", "model", "kind"))
+COST = Counter("a2a_llm_cost_usd_total", "Estimated model cost in USD by agent and model.", ("agent", "model"))
+
+
+def _prices() -> dict[str, tuple[float, float, float]]:
+    prices = dict(MODEL_PRICES)
+    override = os.environ.get("A2A_MODEL_PRICES")
+    if override:
+        prices.update({model: tuple(map(float, price)) for model, price in json.loads(override).items()})
+    return prices
+
+
+_PRICES = _prices()
+# Price resolved for every model seen so far, None for models without one.
+_resolved: dict[str, Optional[tuple[float, float, float]]] = {}
+
+
+def model_price(model: str) -> Optional[tuple[float, float, float]]:
+    """The price of `model`, or of its model family: the longest priced name it starts with.
+
+    So "gemini-2.5-flash-lite-preview-06-17" costs what "gemini-2.5-flash-lite" costs.
+    """
+    if model not in _resolved:
+        family = max((name for name in _PRICES if model.startswith(name)), key=len, default=None)
+        _resolved[model] = _PRICES[family] if family else None
+        if family is None:
+            logger.warning(f"No price for model {model}, its calls are counted at no cost.")
+        elif family != model:
+            logger.info(f"Pricing model {model} as {family}.")
+    return _resolved[model]
+
+
+def call_cost(model: str, input_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+    """The cost of one model call in USD; cached tokens are part of the input tokens."""
+    price = model_price(model)
+    if price is None:
+        return 0.0
+    return ((input_tokens - cached_tokens) * price[0] + cached_tokens * price[1] + output_tokens * price[2]) / 1e6
+
+
+class Usage:
+    """Model usage summed over any number of calls."""
+
+    FIELDS = ("calls", "input_tokens", "cached_tokens", "output_tokens", "model_seconds", "cost_usd")
+
+    def __init__(self, calls=0, input_tokens=0, cached_tokens=0, output_tokens=0, model_seconds=0.0, cost_usd=0.0):
+        self.calls = calls
+        self.input_tokens = input_tokens
+        self.cached_tokens = cached_tokens
+        self.output_tokens = output_tokens
+        self.model_seconds = model_seconds
+        self.cost_usd = cost_usd
+
+    def add(self, other: 'Usage'):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "output_tokens": self.output_tokens,
+            "model_seconds": round(self.model_seconds, 4),
+            "cost_usd": round(self.cost_usd, 8),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Usage':
+        return cls(**{field: data.get(field, 0) for field in cls.FIELDS})
+
+
+class Bill:
+    """Usage by agent."""
+
+    def __init__(self):
+        self.by_agent: dict[str, Usage] = {}
+
+    def add(self, agent: str, usage: Usage):
+        self.by_agent.setdefault(agent, Usage()).add(usage)
+
+    def merge(self, other: 'Bill'):
+        for agent, usage in other.by_agent.items():
+            self.add(agent, usage)
+
+    def total(self) -> Usage:
+        total = Usage()
+        for usage in self.by_agent.values():
+            total.add(usage)
+        return total
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total().to_dict(),
+            "by_agent": {agent: usage.to_dict() for agent, usage in self.by_agent.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Bill':
+        bill = cls()
+        for agent, usage in (data.get("by_agent") or {}).items():
+            bill.add(agent, Usage.from_dict(usage))
+        return bill
+
+
+class UsageLedger:
+    """Bills of the open turns, the latest `max_sessions` sessions and all agents of this process."""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.turns: dict[str, Bill] = {}
+        self.sessions: "OrderedDict[str, Bill]" = OrderedDict()
+        self.agents = Bill()
+
+    def turn(self, invocation_id: str) -> Bill:
+        bill = self.turns.get(invocation_id)
+        if bill is None:
+            if len(self.turns) >= MAX_OPEN_TURNS:
+                # Turns of runs that died before they were closed.
+                self.turns.clear()
+            bill = self.turns[invocation_id] = Bill()
+        return bill
+
+    def close_turn(self, session_id: str, invocation_id: Optional[str]) -> dict:
+        """Adds the turn's bill to the totals and returns the task metadata reporting it."""
+        turn = self.turns.pop(invocation_id, None) if invocation_id else None
+        turn = turn or Bill()
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Bill()
+        self.sessions.move_to_end(session_id)
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        session.merge(turn)
+        self.agents.merge(turn)
+        return {USAGE_KEY: {"turn": turn.to_dict(), "session": session.to_dict()}}
+
+    def summary(self, top: int = TOP_SESSIONS) -> dict:
+        costliest = sorted(self.sessions.items(), key=lambda item: item[1].total().cost_usd, reverse=True)[:top]
+        return {
+            "agents": self.agents.to_dict(),
+            "sessions": len(self.sessions),
+            "top_sessions": [{"session_id": session_id, **bill.to_dict()} for session_id, bill in costliest],
+        }
+
+
+LEDGER = UsageLedger()
+
+
+def add_remote_usage(invocation_id: str, metadata: Optional[dict]):
+    """Adds the turn bill in a remote agent's task metadata to the current turn."""
+    turn = ((metadata or {}).get(USAGE_KEY) or {}).get("turn")
+    if turn:
+        LEDGER.turn(invocation_id).merge(Bill.from_dict(turn))
+
+
+# --- ADK callbacks ---
+
+_started: dict[str, tuple[float, str]] = {}
+
+
+def before_model_callback(callback_context, llm_request):
+    if len(_started) >= MAX_OPEN_TURNS:
+        _started.clear()
+    key = f"{callback_context.invocation_id}:{callback_context.agent_name}"
+    _started[key] = (time.monotonic(), llm_request.model or "")
+    return None
+
+
+def after_model_callback(callback_context, llm_response):
+    if llm_response.partial:
+        return None
+    started = _started.pop(f"{callback_context.invocation_id}:{callback_context.agent_name}", None)
+    if started is None:
+        return None
+    started_at, model = started
+    metadata = llm_response.usage_metadata
+    input_tokens = (metadata.prompt_token_count or 0) if metadata else 0
+    cached_tokens = (metadata.cached_content_token_count or 0) if metadata else 0
+    output_tokens = ((metadata.candidates_token_count or 0) + (metadata.thoughts_token_count or 0)) if metadata else 0
+    cost = call_cost(model, input_tokens, cached_tokens, output_tokens)
+    agent = callback_context.agent_name
+    LEDGER.turn(callback_context.invocation_id).add(agent, Usage(
+        calls=1,
+        input_tokens=input_tokens,
+        cached_tokens=cached_tokens,
+        output_tokens=output_tokens,
+        model_seconds=time.monotonic() - started_at,
+        cost_usd=cost,
+    ))
+    TOKENS.inc(input_tokens - cached_tokens, agent=agent, model=model, kind="input")
+    TOKENS.inc(cached_tokens, agent=agent, model=model, kind="cached")
+    TOKENS.inc(output_tokens, agent=agent, model=model, kind="output")
+    COST.inc(cost, agent=agent, model=model)
+    return None
+
+
+# --- Query API ---
+
+class UsageApiMiddleware:
+    """ASGI middleware serving the ledger: `GET /usage` and `GET /usage/sessions/<session id>`."""
+
+    def __init__(self, app, ledger: UsageLedger = LEDGER):
+        self.app = app
+        self.ledger = ledger
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope["method"] != "GET" or not path.startswith(USAGE_PATH):
+            await self.app(scope, receive, send)
+            return
+        status, body = 404, {"error": "not found"}
+        if path.rstrip("/") == USAGE_PATH:
+            status, body = 200, self.ledger.summary()
+        elif path.startswith(SESSIONS_PATH):
+            session_id = path[len(SESSIONS_PATH):]
+            bill = self.ledger.sessions.get(session_id)
+            if bill is not None:
+                status, body = 200, {"session_id": session_id, **bill.to_dict()}
+        payload = json.dumps(body).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
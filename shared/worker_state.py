@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import Task
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_EVICTION_INTERVAL_SECONDS = 5 * 60
+# How often a worker checks whether another worker asked to cancel one of its runs.
+CANCEL_POLL_SECONDS = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tasks_by_update_time ON tasks (updated_at);
+CREATE TABLE IF NOT EXISTS active_runs (
+    task_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Opens a connection that can be shared safely with the other server workers."""
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SqliteTaskStore(TaskStore):
+    """A task store shared by every worker process through a SQLite database (WAL mode).
+
+    Tasks that have not been updated for `ttl_seconds` are evicted.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: Optional[float] = DEFAULT_TASK_TTL_SECONDS,
+        eviction_interval_seconds: float = DEFAULT_EVICTION_INTERVAL_SECONDS,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.eviction_interval_seconds = eviction_interval_seconds
+        self._last_eviction = 0.0
+        self._lock = threading.Lock()
+        self._conn = _connect(db_path)
+
+    async def _run(self, fn, *args):
+        """Runs a blocking database call without stalling the event loop."""
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    def _save(self, task: Task):
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO tasks (task_id, task, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (task_id) DO UPDATE SET task = excluded.task, updated_at = excluded.updated_at",
+            (task.id, task.model_dump_json(exclude_none=True), now),
+        )
+        if self.ttl_seconds is not None and now - self._last_eviction >= self.eviction_interval_seconds:
+            self._last_eviction = now
+            evicted = self._conn.execute("DELETE FROM tasks WHERE updated_at < ?", (now - self.ttl_seconds,)).rowcount
+            if evicted:
+                logger.info(f"Evicted {evicted} expired tasks from {self.db_path}.")
+
+    async def save(self, task: Task) -> None:
+        await self._run(self._save, task)
+
+    def _get(self, task_id: str) -> Optional[Task]:
+        row = self._conn.execute("SELECT task FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return Task.model_validate_json(row[0]) if row else None
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        return await self._run(self._get, task_id)
+
+    def _delete(self, task_id: str):
+        self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    async def delete(self, task_id: str) -> None:
+        await self._run(self._delete, task_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+
+class LocalRunRegistry:
+    """The tasks running in this process, for single-worker deployments."""
+
+    # Runs of this process are cancelled directly, so there is no flag to poll.
+    shared = False
+
+    def __init__(self):
+        self._running: dict[str, str] = {}
+        self._cancel_requested: set[str] = set()
+
+    async def add(self, task_id: str, session_id: str):
+        self._cancel_requested.discard(task_id)
+        self._running[task_id] = session_id
+
+    async def discard(self, task_id: str):
+        self._cancel_requested.discard(task_id)
+        self._running.pop(task_id, None)
+
+    async def contains(self, task_id: str) -> bool:
+        return task_id in self._running
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    async def request_cancel(self, task_id: str):
+        if task_id in self._running:
+            self._cancel_requested.add(task_id)
+
+    async def cancel_requested(self, task_id: str) -> bool:
+        return task_id in self._cancel_requested
+
+
+class ActiveRunRegistry:
+    """The tasks that are running on any worker process, with the session of each.
+
+    Lets `cancel()` see tasks that were started by another worker and flag them
+    for cancellation; the owning worker polls the flag every `CANCEL_POLL_SECONDS`
+    and cancels the task itself. Entries are keyed by task, so a second task in the
+    same session does not touch the first one's. Entries left behind by workers
+    that died are dropped when a new registry is opened. Like `SqliteTaskStore`,
+    every query runs in a thread.
+    """
+
+    shared = True
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = _connect(db_path)
+        # The number of active tasks as of this worker's latest change, for the metrics scrape.
+        self._size = 0
+        self._reap_dead_workers()
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    def _reap_dead_workers(self):
+        with self._lock:
+            pids = [row[0] for row in self._conn.execute("SELECT DISTINCT pid FROM active_runs")]
+            for pid in pids:
+                if not _pid_alive(pid):
+                    self._conn.execute("DELETE FROM active_runs WHERE pid = ?", (pid,))
+            self._count()
+
+    def _count(self):
+        self._size = self._conn.execute("SELECT COUNT(*) FROM active_runs").fetchone()[0]
+
+    def _add(self, task_id: str, session_id: str):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO active_runs (task_id, session_id, pid, started_at) VALUES (?, ?, ?, ?)",
+            (task_id, session_id, os.getpid(), time.time()),
+        )
+        self._count()
+
+    async def add(self, task_id: str, session_id: str):
+        await self._run(self._add, task_id, session_id)
+
+    def _discard(self, task_id: str):
+        self._conn.execute("DELETE FROM active_runs WHERE task_id = ?", (task_id,))
+        self._count()
+
+    async def discard(self, task_id: str):
+        await self._run(self._discard, task_id)
+
+    def _contains(self, task_id: str) -> bool:
+        row = self._conn.execute("SELECT 1 FROM active_runs WHERE task_id = ?", (task_id,)).fetchone()
+        return row is not None
+
+    async def contains(self, task_id: str) -> bool:
+        return await self._run(self._contains, task_id)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _request_cancel(self, task_id: str):
+        self._conn.execute("UPDATE active_runs SET cancel_requested = 1 WHERE task_id = ?", (task_id,))
+
+    async def request_cancel(self, task_id: str):
+        await self._run(self._request_cancel, task_id)
+
+    def _cancel_requested(self, task_id: str) -> bool:
+        row = self._conn.execute("SELECT cancel_requested FROM active_runs WHERE task_id = ?", (task_id,)).fetchone()
+        return bool(row and row[0])
+
+    async def cancel_requested(self, task_id: str) -> bool:
+        return await self._run(self._cancel_requested, task_id)
+
+
+def _state_db_path(app_name: str) -> str:
+    return os.environ.get("A2A_STATE_DB", f"{app_name}_state.db")
+
+
+def build_task_store(app_name: str) -> TaskStore:
+    """Builds the task store configured through the environment.
+
+    `A2A_STATE_DB` is the SQLite file shared by all workers (defaults to
+    `<app_name>_state.db`); set it to `memory` to keep tasks in process memory,
+    which only works with a single worker.
+    """
+    db_path = _state_db_path(app_name)
+    if db_path == "memory":
+        return InMemoryTaskStore()
+    ttl_seconds = float(os.environ.get("A2A_TASK_TTL", DEFAULT_TASK_TTL_SECONDS)) or None
+    logger.info(f"Using SQLite task store at {db_path} (ttl={ttl_seconds}).")
+    return SqliteTaskStore(db_path, ttl_seconds=ttl_seconds)
+
+
+def build_run_registry(app_name: str) -> LocalRunRegistry | ActiveRunRegistry:
+    """Builds the registry of running tasks, shared by all workers unless `A2A_STATE_DB=memory`."""
+    db_path = _state_db_path(app_name)
+    if db_path == "memory":
+        return LocalRunRegistry()
+    return ActiveRunRegistry(db_path)
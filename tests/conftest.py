@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The tests import `shared` and the service modules from the repository root.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from shared.admission import QUEUE_FULL, QUEUE_TIMEOUT, AdmissionController, AdmissionRejected
+
+
+async def settle():
+    """Lets every ready task run until it blocks again."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_runs_up_to_the_limit_at_once():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=2, max_queued=1, queue_timeout=1)
+        await controller._acquire()
+        await controller._acquire()
+        assert controller.active == 2
+        waiting = asyncio.create_task(controller._acquire())
+        await settle()
+        assert not waiting.done()
+        assert controller.queued == 1
+        controller._release()
+        await waiting
+        # The slot was handed over, so the count did not change.
+        assert (controller.active, controller.queued) == (2, 0)
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_at_once():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=1)
+        await controller._acquire()
+        waiting = asyncio.create_task(controller._acquire())
+        await settle()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller._acquire()
+        assert rejected.value.reason == QUEUE_FULL
+        assert rejected.value.retry_after >= 1
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_waiters_are_served_first_come_first_served():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queued=3, queue_timeout=1)
+        admitted = []
+
+        async def request(name):
+            await controller._acquire()
+            admitted.append(name)
+
+        await controller._acquire()
+        tasks = [asyncio.create_task(request(name)) for name in "abc"]
+        await settle()
+        for _ in tasks:
+            controller._release()
+            await settle()
+        assert admitted == ["a", "b", "c"]
+        controller._release()
+        assert controller.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiting_too_long_gives_up_the_place():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=0.01)
+        await controller._acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller._acquire()
+        assert rejected.value.reason == QUEUE_TIMEOUT
+        assert (controller.active, controller.queued) == (1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queued=2, queue_timeout=1)
+        await controller._acquire()
+        waiting = asyncio.create_task(controller._acquire())
+        await settle()
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert controller.queued == 0
+        controller._release()
+        assert controller.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_to_a_cancelled_waiter_is_passed_on():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queued=2, queue_timeout=1)
+        await controller._acquire()
+        cancelled = asyncio.create_task(controller._acquire())
+        next_in_line = asyncio.create_task(controller._acquire())
+        await settle()
+        # The slot is handed over and the request goes away before it could resume.
+        controller._release()
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        # The cancellation is not lost to the hand-over.
+        assert cancelled.cancelled()
+        await next_in_line
+        assert (controller.active, controller.queued) == (1, 0)
+        controller._release()
+        assert controller.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_to_the_last_cancelled_waiter_is_freed():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=1)
+        await controller._acquire()
+        cancelled = asyncio.create_task(controller._acquire())
+        await settle()
+        controller._release()
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert (controller.active, controller.queued) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_slot_is_released_when_the_run_fails():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queued=0, queue_timeout=1)
+        with pytest.raises(RuntimeError):
+            async with controller.slot():
+                raise RuntimeError("model error")
+        assert controller.active == 0
+        async with controller.slot():
+            assert controller.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_retry_hint_grows_with_the_queue():
+    controller = AdmissionController(max_concurrent=2, max_queued=10, queue_timeout=1)
+    controller._run_seconds = 3.0
+    assert controller.retry_after(0) == 3
+    assert controller.retry_after(1) == 3
+    assert controller.retry_after(2) == 6
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("A2A_MAX_CONCURRENT_RUNS", "0")
+    assert AdmissionController.from_env() is None
+    monkeypatch.setenv("A2A_MAX_CONCURRENT_RUNS", "4")
+    monkeypatch.setenv("A2A_MAX_QUEUED_RUNS", "8")
+    monkeypatch.setenv("A2A_QUEUE_TIMEOUT", "2.5")
+    controller = AdmissionController.from_env()
+    assert (controller.max_concurrent, controller.max_queued, controller.queue_timeout) == (4, 8, 2.5)
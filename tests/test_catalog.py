@@ -0,0 +1,177 @@
+import json
+import os
+
+import pytest
+
+from conftest import ROOT_DIR
+from shared.restaurant import catalog as catalog_module
+from shared.restaurant.catalog import Catalog, CatalogError, CatalogSnapshot, default_order_lines
+
+DOCUMENT = {
+    "restaurant": "Test Kitchen",
+    "tax_rate": 0.1,
+    "line_components": {"bowls": [["base", "bowls"], ["sauce", "sauces", "optional"], ["extras", "extras", "many"]]},
+    "menu": {
+        "bowls": {"Rice Bowl": 10.0},
+        "sauces": {"Teriyaki": 0.5},
+        "extras": {"Egg": 1.0},
+        "drinks": {"Tea": 2.0},
+    },
+}
+
+
+def write(path, document, mtime_ns=None):
+    path.write_text(json.dumps(document))
+    if mtime_ns is not None:
+        # Two writes within the filesystem's timestamp resolution would look unchanged.
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def with_price(document, price):
+    changed = json.loads(json.dumps(document))
+    changed["menu"]["drinks"]["Tea"] = price
+    return changed
+
+
+@pytest.fixture
+def menu_file(tmp_path):
+    path = tmp_path / "menu.json"
+    write(path, DOCUMENT, 1_000_000_000)
+    return path
+
+
+@pytest.mark.parametrize("restaurant", ["pizza_house_worker", "chinese"])
+def test_shipped_catalogs_are_valid(restaurant):
+    snapshot = Catalog(os.path.join(ROOT_DIR, restaurant, "menu.json")).current()
+    assert snapshot.order_lines
+    assert {"name", "model", "card"} <= set(snapshot.agent)
+
+
+def test_snapshot_compiles_components_and_order_lines():
+    snapshot = CatalogSnapshot(DOCUMENT)
+    assert snapshot.line_components["bowls"] == [
+        ("base", "bowls", "required"), ("sauce", "sauces", "optional"), ("extras", "extras", "many")
+    ]
+    # Categories only used as options are not ordered on their own.
+    assert snapshot.order_lines == ("bowls", "drinks")
+    assert snapshot.base_category("bowls") == "bowls"
+    assert snapshot.prices.components["bowls"] == [("base", "bowls"), ("sauce", "sauces"), ("extras", "extras")]
+    assert snapshot.match("tee", "drinks") == "Tea"
+
+
+def test_explicit_order_lines():
+    document = dict(DOCUMENT, order_lines=["bowls", "extras", "drinks"])
+    assert CatalogSnapshot(document).order_lines == ("bowls", "extras", "drinks")
+    assert default_order_lines(document) == ["bowls", "drinks"]
+
+
+def test_version_changes_with_any_price():
+    assert CatalogSnapshot(DOCUMENT).version == CatalogSnapshot(json.loads(json.dumps(DOCUMENT))).version
+    assert CatalogSnapshot(DOCUMENT).version != CatalogSnapshot(with_price(DOCUMENT, 2.5)).version
+
+
+@pytest.mark.parametrize("change", [
+    {"menu": []},
+    {"menu": {"drinks": {"Tea": -1}}},
+    {"menu": {"drinks": {"Tea": True}}},
+    {"line_components": {"bowls": [["base", "noodles"]]}},
+    {"line_components": {"bowls": [["base", "bowls", "sometimes"]]}},
+    {"line_components": {"bowls": [["base", "bowls", "optional"]]}},
+    {"line_components": {"bowls": []}},
+    {"order_lines": ["desserts"]},
+    {"agent": "Alex"},
+])
+def test_invalid_catalogs_are_rejected(change):
+    with pytest.raises(CatalogError):
+        CatalogSnapshot({**DOCUMENT, **change})
+
+
+def test_hot_reload_swaps_in_the_new_snapshot(menu_file):
+    catalog = Catalog(str(menu_file), check_interval=0)
+    first = catalog.current()
+    write(menu_file, with_price(DOCUMENT, 2.5), 2_000_000_000)
+    second = catalog.current()
+    assert second is not first
+    assert second.menu["drinks"]["Tea"] == 2.5
+    assert catalog.snapshot(first.version) is first
+
+
+def test_changes_are_checked_at_most_every_interval(menu_file):
+    catalog = Catalog(str(menu_file), check_interval=3600)
+    first = catalog.current()
+    write(menu_file, with_price(DOCUMENT, 2.5), 2_000_000_000)
+    assert catalog.current() is first
+    assert catalog.reload()
+    assert catalog.current().menu["drinks"]["Tea"] == 2.5
+
+
+def test_invalid_file_keeps_the_previous_snapshot(menu_file):
+    catalog = Catalog(str(menu_file), check_interval=0)
+    first = catalog.current()
+    menu_file.write_text("{not json")
+    os.utime(menu_file, ns=(2_000_000_000, 2_000_000_000))
+    assert catalog.current() is first
+    write(menu_file, {"menu": {"drinks": {"Tea": "free"}}}, 3_000_000_000)
+    assert catalog.current() is first
+
+
+def test_orders_stay_on_their_snapshot(menu_file):
+    catalog = Catalog(str(menu_file), check_interval=0)
+    order = {"drinks": []}
+    pinned = catalog.for_order(order)
+    pinned.prices.add_line(order, "drinks", "Tea")
+    write(menu_file, with_price(DOCUMENT, 2.5), 2_000_000_000)
+
+    assert catalog.for_order(order) is pinned
+    assert order["subtotal_cents"] == 200
+    # A new order gets the new prices.
+    assert catalog.for_order({}).menu["drinks"]["Tea"] == 2.5
+
+
+def test_orders_of_dropped_snapshots_are_repriced(menu_file, monkeypatch):
+    monkeypatch.setattr(catalog_module, "RETAINED_SNAPSHOTS", 1)
+    catalog = Catalog(str(menu_file), check_interval=0)
+    order = {"drinks": []}
+    catalog.for_order(order).prices.add_line(order, "drinks", "Tea")
+    write(menu_file, with_price(DOCUMENT, 2.5), 2_000_000_000)
+    catalog.current()  # the reload drops the order's snapshot
+
+    current = catalog.for_order(order)
+    assert order["catalog_version"] == current.version
+    assert order["subtotal_cents"] == 250
+
+
+def test_items_taken_off_the_menu_leave_repriced_orders(menu_file, monkeypatch):
+    monkeypatch.setattr(catalog_module, "RETAINED_SNAPSHOTS", 1)
+    catalog = Catalog(str(menu_file), check_interval=0)
+    order = {"drinks": [], "bowls": []}
+    prices = catalog.for_order(order).prices
+    prices.add_line(order, "drinks", "Tea")
+    prices.add_line(order, "bowls", {"base": "Rice Bowl", "sauce": None, "extras": ["Egg"]})
+    without_egg = json.loads(json.dumps(DOCUMENT))
+    del without_egg["menu"]["extras"]["Egg"]
+    write(menu_file, without_egg, 2_000_000_000)
+    catalog.current()
+
+    catalog.for_order(order)
+    # The bowl is not kept for free.
+    assert (order["subtotal_cents"], order["priced_items"]) == (200, 1)
+    assert order["bowls"] == []
+    assert order["dropped_lines"] == [["bowls", {"base": "Rice Bowl", "sauce": None, "extras": ["Egg"]}]]
+
+
+def test_yaml_catalog(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    path = tmp_path / "menu.yaml"
+    path.write_text(yaml.safe_dump(DOCUMENT))
+    assert Catalog(str(path)).current().version == CatalogSnapshot(DOCUMENT).version
+
+
+def test_from_env(menu_file, monkeypatch):
+    monkeypatch.setenv("A2A_MENU_CHECK_INTERVAL", "7")
+    monkeypatch.delenv("A2A_MENU_FILE", raising=False)
+    assert Catalog.from_env(str(menu_file)).check_interval == 7
+    with pytest.raises(CatalogError):
+        Catalog.from_env()
+    monkeypatch.setenv("A2A_MENU_FILE", str(menu_file))
+    assert Catalog.from_env("ignored.json").path == str(menu_file)
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import ROOT_DIR
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "personal_helper"))
+
+from auxiliary.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def breaker(clock, **kwargs):
+    return CircuitBreaker("LuigisPizzaBot", failure_threshold=3, reset_timeout=5.0, clock=clock, **kwargs)
+
+
+def test_opens_after_consecutive_failures():
+    clock = Clock()
+    circuit = breaker(clock)
+    circuit.record_failure()
+    circuit.record_failure()
+    assert circuit.state == CLOSED and circuit.allow_request()
+    circuit.record_failure()
+    assert circuit.state == OPEN
+    assert not circuit.allow_request()
+    assert circuit.retry_after() == 5.0
+
+
+def test_success_resets_the_failure_count():
+    circuit = breaker(Clock())
+    circuit.record_failure()
+    circuit.record_failure()
+    circuit.record_success()
+    circuit.record_failure()
+    circuit.record_failure()
+    assert circuit.state == CLOSED
+
+
+def test_lets_a_single_trial_through_once_the_open_period_is_over():
+    clock = Clock()
+    circuit = breaker(clock)
+    circuit.trip()
+    clock.now += 4.9
+    assert not circuit.allow_request()
+    clock.now += 0.1
+    assert circuit.allow_request()
+    assert circuit.state == HALF_OPEN
+    # The trial is still in flight.
+    assert not circuit.allow_request()
+
+
+def test_successful_trial_closes_the_breaker():
+    clock = Clock()
+    circuit = breaker(clock)
+    circuit.trip()
+    clock.now += 5
+    assert circuit.allow_request()
+    circuit.record_success()
+    assert circuit.state == CLOSED
+    assert circuit.retry_after() == 0.0
+    assert (circuit.failures, circuit.trips) == (0, 0)
+
+
+def test_failed_trial_reopens_for_twice_as_long_up_to_the_maximum():
+    clock = Clock()
+    circuit = breaker(clock, max_reset_timeout=12.0)
+    periods = []
+    circuit.trip()
+    for _ in range(4):
+        periods.append(circuit.opened_until - clock.now)
+        clock.now = circuit.opened_until
+        assert circuit.allow_request()
+        circuit.record_failure()
+        assert circuit.state == OPEN
+    assert periods == [5.0, 10.0, 12.0, 12.0]
+
+
+def test_released_trial_lets_the_next_request_through():
+    clock = Clock()
+    circuit = breaker(clock)
+    circuit.trip()
+    clock.now += 5
+    assert circuit.allow_request()
+    circuit.release_trial()
+    assert circuit.state == OPEN
+    assert circuit.allow_request()
+    assert circuit.state == HALF_OPEN
+    # The trip count is kept, so a failing trial still backs off further.
+    circuit.record_failure()
+    assert circuit.opened_until - clock.now == 10.0
+
+
+def test_release_leaves_a_closed_or_open_breaker_alone():
+    clock = Clock()
+    circuit = breaker(clock)
+    circuit.release_trial()
+    assert circuit.state == CLOSED
+    circuit.trip()
+    circuit.release_trial()
+    assert not circuit.allow_request()
+
+
+def test_cancelled_trial_message_does_not_hold_the_breaker():
+    pytest.importorskip("a2a")
+    from auxiliary import tools
+
+    class HangingConnection:
+        def __init__(self):
+            self.breaker = CircuitBreaker("Bench Bot")
+            self.sent = asyncio.Event()
+
+        async def send_message(self, message_request):
+            self.sent.set()
+            await asyncio.Event().wait()
+
+    async def scenario():
+        connection = HangingConnection()
+        connection.breaker.trip()
+        connection.breaker.opened_until = 0.0
+        host_agent = SimpleNamespace(
+            agent_name="AlexHelperBot",
+            remote_agent_connections={"Bench Bot": connection},
+            pacing_policy=tools.PacingPolicy(),
+            monitor_publisher=tools.MonitorPublisher(monitor_url="http://127.0.0.1:9/log"),
+        )
+        tool_context = SimpleNamespace(state={}, invocation_id="e-1")
+        trial = asyncio.create_task(tools.send_message(host_agent, "Bench Bot", "hi", tool_context))
+        await connection.sent.wait()
+        assert connection.breaker.state == HALF_OPEN
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        await host_agent.monitor_publisher.close()
+        assert connection.breaker.allow_request()
+
+    asyncio.run(scenario())
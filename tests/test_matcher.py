@@ -0,0 +1,72 @@
+import pytest
+
+from shared.restaurant.matcher import MenuMatcher, edit_distance, normalize
+
+PIZZAS = ["Medium Pizza", "Large Pizza", "Extra-Large Pizza"]
+TOPPINGS = ["Extra Cheese", "Pepperoni", "Olives", "Mushrooms", "Jalapeños", "Vegan Cheese"]
+APPETIZERS = ["Spring Rolls (2)", "Crab Rangoon (6)", "Dumplings (Steamed or Fried, 6)", "Edamame"]
+
+
+def test_normalize_strips_case_accents_and_punctuation():
+    assert normalize("Jalapeños") == "jalapenos"
+    assert normalize("General Tso's Chicken") == "general tsos chicken"
+    assert normalize("  Extra-Large   Pizza ") == "extra large pizza"
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("pepperoni", "pepperoni", 0),
+    ("peperoni", "pepperoni", 1),
+    ("mushrom", "mushroom", 1),
+    ("olvies", "olives", 1),  # an adjacent swap counts once
+    ("cheese", "olives", 3),  # beyond the limit
+])
+def test_edit_distance_is_bounded(a, b, distance):
+    assert edit_distance(a, b, limit=2) == distance
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Large Pizza", "Large Pizza"),
+    ("large pizza", "Large Pizza"),
+    ("extra large", "Extra-Large Pizza"),
+    ("med", "Medium Pizza"),
+])
+def test_exact_and_partial_names(query, expected):
+    assert MenuMatcher(PIZZAS).match(query) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("peperoni", "Pepperoni"),
+    ("mushroms", "Mushrooms"),
+    ("jalapenos", "Jalapeños"),
+    ("vegan chese", "Vegan Cheese"),
+])
+def test_misspelled_names(query, expected):
+    assert MenuMatcher(TOPPINGS).match(query) == expected
+
+
+def test_parenthesized_details_are_optional():
+    matcher = MenuMatcher(APPETIZERS)
+    assert matcher.match("spring rolls") == "Spring Rolls (2)"
+    assert matcher.match("dumplings") == "Dumplings (Steamed or Fried, 6)"
+
+
+def test_ambiguous_query_returns_every_tied_item():
+    assert sorted(MenuMatcher(TOPPINGS).match("cheese")) == ["Extra Cheese", "Vegan Cheese"]
+
+
+def test_unknown_query_matches_nothing():
+    matcher = MenuMatcher(TOPPINGS)
+    assert matcher.match("anchovies") is None
+    assert matcher.match("") is None
+
+
+def test_fewer_unmentioned_words_rank_first():
+    # Both contain "larg..." and "pizz...", but "Extra-Large Pizza" has a word the query did not mention.
+    matcher = MenuMatcher(PIZZAS)
+    assert matcher.lookup("larg pizz") == ["Large Pizza", "Extra-Large Pizza"]
+    assert matcher.match("larg pizz") == "Large Pizza"
+
+
+def test_aliases():
+    matcher = MenuMatcher(["Canned Soda (Coke, Sprite, Pepsi)"], aliases={"pop": "Canned Soda (Coke, Sprite, Pepsi)"})
+    assert matcher.match("pop") == "Canned Soda (Coke, Sprite, Pepsi)"
@@ -0,0 +1,76 @@
+import os
+import sys
+
+from conftest import ROOT_DIR
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "a2a_monitor"))
+
+from message_store import SEGMENT_PREFIX, MessageStore  # noqa: E402
+
+
+def messages(start, stop):
+    return [{"text": f"message {i}"} for i in range(start, stop)]
+
+
+def texts(result):
+    return [message["text"] for message in result]
+
+
+def segments(log_dir):
+    return sorted(name for name in os.listdir(log_dir) if name.startswith(SEGMENT_PREFIX))
+
+
+def test_assigns_sequence_numbers_and_reads_after_a_cursor(tmp_path):
+    store = MessageStore(str(tmp_path), capacity=100)
+    assert store.append({"text": "first"}) == 1
+    assert store.append_many(messages(2, 5)) == 4
+    assert [message["seq"] for message in store.since(0)] == [1, 2, 3, 4]
+    assert texts(store.since(2)) == ["message 3", "message 4"]
+    assert texts(store.since(0, limit=2)) == ["first", "message 2"]
+    assert store.since(4) == []
+
+
+def test_reads_older_messages_from_disk(tmp_path):
+    store = MessageStore(str(tmp_path), capacity=5)
+    store.append_many(messages(1, 21))
+    # Only the newest 5 are in memory; the rest come from the log.
+    assert texts(store.since(0)) == texts(messages(1, 21))
+    assert texts(store.since(10, limit=8)) == texts(messages(11, 19))
+
+
+def test_rotates_and_expires_segments(tmp_path):
+    store = MessageStore(str(tmp_path), capacity=5, max_segment_bytes=200, max_segments=2)
+    for message in messages(1, 41):
+        store.append(message)
+    assert len(segments(tmp_path)) == 2
+    kept = store.since(0)
+    # Messages of expired segments are skipped, the rest are contiguous up to the newest.
+    assert kept[-1]["seq"] == 40
+    assert [message["seq"] for message in kept] == list(range(kept[0]["seq"], 41))
+    assert kept[0]["seq"] > 1
+
+
+def test_history_survives_a_restart(tmp_path):
+    store = MessageStore(str(tmp_path), capacity=3)
+    store.append_many(messages(1, 11))
+    store.close()
+
+    reopened = MessageStore(str(tmp_path), capacity=3)
+    assert reopened.last_seq == 10
+    assert texts(reopened.since(0)) == texts(messages(1, 11))
+    assert reopened.append({"text": "after restart"}) == 11
+    assert texts(reopened.since(9)) == ["message 10", "after restart"]
+
+
+def test_torn_trailing_record_is_dropped_on_restart(tmp_path):
+    store = MessageStore(str(tmp_path), capacity=10)
+    store.append_many(messages(1, 4))
+    store.close()
+    with open(os.path.join(tmp_path, segments(tmp_path)[-1]), "ab") as f:
+        f.write(b'{"text": "torn')
+
+    reopened = MessageStore(str(tmp_path), capacity=10)
+    assert reopened.last_seq == 3
+    reopened.append({"text": "next"})
+    reopened.close()
+    assert texts(MessageStore(str(tmp_path), capacity=10).since(0)) == ["message 1", "message 2", "message 3", "next"]
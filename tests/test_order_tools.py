@@ -0,0 +1,76 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import ROOT_DIR
+
+pytest.importorskip("google.adk")
+
+from shared.restaurant import catalog as catalog_module  # noqa: E402
+from shared.restaurant.catalog import Catalog  # noqa: E402
+from shared.restaurant.tools import ORDER_STATE_KEY, OrderTools  # noqa: E402
+
+
+class Unscanned(list):
+    """Line list that fails if anything reads its items; only its length may be taken."""
+
+    def _scanned(self, *args):
+        raise AssertionError("the order lines were scanned")
+
+    __iter__ = __getitem__ = __copy__ = __deepcopy__ = __reduce_ex__ = _scanned
+
+
+@pytest.fixture
+def order_tools():
+    return OrderTools(Catalog(os.path.join(ROOT_DIR, "pizza_house_worker", "menu.json")))
+
+
+def test_checkout_reads_the_running_totals(order_tools):
+    tool_context = SimpleNamespace(state={})
+    for _ in range(3):
+        order_tools.add_item_to_order("drinks", "Soda", tool_context)
+    order = tool_context.state[ORDER_STATE_KEY]
+    subtotal = order["subtotal"]
+    tool_context.state[ORDER_STATE_KEY] = {**order, "drinks": Unscanned(order["drinks"])}
+
+    billing = order_tools.calculate_total(tool_context)["billing_summary"]
+    assert billing["subtotal"] == subtotal
+    assert tool_context.state[ORDER_STATE_KEY]["totals_calculated"]
+
+
+def test_tools_leave_the_saved_order_unchanged(order_tools):
+    tool_context = SimpleNamespace(state={})
+    order_tools.add_item_to_order("drinks", "Soda", tool_context)
+    saved = tool_context.state[ORDER_STATE_KEY]
+    saved_drinks = list(saved["drinks"])
+
+    order_tools.add_item_to_order("drinks", "Soda", tool_context)
+    order_tools.remove_item_from_order("Soda", tool_context)
+    order_tools.add_item_to_order("sides", "Garlic Bread", tool_context)
+    assert saved["drinks"] == saved_drinks and saved["priced_items"] == 1
+    assert tool_context.state[ORDER_STATE_KEY]["priced_items"] == 2
+
+
+def test_items_taken_off_the_menu_are_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_module, "RETAINED_SNAPSHOTS", 1)
+    with open(os.path.join(ROOT_DIR, "pizza_house_worker", "menu.json")) as f:
+        document = json.load(f)
+    menu_file = tmp_path / "menu.json"
+    menu_file.write_text(json.dumps(document))
+    order_tools = OrderTools(Catalog(str(menu_file), check_interval=0))
+    tool_context = SimpleNamespace(state={})
+    order_tools.add_item_to_order("drinks", "Bottled Water", tool_context)
+    order_tools.add_item_to_order("sides", "Garlic Bread", tool_context)
+
+    del document["menu"]["drinks"]["Bottled Water"]
+    menu_file.write_text(json.dumps(document))
+    os.utime(menu_file, ns=(2_000_000_000, 2_000_000_000))
+    order_tools.catalog.current()
+
+    billing = order_tools.calculate_total(tool_context)
+    assert billing["no_longer_available"] == ["Bottled Water"]
+    assert billing["billing_summary"]["subtotal"] == document["menu"]["sides"]["Garlic Bread"]
+    # Reported once.
+    assert "no_longer_available" not in order_tools.get_order_summary(tool_context)
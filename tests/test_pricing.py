@@ -0,0 +1,98 @@
+import pytest
+
+from shared.restaurant.order import new_order
+from shared.restaurant.pricing import PriceTable, reprice_all, to_cents, to_dollars
+
+MENU = {
+    "pizzas": {"Large Pizza": 16.99},
+    "crusts": {"Thin": 0.0, "Deep Dish": 2.0},
+    "toppings": {"Pepperoni": 2.0, "Olives": 1.0},
+    "sides": {"Garlic Bread": 4.99},
+    "drinks": {"Bottled Water": 1.5, "Gum": 0.1},
+}
+COMPONENTS = {"pizzas": [("size", "pizzas"), ("crust", "crusts"), ("toppings", "toppings")]}
+
+
+def table(tax_rate=0.08):
+    return PriceTable(MENU, tax_rate, components=COMPONENTS)
+
+
+def pizza(crust="Thin", toppings=()):
+    return {"size": "Large Pizza", "crust": crust, "toppings": list(toppings)}
+
+
+@pytest.mark.parametrize("dollars, cents", [(16.99, 1699), (0.1, 10), (1.005, 101), (2.675, 268), (0, 0)])
+def test_to_cents_rounds_half_up_from_the_written_price(dollars, cents):
+    # 1.005 and 2.675 are just below the half cent as binary floats.
+    assert to_cents(dollars) == cents
+
+
+@pytest.mark.parametrize("subtotal_cents, tax_cents", [(100, 8), (1699, 136), (1706, 136), (1875, 150), (6, 0), (7, 1)])
+def test_tax_is_rounded_half_up_to_the_cent(subtotal_cents, tax_cents):
+    assert table().tax_cents(subtotal_cents) == tax_cents
+
+
+def test_composite_line_is_priced_from_every_component():
+    assert table().line_cents("pizzas", pizza("Deep Dish", ["Pepperoni", "Olives"])) == 1699 + 200 + 200 + 100
+
+
+def test_unknown_items_have_no_price():
+    with pytest.raises(KeyError):
+        table().line_cents("sides", "Breadsticks")
+    with pytest.raises(KeyError):
+        table().line_cents("pizzas", pizza("Stuffed"))
+    # An option left out costs nothing.
+    assert table().line_cents("pizzas", pizza(None)) == 1699
+
+
+def test_reprice_drops_lines_no_longer_on_the_menu():
+    prices = table()
+    sides = ["Garlic Bread", "Breadsticks"]
+    order = {"sides": sides, "pizzas": [pizza("Stuffed"), pizza()], "dropped_lines": [["sides", "Nachos"]]}
+    prices.reprice(order)
+    assert order["sides"] == ["Garlic Bread"] and order["pizzas"] == [pizza()]
+    assert (order["subtotal_cents"], order["priced_items"]) == (499 + 1699, 2)
+    assert order["dropped_lines"] == [["sides", "Nachos"], ["pizzas", pizza("Stuffed")], ["sides", "Breadsticks"]]
+    # The lines are replaced, not changed in place, so saved copies of the order stay as they were.
+    assert sides == ["Garlic Bread", "Breadsticks"]
+
+
+def test_running_totals_stay_exact():
+    prices = table()
+    order = new_order(["pizzas", "sides", "drinks"])
+    for _ in range(10):
+        prices.add_line(order, "drinks", "Gum")
+    # Ten times 0.1 is not 1.0 in floats, but is 100 cents.
+    assert order["subtotal_cents"] == 100
+    assert (order["subtotal"], order["tax"], order["total"]) == (1.0, 0.08, 1.08)
+    assert order["priced_items"] == 10
+
+
+def test_add_and_remove_lines():
+    prices = table()
+    order = new_order(["pizzas", "sides"])
+    assert prices.add_line(order, "pizzas", pizza(toppings=["Pepperoni"])) == 1899
+    assert prices.add_line(order, "sides", "Garlic Bread") == 499
+    assert order["subtotal_cents"] == 2398
+
+    removed = prices.remove_line(order, "pizzas", 0)
+    assert removed["toppings"] == ["Pepperoni"]
+    assert (order["subtotal_cents"], order["priced_items"]) == (499, 1)
+    assert order["total"] == to_dollars(499 + 40)
+
+
+def test_lines_added_outside_the_tools_trigger_a_reprice():
+    prices = table()
+    order = new_order(["sides"])
+    prices.add_line(order, "sides", "Garlic Bread")
+    order["sides"].append("Garlic Bread")
+    assert not prices.is_current(order)
+    prices.checkout(order)
+    assert (order["subtotal_cents"], order["priced_items"]) == (998, 2)
+
+
+def test_reprice_all_uses_each_restaurants_table():
+    cheap, dear = table(), PriceTable({"sides": {"Garlic Bread": 9.99}}, 0.0)
+    orders = [("cheap", {"sides": ["Garlic Bread"]}), ("dear", {"sides": ["Garlic Bread"]})]
+    assert reprice_all({"cheap": cheap, "dear": dear}, orders) == 2
+    assert [order["subtotal_cents"] for _, order in orders] == [499, 999]
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from shared.prompt_cache import PromptCache  # noqa: E402
+
+INSTRUCTION = "You are an expert AI Orchestrator."
+
+
+class FakeCaches:
+    """Stands in for `client.aio.caches`, recording what is created and deleted."""
+
+    def __init__(self):
+        self.created = []
+        self.deleted = []
+
+    async def create(self, model, config):
+        self.created.append(config)
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}", expire_time=None)
+
+    async def delete(self, name):
+        self.deleted.append(name)
+
+
+def orchestrator_cache(caches, dynamic_tool="list_remote_agents"):
+    # Configured like the orchestrater's HostAgent.
+    return PromptCache(
+        "orchestrate_agent",
+        dynamic_suffix=lambda context: f"Current agent: {context.state['active_agent']}",
+        dynamic_tool=dynamic_tool,
+        enabled=True,
+        client=SimpleNamespace(aio=SimpleNamespace(caches=caches)),
+    )
+
+
+def request(text):
+    return LlmRequest(
+        model="gemini-2.5-flash",
+        contents=[types.UserContent(parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(
+            system_instruction=INSTRUCTION,
+            tools=[types.Tool(function_declarations=[types.FunctionDeclaration(name="list_remote_agents")])],
+        ),
+    )
+
+
+def test_dynamic_suffix_follows_the_cached_prefix():
+    async def scenario():
+        caches = FakeCaches()
+        cache = orchestrator_cache(caches)
+        assert cache.enabled
+        for active_agent in ("None", "LuigisPizzaBot"):
+            llm_request = request("I want a pizza")
+            await cache.before_model_callback(SimpleNamespace(state={"active_agent": active_agent}), llm_request)
+
+            assert llm_request.config.cached_content == "cachedContents/1"
+            assert llm_request.config.system_instruction is None and llm_request.config.tools is None
+            call, result = llm_request.contents[-2:]
+            assert call.role == "model" and call.parts[0].function_call.name == "list_remote_agents"
+            response = result.parts[0].function_response
+            assert response.name == "list_remote_agents"
+            assert response.response == {"result": f"Current agent: {active_agent}"}
+        # The suffix changed between the turns, the cached prefix did not.
+        assert len(caches.created) == 1
+        assert caches.created[0].system_instruction == INSTRUCTION
+
+    asyncio.run(scenario())
+
+
+def test_suffix_without_a_tool_goes_to_the_uncached_instruction():
+    async def scenario():
+        caches = FakeCaches()
+        cache = orchestrator_cache(caches, dynamic_tool=None)
+        assert not cache.enabled
+        llm_request = request("I want a pizza")
+        await cache.before_model_callback(SimpleNamespace(state={"active_agent": "None"}), llm_request)
+        assert llm_request.config.cached_content is None
+        assert "Current agent: None" in llm_request.config.system_instruction
+        assert len(llm_request.contents) == 1 and not caches.created
+
+    asyncio.run(scenario())
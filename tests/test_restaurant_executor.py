@@ -0,0 +1,76 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import ROOT_DIR
+
+pytest.importorskip("a2a")
+pytest.importorskip("google.adk")
+
+from a2a.server.agent_execution.context import RequestContext  # noqa: E402
+from a2a.types import Message, MessageSendParams, Part, Role, TaskState, TaskStatusUpdateEvent, TextPart  # noqa: E402
+from google.adk.sessions import InMemorySessionService  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from shared.admission import AdmissionController  # noqa: E402
+from shared.response_cache import ResponseCache  # noqa: E402
+from shared.restaurant.agent_executor import DEFAULT_USER_ID, RestaurantAgentExecutor  # noqa: E402
+from shared.restaurant.catalog import Catalog  # noqa: E402
+from shared.restaurant.tools import READ_ONLY_TOOLS  # noqa: E402
+
+APP = "LuigisPizzaBot"
+SESSION = "session-1"
+
+
+class RecordingQueue:
+    """Collects what the executor publishes for the task."""
+
+    def __init__(self):
+        self.events = []
+
+    async def enqueue_event(self, event):
+        self.events.append(event)
+
+    def states(self):
+        return [event.status.state for event in self.events if isinstance(event, TaskStatusUpdateEvent)]
+
+
+async def model_turn(**kwargs):
+    raise AssertionError("the model was called")
+    yield
+
+
+def request(text, task_id):
+    message = Message(role=Role.user, parts=[Part(root=TextPart(text=text))], message_id=f"m-{task_id}")
+    return RequestContext(request=MessageSendParams(message=message), task_id=task_id, context_id=SESSION)
+
+
+def test_cached_answers_do_not_wait_for_a_run_slot():
+    async def scenario():
+        catalog = Catalog(os.path.join(ROOT_DIR, "pizza_house_worker", "menu.json"))
+        session_service = InMemorySessionService()
+        runner = SimpleNamespace(
+            app_name=APP, agent=SimpleNamespace(name=APP), session_service=session_service, run_async=model_turn
+        )
+        cache = ResponseCache(READ_ONLY_TOOLS)
+        admission = AdmissionController(max_concurrent=1, max_queued=0, queue_timeout=1)
+        executor = RestaurantAgentExecutor(
+            runner, SimpleNamespace(name="Luigi's"), catalog, response_cache=cache, admission=admission
+        )
+        session = await session_service.create_session(app_name=APP, user_id=DEFAULT_USER_ID, session_id=SESSION)
+        question = types.UserContent(parts=[types.Part(text="What pizzas do you have?")])
+        key = cache.key(APP, question, session, catalog.current().version)
+        cache.put(key, types.ModelContent(parts=[types.Part(text="Margherita and Pepperoni.")]))
+
+        async with admission.slot():
+            hit, miss = RecordingQueue(), RecordingQueue()
+            await executor.execute(request("what pizzas do you have", "t1"), hit)
+            await executor.execute(request("one large pizza please", "t2"), miss)
+        assert hit.states()[-1] == TaskState.completed
+        assert cache.hits == 1
+        # Without a cached answer the request needs the slot, and the queue is full.
+        assert miss.states()[-1] == TaskState.rejected
+
+    asyncio.run(scenario())
@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from google.adk.events.event import Event  # noqa: E402
+from google.adk.events.event_actions import EventActions  # noqa: E402
+from google.adk.sessions.base_session_service import GetSessionConfig  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from shared.session_service import SqliteSessionService  # noqa: E402
+
+APP = "LuigisPizzaBot"
+USER = "self"
+
+
+def event(text, state_delta=None, timestamp=None):
+    return Event(
+        invocation_id="e-1",
+        author="user",
+        content=types.UserContent(parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+        timestamp=timestamp or time.time(),
+    )
+
+
+def test_sessions_persist_events_and_state(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "sessions.db")
+        service = SqliteSessionService(db_path)
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        await service.append_event(session, event("hi", {"order": {"pizzas": []}}))
+        await service.append_event(session, event("one large pizza", {"order": {"pizzas": ["Large Pizza"]}}))
+        service.close()
+
+        # Another worker, or the same one after a restart.
+        reopened = SqliteSessionService(db_path)
+        loaded = await reopened.get_session(app_name=APP, user_id=USER, session_id="s1")
+        assert [e.content.parts[0].text for e in loaded.events] == ["hi", "one large pizza"]
+        assert loaded.state["order"] == {"pizzas": ["Large Pizza"]}
+
+    asyncio.run(scenario())
+
+
+def test_only_recent_events_are_loaded_when_asked(tmp_path):
+    async def scenario():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"))
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        for i in range(5):
+            await service.append_event(session, event(f"message {i}"))
+        loaded = await service.get_session(
+            app_name=APP, user_id=USER, session_id="s1", config=GetSessionConfig(num_recent_events=2)
+        )
+        assert [e.content.parts[0].text for e in loaded.events] == ["message 3", "message 4"]
+
+    asyncio.run(scenario())
+
+
+def test_app_and_user_state_are_shared_across_sessions(tmp_path):
+    async def scenario():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"))
+        first = await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        await service.append_event(first, event("hi", {"app:open": True, "user:name": "Sam", "temp:scratch": 1}))
+        second = await service.create_session(app_name=APP, user_id=USER, session_id="s2")
+        assert second.state["app:open"] is True
+        assert second.state["user:name"] == "Sam"
+        assert "temp:scratch" not in second.state
+
+    asyncio.run(scenario())
+
+
+def test_partial_events_are_not_stored(tmp_path):
+    async def scenario():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"))
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        partial = event("tok")
+        partial.partial = True
+        await service.append_event(session, partial)
+        loaded = await service.get_session(app_name=APP, user_id=USER, session_id="s1")
+        assert loaded.events == []
+
+    asyncio.run(scenario())
+
+
+def test_expired_sessions_are_evicted(tmp_path):
+    async def scenario():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"), ttl_seconds=60)
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="old")
+        await service.append_event(session, event("hi", timestamp=time.time() - 120))
+        await service.create_session(app_name=APP, user_id=USER, session_id="new")
+        assert await service.evict_expired() == 1
+        assert await service.get_session(app_name=APP, user_id=USER, session_id="old") is None
+        listed = await service.list_sessions(app_name=APP, user_id=USER)
+        assert [s.id for s in listed.sessions] == ["new"]
+
+    asyncio.run(scenario())
+
+
+def test_deleted_sessions_are_gone(tmp_path):
+    async def scenario():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"))
+        session = await service.create_session(app_name=APP, user_id=USER, session_id="s1")
+        await service.append_event(session, event("hi"))
+        await service.delete_session(app_name=APP, user_id=USER, session_id="s1")
+        assert await service.get_session(app_name=APP, user_id=USER, session_id="s1") is None
+
+    asyncio.run(scenario())
+
+
+def test_workers_creating_the_same_session_share_it(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "sessions.db")
+        workers = [SqliteSessionService(db_path) for _ in range(4)]
+        sessions = await asyncio.gather(
+            *(
+                worker.create_session(app_name=APP, user_id=USER, session_id="s1", state={"worker": i})
+                for i, worker in enumerate(workers)
+            )
+        )
+        assert {session.id for session in sessions} == {"s1"}
+        # Every worker gets the one session that was stored first.
+        assert len({session.state["worker"] for session in sessions}) == 1
+
+        await workers[0].append_event(sessions[0], event("hi"))
+        again = await workers[1].create_session(app_name=APP, user_id=USER, session_id="s1")
+        assert [e.content.parts[0].text for e in again.events] == ["hi"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,34 @@
+import logging
+
+import pytest
+
+from shared import usage
+
+
+@pytest.mark.parametrize(
+    "model, family",
+    [
+        ("gemini-2.5-flash-lite", "gemini-2.5-flash-lite"),
+        ("gemini-2.5-flash-lite-preview-06-17", "gemini-2.5-flash-lite"),
+        ("gemini-2.5-flash-preview-05-20", "gemini-2.5-flash"),
+        ("gemini-2.5-pro-exp", "gemini-2.5-pro"),
+    ],
+)
+def test_models_are_priced_by_their_family(model, family):
+    assert usage.model_price(model) == usage.MODEL_PRICES[family]
+    assert usage.call_cost(model, 1_000_000, 0, 0) == usage.MODEL_PRICES[family][0]
+
+
+def test_cached_tokens_cost_the_cached_price():
+    input_price, cached_price, output_price = usage.MODEL_PRICES["gemini-2.5-flash"]
+    cost = usage.call_cost("gemini-2.5-flash", 1_000_000, 400_000, 1_000_000)
+    assert cost == pytest.approx(0.6 * input_price + 0.4 * cached_price + output_price)
+
+
+def test_unpriced_models_are_logged_and_free(caplog):
+    with caplog.at_level(logging.WARNING, logger=usage.logger.name):
+        assert usage.call_cost("unpriced-test-model", 1_000, 0, 1_000) == 0.0
+        assert usage.call_cost("unpriced-test-model", 1_000, 0, 1_000) == 0.0
+    assert [record.getMessage() for record in caplog.records] == [
+        "No price for model unpriced-test-model, its calls are counted at no cost."
+    ]
@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT_DIR
+
+pytest.importorskip("a2a")
+
+from a2a.types import Task, TaskState, TaskStatus  # noqa: E402
+
+from shared.worker_state import ActiveRunRegistry, LocalRunRegistry, SqliteTaskStore  # noqa: E402
+
+
+def task(task_id, state=TaskState.working):
+    return Task(id=task_id, context_id="session-1", status=TaskStatus(state=state))
+
+
+def test_task_store_round_trip(tmp_path):
+    async def scenario():
+        store = SqliteTaskStore(str(tmp_path / "state.db"))
+        await store.save(task("t1"))
+        await store.save(task("t1", TaskState.completed))
+        saved = await store.get("t1")
+        assert saved.status.state == TaskState.completed
+        assert len(store) == 1
+        await store.delete("t1")
+        assert await store.get("t1") is None
+
+    asyncio.run(scenario())
+
+
+def test_task_store_is_shared_between_workers(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "state.db")
+        first, second = SqliteTaskStore(db_path), SqliteTaskStore(db_path)
+        await first.save(task("t1"))
+        assert (await second.get("t1")).id == "t1"
+        assert first._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    asyncio.run(scenario())
+
+
+def test_task_store_evicts_expired_tasks(tmp_path):
+    async def scenario():
+        store = SqliteTaskStore(str(tmp_path / "state.db"), ttl_seconds=60, eviction_interval_seconds=0)
+        await store.save(task("old"))
+        store._conn.execute("UPDATE tasks SET updated_at = ? WHERE task_id = 'old'", (time.time() - 120,))
+        await store.save(task("new"))
+        assert await store.get("old") is None
+        assert await store.get("new") is not None
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_registry_tracks_runs_by_task(tmp_path, shared):
+    async def scenario():
+        registry = ActiveRunRegistry(str(tmp_path / "state.db")) if shared else LocalRunRegistry()
+        assert registry.shared is shared
+        await registry.add("t1", "session-1")
+        await registry.add("t2", "session-1")
+        assert len(registry) == 2
+        await registry.request_cancel("t1")
+        # A second task of the same session is not affected.
+        assert await registry.cancel_requested("t1")
+        assert not await registry.cancel_requested("t2")
+        await registry.discard("t1")
+        assert not await registry.contains("t1")
+        assert await registry.contains("t2")
+        assert not await registry.cancel_requested("t1")
+        assert len(registry) == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancel_flag_crosses_workers(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "state.db")
+        owner, other = ActiveRunRegistry(db_path), ActiveRunRegistry(db_path)
+        await owner.add("t1", "session-1")
+        assert await other.contains("t1")
+        await other.request_cancel("t1")
+        assert await owner.cancel_requested("t1")
+        await owner.discard("t1")
+        assert not await other.contains("t1")
+
+    asyncio.run(scenario())
+
+
+def test_runs_of_dead_workers_are_dropped(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    # A worker process that registers a run and exits without discarding it.
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import asyncio, sys; sys.path.insert(0, sys.argv[1]); "
+            "from shared.worker_state import ActiveRunRegistry; "
+            "asyncio.run(ActiveRunRegistry(sys.argv[2]).add('t1', 'session-1'))",
+            ROOT_DIR,
+            db_path,
+        ],
+        check=True,
+    )
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM active_runs").fetchone()[0] == 1
+
+    registry = ActiveRunRegistry(db_path)
+    assert len(registry) == 0
+    assert not asyncio.run(registry.contains("t1"))